@@ -0,0 +1,338 @@
+"""Offline benchmark of the DD-WRT live page parsing and polling.
+
+Serves synthetic (or recorded) DD-WRT live pages from a local stand-in HTTP server,
+and reports per endpoint and per client count:
+
+* parse:  time to parse the page body (DDWrtDataParser) and process it (_process_*_data())
+* alloc:  peak and retained memory of one parse, measured with tracemalloc
+* poll:   end-to-end latency of DDWrt.async_update_*_data() against the stand-in server
+
+Usage:
+    python benchmarks/benchmark.py [--clients 10 100 1000 10000] [--pages DIR] [--output bench_output.txt]
+
+Recorded pages in DIR are named after their endpoint (e.g. Status_Lan.live.asp), and
+replace the synthetic page of that endpoint.
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components", "ddwrt"))
+
+from pyddwrt import (  # noqa: E402
+    _CHUNK_SIZE,
+    DDWrt,
+    DDWrtDataParser,
+    ENDPOINT_INTERNET,
+    ENDPOINT_LAN,
+    ENDPOINT_NETWORKING,
+    ENDPOINT_ROUTER,
+    ENDPOINT_UPNP,
+    ENDPOINT_WIRELESS,
+)
+
+DEFAULT_CLIENTS = (10, 100, 1000, 10000)
+DEFAULT_REPEAT = 20
+
+# Endpoint: (processing method, async update method)
+ENDPOINTS = {
+    ENDPOINT_INTERNET: ("_process_wan_data", "async_update_wan_data"),
+    ENDPOINT_LAN: ("_process_lan_data", "async_update_lan_data"),
+    ENDPOINT_NETWORKING: ("_process_network_data", "async_update_network_data"),
+    ENDPOINT_ROUTER: ("_process_router_data", "async_update_router_data"),
+    ENDPOINT_UPNP: ("_process_upnp_data", "async_update_upnp_data"),
+    ENDPOINT_WIRELESS: ("_process_wireless_data", "async_update_wireless_data"),
+}
+
+UPTIME = "{uptime:: 12:00:00 up 1 day,  2:03,  load average: 0.01, 0.05, 0.10}{ipinfo::&nbsp;IP: 192.0.2.1}"
+
+
+def _mac(i):
+    """Return the MAC address of synthetic client i."""
+    return "02:00:00:%02X:%02X:%02X" % ((i >> 16) & 0xFF, (i >> 8) & 0xFF, i & 0xFF)
+
+
+def _ip(i):
+    """Return the IP address of synthetic client i."""
+    return "10.%i.%i.%i" % ((i >> 16) & 0xFF, (i >> 8) & 0xFF, (i & 0xFF) + 1)
+
+
+def page_internet(clients):
+    """Return a synthetic Status_Internet.live.asp page."""
+    return (
+        "{wan_shortproto::dhcp}{wan_status::Connected&nbsp;<input type=\"button\" value=\"Release\" />}"
+        "{wan_uptime::1 day, 2:03:04,  load average: 0.01}{wan_3g_signal::N.A.}{wan_ipaddr::192.0.2.1}"
+        "{wan_netmask::255.255.255.0}{wan_gateway::192.0.2.254}{wan_dns0::192.0.2.53}{wan_dns1::}{wan_dns2::}"
+        "{wan_dns3::}{wan_dns4::}{wan_dns5::}{dhcp_remaining::1 day 00:00:00}"
+        "{ttraff_in::123456}{ttraff_out::654321}{pppoe_ac_name::}"
+    ) + UPTIME
+
+
+def page_lan(clients):
+    """Return a synthetic Status_Lan.live.asp page with the given number of ARP and DHCP clients."""
+    arp = ",".join("'host%i','%s','%s','%i','br0'" % (i, _ip(i), _mac(i), i % 50) for i in range(clients))
+    dhcp = ",".join("'host%i','%s','%s','1 day 00:00:00','%i'" % (i, _ip(i), _mac(i), i) for i in range(clients))
+    return (
+        "{lan_mac::02:00:00:FF:FF:01}{lan_ip::10.0.0.1}{lan_ip_prefix::10.0.0.}{lan_netmask::255.0.0.0}"
+        "{lan_gateway::0.0.0.0}{lan_dns::0.0.0.0}{lan_proto::dhcp}{dhcp_daemon::DNSMasq}{dhcp_start::100}"
+        "{dhcp_num::50}{dhcp_lease_time::1440}{dhcp_leases:: " + dhcp + "}{pptp_leases::}{pppoe_leases::}"
+        "{arp_table:: " + arp + "}"
+    ) + UPTIME
+
+
+def page_networking(clients):
+    """Return a synthetic Networking.live.asp page."""
+    return "{bridges_table::'br0','no','vlan1 wlan0'}" + UPTIME
+
+
+def page_router(clients):
+    """Return a synthetic Status_Router.live.asp page."""
+    return (
+        "{router_time::Sun, 18 Oct 2020 12:00:00}{mem_info::'MemTotal:','255932','kB','MemFree:','180000','kB'}"
+        "{cpu_temp::CPU 45.0 &#176;C / WL0 40.1 &#176;C}{voltage::}{ip_conntrack::%i}{nvram::35 KB / 64 KB}"
+        "{clkfreq::800}" % clients
+    ) + UPTIME
+
+
+def page_upnp(clients):
+    """Return a synthetic UPnP.live.asp page with one forward per client."""
+    forwards = ",".join(
+        "'%i-%i>%s:%i-%i','TCP','on','forward%i'" % (10000 + i, 10000 + i, _ip(i), 80, 80, i)
+        for i in range(clients)
+    )
+    return "{upnp_forwards::" + forwards + "}" + UPTIME
+
+
+def page_wireless(clients):
+    """Return a synthetic Status_Wireless.live.asp page with the given number of wireless clients."""
+    active = ",".join(
+        "'%s','radio%i','wlan0','1:02:03','72M','72M','HT20','-50','-95','45','1000'" % (_mac(i), i)
+        for i in range(clients)
+    )
+    return (
+        "{wl_mac::02:00:00:FF:FF:02}{wl_ssid::benchmark}{wl_channel::6}{wl_radio::Radio is On}{wl_xmit::71 mW}"
+        "{wl_rate::144 Mbps}{wl_ack::}{wl_active::1}{wl_busy::2}{wl_quality::3}{assoc_count::%i}"
+        "{active_wireless::%s}{active_wds::}"
+        "{packet_info::SWRXgoodPacket=1000;SWRXerrorPacket=3;SWTXgoodPacket=2000;SWTXerrorPacket=1;}" % (clients, active)
+    ) + UPTIME
+
+
+SYNTHETIC_PAGES = {
+    ENDPOINT_INTERNET: page_internet,
+    ENDPOINT_LAN: page_lan,
+    ENDPOINT_NETWORKING: page_networking,
+    ENDPOINT_ROUTER: page_router,
+    ENDPOINT_UPNP: page_upnp,
+    ENDPOINT_WIRELESS: page_wireless,
+}
+
+
+def load_pages(directory):
+    """Return the recorded pages in a directory, keyed by endpoint."""
+
+    pages = {}
+    for endpoint in ENDPOINTS:
+        path = os.path.join(directory, endpoint)
+        if os.path.isfile(path):
+            with open(path, "rb") as page:
+                pages.update({endpoint: page.read()})
+    return pages
+
+
+def _router(host="127.0.0.1", session=None):
+    """Return a DDWrt object for the stand-in server."""
+    return DDWrt(session, host, "admin", "admin", "http", False)
+
+
+def _chunks(body):
+    """Split a page body like it is received from the network."""
+    return [body[i:i + _CHUNK_SIZE] for i in range(0, len(body), _CHUNK_SIZE)]
+
+
+def _parse(endpoint, chunks):
+    """Parse and process one page body."""
+
+    router = _router()
+    getattr(router, ENDPOINTS[endpoint][0])(dict(DDWrtDataParser().parse(chunks)))
+    return router
+
+
+def bench_parse(endpoint, body, repeat):
+    """Return the parse times in seconds, and the peak and retained memory in bytes of one parse."""
+
+    chunks = _chunks(body)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _parse(endpoint, chunks)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = _parse(endpoint, chunks)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return times, peak, retained
+
+
+class StandInServer:
+    """A local HTTP server that serves DD-WRT pages from its own thread and event loop."""
+
+    def __init__(self):
+        """Initialize the stand-in server."""
+
+        self.pages = {}
+        self.host = None
+        self._loop = asyncio.new_event_loop()
+        self._runner = None
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    async def _handler(self, request):
+        """Serve a page."""
+
+        body = self.pages.get(request.path.lstrip("/"))
+        if body is None:
+            return web.Response(status=404)
+        return web.Response(body=body, content_type="text/html")
+
+    async def _start(self):
+        """Start listening on a free local port."""
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        return "127.0.0.1:%i" % self._runner.addresses[0][1]
+
+    def start(self):
+        """Start the server thread."""
+
+        self._thread.start()
+        self.host = asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self):
+        """Stop the server thread."""
+
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+async def bench_poll(server, endpoint, repeat):
+    """Return the end-to-end latencies in seconds of polling an endpoint on the stand-in server."""
+
+    async with ClientSession() as session:
+        router = _router(server.host, session)
+        update = getattr(router, ENDPOINTS[endpoint][1])
+        await update()
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await update()
+            times.append(time.perf_counter() - start)
+
+    return times
+
+
+class Tee:
+    """Write the report to more than one file."""
+
+    def __init__(self, *files):
+        """Initialize the tee."""
+        self._files = files
+
+    def write(self, text):
+        """Write text to all files."""
+        for file in self._files:
+            file.write(text)
+
+    def flush(self):
+        """Flush all files."""
+        for file in self._files:
+            file.flush()
+
+
+def _ms(seconds):
+    """Format a duration in milliseconds."""
+    return "%.3f" % (seconds * 1000)
+
+
+def run(clients, pages, repeat, poll, output):
+    """Run the benchmarks and write the report."""
+
+    cases = []
+    for endpoint, body in sorted(pages.items()):
+        cases.append((endpoint, "recorded", body))
+    for count in clients:
+        for endpoint, page in sorted(SYNTHETIC_PAGES.items()):
+            if endpoint not in pages:
+                cases.append((endpoint, str(count), page(count).encode()))
+
+    server = None
+    if poll:
+        server = StandInServer()
+        server.start()
+
+    header = "%-26s %8s %10s %10s %10s %12s %12s %10s %10s" % (
+        "endpoint", "clients", "bytes", "parse ms", "MB/s", "peak KiB", "retain KiB", "poll ms", "poll p95",
+    )
+    output.write(header + "\n" + "-" * len(header) + "\n")
+
+    try:
+        for endpoint, count, body in cases:
+            times, peak, retained = bench_parse(endpoint, body, repeat)
+            parse = statistics.median(times)
+
+            poll_median = poll_p95 = "-"
+            if server is not None:
+                server.pages = {endpoint: body}
+                latencies = sorted(asyncio.run(bench_poll(server, endpoint, repeat)))
+                poll_median = _ms(statistics.median(latencies))
+                poll_p95 = _ms(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))])
+
+            output.write("%-26s %8s %10i %10s %10.1f %12.1f %12.1f %10s %10s\n" % (
+                endpoint, count, len(body), _ms(parse), len(body) / parse / 1e6,
+                peak / 1024, retained / 1024, poll_median, poll_p95,
+            ))
+            output.flush()
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def main():
+    """Parse the command line and run the benchmarks."""
+
+    parser = argparse.ArgumentParser(description="Benchmark the parsing and polling of DD-WRT live pages.")
+    parser.add_argument("--clients", type=int, nargs="+", default=DEFAULT_CLIENTS, help="client counts of the synthetic pages")
+    parser.add_argument("--pages", help="directory with recorded pages, named after their endpoint")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="number of runs per measurement")
+    parser.add_argument("--no-poll", dest="poll", action="store_false", help="only measure parsing, don't start the stand-in server")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages) if args.pages else {}
+
+    if args.output:
+        with open(args.output, "w") as output:
+            run(args.clients, pages, args.repeat, args.poll, Tee(sys.stdout, output))
+    else:
+        run(args.clients, pages, args.repeat, args.poll, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
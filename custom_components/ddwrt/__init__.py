@@ -1,7 +1,10 @@
 """Support for DD-WRT devices."""
 
+import asyncio
 from functools import partial
 import logging
+import random
+from time import monotonic
 import voluptuous as vol
 from datetime import (
     datetime,
@@ -12,6 +15,7 @@ from homeassistant.const import (
     ATTR_ATTRIBUTION,
     ATTR_FRIENDLY_NAME,
     ATTR_NAME,
+    ATTR_RESTORED,
     CONF_HOST,
     CONF_NAME,
     CONF_SCAN_INTERVAL,
@@ -22,31 +26,43 @@ from homeassistant.const import (
     CONF_RESOURCES,
 )
 from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.core import callback
 from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import entity_registry
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.util import Throttle
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import Throttle, slugify
+import homeassistant.util.dt as dt_util
 
 from .const import (
     ATTRIBUTION,
+    BACKOFF_MAX,
+    BACKOFF_MIN,
     BINARY_SENSORS,
     BINARY_SENSOR_DEFAULTS,
     CAMERAS,
     CAMERA_DEFAULTS,
+    CHART_CONTENT_TYPE,
     COMPONENTS,
     CONF_BINARY_SENSOR,
     CONF_CAMERA,
+    CONF_CONNTRACK,
     CONF_DEVICE_TRACKER,
     CONF_SENSOR,
+    CONF_SSL_FINGERPRINT,
     CONF_TRACK_ARP,
     CONF_TRACK_DHCP,
+    CONF_TRACK_EXCLUDE,
+    CONF_TRACK_INCLUDE,
     CONF_TRACK_PPPOE,
     CONF_TRACK_PPTP,
     CONF_TRACK_WDS,
     CONF_TRACK_WIRELESS,
+    DATA_ENGINE,
     DATA_LISTENER,
     DDWRT_UPNP_MANUFACTURER_URL,
     DEFAULT_DEVICE_NAME,
@@ -55,12 +71,39 @@ from .const import (
     DEFAULT_WIRELESS_ONLY,
     DEVICE_TRACKERS,
     DEVICE_TRACKER_DEFAULTS,
+    DIAGNOSTIC_SENSOR,
+    DIAGNOSTIC_SENSOR_ICON,
+    DIAGNOSTIC_SENSOR_NAME,
     DOMAIN,
+    HEALTH_DEGRADED,
+    HEALTH_FAILURES_OPEN,
+    HEALTH_HEALTHY,
+    HEALTH_OPEN,
+    HEALTH_PROBE_ENDPOINT,
+    HOST_ALL,
+    ENDPOINT_ABOUT,
+    ENDPOINT_CONNTRACK,
+    ENDPOINT_INTERNET,
+    ENDPOINT_LAN,
+    ENDPOINT_NETWORKING,
+    ENDPOINT_ROUTER,
+    ENDPOINT_TTGRAPH,
+    ENDPOINT_UPNP,
+    ENDPOINT_WIRELESS,
+    ENTITY_CATEGORY_DIAGNOSTIC,
+    EVENT_COMMAND_RESULT,
     MIN_SCAN_INTERVAL,
     RESOURCES,
     RESOURCES_DEFAULTS,
+    REBOOT_PARALLEL,
+    REBOOT_PROBE_INTERVAL,
+    REBOOT_TIMEOUT,
+    REBOOT_TOLERANCE,
+    RESOURCE_ENDPOINTS,
     SCAN_INTERVAL_ABOUT,
+    SNAPSHOT_SAVE_DELAY,
     SCAN_INTERVAL_DATA,
+    SCAN_INTERVAL_ENDPOINTS,
     SENSORS,
     SENSOR_DEFAULTS,
     SERVICE_REBOOT,
@@ -72,18 +115,39 @@ from .const import (
     SERVICE_WAN_PPPOE_CONNECT,
     SERVICE_WAN_PPPOE_DISCONNECT,
     SERVICES,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
     TOPIC_DATA_UPDATE,
+    ATTR_COMMANDS,
     ATTR_DEVICE_CLASS,
+    ATTR_ERROR,
     ATTR_ICON,
     ATTR_ICON_OFF,
-    ATTR_NAME,
+    ATTR_OUTPUT,
+    ATTR_PARALLEL,
+    ATTR_QUEUE_DEPTH,
+    ATTR_RESULTS,
+    ATTR_RULE,
+    ATTR_SCAN_INTERVAL,
+    ATTR_TIMEOUT,
     ATTR_UNIT_OF_MEASUREMENT,
     ATTR_WIRED,
 )
-from .pyddwrt import DDWrt
+from .engine import DDWrtEngine
+from .pyddwrt import Client, ClientFilter, DDWrt, STATIC_RESULTS, merge_clients, parse_fingerprint
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def ssl_fingerprint(value):
+    """Validate a SHA-256 fingerprint, with or without colons."""
+
+    try:
+        return parse_fingerprint(cv.string(value))
+    except ValueError as e:
+        raise vol.Invalid(str(e))
+
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.All(
@@ -97,6 +161,10 @@ CONFIG_SCHEMA = vol.Schema(
                         vol.Optional(CONF_PASSWORD, default=""): cv.string,
                         vol.Optional(CONF_SSL, default=DEFAULT_SSL): cv.boolean,
                         vol.Optional(CONF_VERIFY_SSL, default=DEFAULT_VERIFY_SSL): cv.boolean,
+                        vol.Optional(CONF_SSL_FINGERPRINT): ssl_fingerprint,
+                        vol.Optional(CONF_TRACK_INCLUDE, default=[]): vol.All(cv.ensure_list, [cv.string]),
+                        vol.Optional(CONF_TRACK_EXCLUDE, default=[]): vol.All(cv.ensure_list, [cv.string]),
+                        vol.Optional(CONF_CONNTRACK, default=False): cv.boolean,
                         vol.Optional(CONF_RESOURCES, default=RESOURCES_DEFAULTS): vol.All(
                             cv.ensure_list, [vol.In(
                                 list(RESOURCES),
@@ -113,7 +181,41 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
-SERVICE_SCHEMA = vol.Schema({vol.Optional(CONF_HOST): cv.string})
+SERVICE_SCHEMA = vol.Schema({vol.Optional(CONF_HOST): vol.All(cv.ensure_list, [cv.string])})
+
+RUN_COMMAND_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Required(ATTR_COMMANDS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+REBOOT_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_PARALLEL, default=REBOOT_PARALLEL): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_TIMEOUT, default=REBOOT_TIMEOUT): cv.time_period,
+    }
+)
+
+UPNP_DELETE_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_RULE, default="all"): cv.string,
+    }
+)
+
+SERVICE_SCHEMAS = {
+    SERVICE_REBOOT: REBOOT_SCHEMA,
+    SERVICE_RUN_COMMAND: RUN_COMMAND_SCHEMA,
+    SERVICE_UPNP_DELETE: UPNP_DELETE_SCHEMA,
+}
+
+# The router action of each service that is run on all given routers at the same time
+SERVICE_ACTIONS = {
+    SERVICE_UPNP_DELETE: lambda router, data: router.async_upnp_delete(data[ATTR_RULE]),
+    SERVICE_WAN_DHCP_RELEASE: lambda router, data: router.async_wan_dhcp_release(),
+    SERVICE_WAN_DHCP_RENEW: lambda router, data: router.async_wan_dhcp_renew(),
+    SERVICE_WAN_PPPOE_CONNECT: lambda router, data: router.async_wan_pppoe_connect(),
+    SERVICE_WAN_PPPOE_DISCONNECT: lambda router, data: router.async_wan_pppoe_disconnect(),
+}
 
 
 async def async_setup(hass, config):
@@ -144,35 +246,21 @@ async def async_setup_entry(hass, config_entry):
 
     async def service_handler(service) -> None:
         """Apply a service."""
-        host = service.data.get(CONF_HOST)
-        routers = hass.data[DOMAIN]
-        if host:
-            router = routers.get(host)
-        elif not routers:
-            _LOGGER.error("%s: no routers configured", service.service)
-            return
-        elif len(routers) == 1:
-            router = next(iter(routers.values()))
-        else:
-            _LOGGER.error(
-                "%s: more than one router configured, must specify one of URLs %s",
-                service.service,
-                sorted(routers),
-            )
-            return
-        if not router:
-            _LOGGER.error("%s: router %s unavailable", service.service, host)
+        routers = {
+            host: router
+            for host, router in hass.data[DOMAIN].items()
+            if host != DATA_ENGINE
+        }
+        hosts = service_hosts(service, routers)
+        if not hosts:
             return
 
-        if service.service == SERVICE_WAN_PPPOE_CONNECT:
-            result = await router['entity'].wan_pppoe_connect()
-            _LOGGER.debug("__init__::async_setup::service_handler %s: %s", service.service, result)
-        elif service.service == SERVICE_WAN_PPPOE_DISCONNECT:
-            result = await router['entity'].wan_pppoe_disconnect()
-            _LOGGER.debug("__init__::async_setup::service_handler %s: %s", service.service, result)
+        if service.service == SERVICE_RUN_COMMAND:
+            await async_run_command(hass, service, routers, hosts)
         elif service.service == SERVICE_REBOOT:
-            result = await router['entity'].reboot()
-            _LOGGER.debug("__init__::async_setup::service_handler %s: %s", service.service, result)
+            await async_rolling_reboot(service, routers, hosts)
+        elif service.service in SERVICE_ACTIONS:
+            await async_run_action(service, routers, hosts)
         else:
             _LOGGER.error("%s: unsupported service", service.service)
 
@@ -182,18 +270,32 @@ async def async_setup_entry(hass, config_entry):
             DOMAIN,
             service,
             service_handler,
-            schema=SERVICE_SCHEMA,
+            schema=SERVICE_SCHEMAS.get(service, SERVICE_SCHEMA),
         )
 
-    router = DDWrtEntity(hass, config_entry)
-    if not await router.async_update_about_data():
-        raise PlatformNotReady
-    if not await router.async_update_sensor_data():
-        raise PlatformNotReady
-
-    # Make sure there's a RDW entry in hass.data in case this is the first RDW entity
+    # All routers share one engine, which schedules their requests
     if DOMAIN not in hass.data:
         hass.data.update({DOMAIN: {}})
+    if DATA_ENGINE not in hass.data[DOMAIN]:
+        hass.data[DOMAIN].update({DATA_ENGINE: DDWrtEngine(hass)})
+
+    # Set up the entities from the last snapshot and refresh them in the background, so
+    # startup doesn't wait for the router. Without a snapshot the router has to respond first
+    try:
+        router = DDWrtEntity(hass, config_entry, hass.data[DOMAIN][DATA_ENGINE])
+    except ValueError as e:
+        _LOGGER.error("Invalid configuration of router %s: %s", config_entry.data[CONF_HOST], e)
+        return False
+
+    if await router.async_restore_snapshot():
+        hass.async_create_task(router.async_refresh())
+    else:
+        if not await router.async_update_about_data(refresh=False):
+            await router.async_close()
+            raise PlatformNotReady
+        if not await router.async_update_sensor_data():
+            await router.async_close()
+            raise PlatformNotReady
 
     hass.data[DOMAIN].update({
         config_entry.data[CONF_HOST]: {
@@ -210,45 +312,135 @@ async def async_setup_entry(hass, config_entry):
             )
         )
 
-    async def async_track_time_interval_about_update(event_time):
-        """Update the entity's about data and all it's components."""
-
-        _LOGGER.debug("__init__::async_setup_entry::async_track_time_interval_about_update called")
-
-        if not await router.async_update_about_data():
-            _LOGGER.warning("Failed to update about data")
-        else:
-            async_dispatcher_send(hass, TOPIC_DATA_UPDATE)
-
-    async def async_track_time_interval_sensor_update(event_time):
-        """Update the entity's sensor data and all it's components."""
+    @callback
+    def async_entity_registry_updated(event):
+        """Replan the polling when an entity is enabled or disabled."""
 
-        _LOGGER.debug("__init__::async_setup_entry::async_track_time_interval_sensor_update called")
+        if "disabled_by" in event.data.get("changes", {}):
+            router.async_schedule_updates()
 
-        if not await router.async_update_sensor_data():
-            _LOGGER.warning("Failed to update sensor data")
-        else:
-            async_dispatcher_send(hass, TOPIC_DATA_UPDATE)
+    router.async_schedule_updates()
 
     hass.data[DOMAIN][config_entry.data[CONF_HOST]].update({
         DATA_LISTENER: {
-            config_entry.entry_id: async_track_time_interval(
-                hass,
-                async_track_time_interval_sensor_update,
-                SCAN_INTERVAL_DATA,
-            )
+            config_entry.entry_id: [
+                router.async_cancel_updates,
+                hass.bus.async_listen(
+                    entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+                    async_entity_registry_updated,
+                ),
+            ]
         }
     })
 
     return True
 
+def service_hosts(service, routers):
+    """Return the routers a service applies to: the given routers, all routers, or the only router."""
+
+    hosts = service.data.get(CONF_HOST)
+    if not hosts:
+        if not routers:
+            _LOGGER.error("%s: no routers configured", service.service)
+            return []
+        if len(routers) > 1:
+            _LOGGER.error(
+                "%s: more than one router configured, must specify %s or any of URLs %s",
+                service.service,
+                HOST_ALL,
+                sorted(routers),
+            )
+            return []
+        return list(routers)
+
+    if HOST_ALL in hosts:
+        return sorted(routers)
+
+    for host in hosts:
+        if host not in routers:
+            _LOGGER.error("%s: router %s unavailable", service.service, host)
+
+    return [host for host in hosts if host in routers]
+
+async def async_run_action(service, routers, hosts):
+    """Run the action of a service on the given routers at the same time."""
+
+    action = SERVICE_ACTIONS[service.service]
+    results = await asyncio.gather(
+        *(action(routers[host]['entity'], service.data) for host in hosts),
+        return_exceptions=True,
+    )
+
+    for host, result in zip(hosts, results):
+        if isinstance(result, Exception):
+            _LOGGER.error("%s: router %s failed: %s", service.service, host, result)
+        else:
+            _LOGGER.debug("__init__::async_run_action %s %s: %s", service.service, host, result)
+
+async def async_rolling_reboot(service, routers, hosts):
+    """Reboot the given routers, a few at a time, and wait for each router to be healthy again.
+
+    When a router doesn't come back, the routers that weren't rebooted yet are skipped.
+    """
+
+    semaphore = asyncio.Semaphore(service.data[ATTR_PARALLEL])
+    failed = []
+
+    async def async_reboot(host):
+        """Reboot a router when it's its turn."""
+
+        async with semaphore:
+            if failed:
+                _LOGGER.warning("%s: skipping router %s, because %s didn't come back", service.service, host, ", ".join(failed))
+                return
+
+            _LOGGER.info("Rebooting router %s", host)
+            try:
+                healthy = await routers[host]['entity'].async_reboot(service.data[ATTR_TIMEOUT])
+            except Exception as e:
+                _LOGGER.error("%s: router %s failed: %s", service.service, host, e)
+                failed.append(host)
+                return
+
+            if healthy:
+                _LOGGER.info("Router %s has rebooted and is healthy", host)
+            else:
+                _LOGGER.error("%s: router %s isn't healthy %s after the reboot", service.service, host, service.data[ATTR_TIMEOUT])
+                failed.append(host)
+
+    await asyncio.gather(*(async_reboot(host) for host in hosts))
+
+async def async_run_command(hass, service, routers, hosts):
+    """Run a batch of commands on the given routers, and fire an event with the output of each router."""
+
+    commands = service.data[ATTR_COMMANDS]
+
+    # Each router runs the whole batch in one request, and all routers run it at the same time
+    outputs = await asyncio.gather(
+        *(routers[host]['entity'].async_run_command(commands) for host in hosts),
+        return_exceptions=True,
+    )
+
+    results = {}
+    for host, output in zip(hosts, outputs):
+        if isinstance(output, Exception):
+            _LOGGER.error("%s: router %s failed: %s", service.service, host, output)
+            results.update({host: {ATTR_ERROR: str(output)}})
+        else:
+            _LOGGER.debug("__init__::async_run_command %s: %s", host, output)
+            results.update({host: {ATTR_OUTPUT: output}})
+
+    hass.bus.async_fire(EVENT_COMMAND_RESULT, {ATTR_COMMANDS: commands, ATTR_RESULTS: results})
+
 async def async_unload_entry(hass, config_entry):
     """Unload a DD-WRT config entry."""
 
     _LOGGER.debug("__init__::async_unload_entry config=%s", config_entry)
 
-    cancel = hass.data[DOMAIN][config_entry.data[CONF_HOST]][DATA_LISTENER].pop(config_entry.entry_id)
-    cancel()
+    for cancel in hass.data[DOMAIN][config_entry.data[CONF_HOST]][DATA_LISTENER].pop(config_entry.entry_id):
+        cancel()
+
+    await hass.data[DOMAIN][config_entry.data[CONF_HOST]]['entity'].async_close()
 
     for component in (COMPONENTS):
         await hass.config_entries.async_forward_entry_unload(config_entry, component)
@@ -259,18 +451,21 @@ async def async_unload_entry(hass, config_entry):
 class DDWrtEntity:
     """This class queries a wireless router running DD-WRT firmware."""
 
-    def __init__(self, hass, config):
+    def __init__(self, hass, config, engine):
         """Initialize the DD-WRT entity."""
 
         _LOGGER.debug("DDWrtEntity.__init__")
 
         self._hass = hass
+        self._engine = engine
         self._name = config.data[CONF_NAME]
         self._host = config.data[CONF_HOST]
         self._username = config.data[CONF_USERNAME]
         self._password = config.data[CONF_PASSWORD]
         self._protocol = "https" if config.data[CONF_SSL] else "http"
         self._verify_ssl = config.data[CONF_VERIFY_SSL]
+        self._ssl_fingerprint = config.data.get(CONF_SSL_FINGERPRINT)
+        self._resources = config.data[CONF_RESOURCES]
 
         # Determine what type of clients need to be listed
         self._track_arp = True if CONF_TRACK_ARP in config.data[CONF_RESOURCES] else False
@@ -280,6 +475,17 @@ class DDWrtEntity:
         self._track_wds = True if CONF_TRACK_WDS in config.data[CONF_RESOURCES] else False
         self._track_wireless = True if CONF_TRACK_WIRELESS in config.data[CONF_RESOURCES] else False
 
+        # Whether the connection table is polled, to add the connections of each client
+        self._conntrack = config.data.get(CONF_CONNTRACK, False)
+
+        # Rules that decide which clients are tracked, compiled once
+        self._client_filter = None
+        if config.data.get(CONF_TRACK_INCLUDE) or config.data.get(CONF_TRACK_EXCLUDE):
+            self._client_filter = ClientFilter(
+                config.data.get(CONF_TRACK_INCLUDE, []),
+                config.data.get(CONF_TRACK_EXCLUDE, []),
+            )
+
         # Guard against undefined sensor types
         self._sensor_type = "undefined"
         self._binary_sensor_type = "undefined"
@@ -293,33 +499,56 @@ class DDWrtEntity:
         for sensor_type in SENSORS:
             self.results.update({sensor_type: None})
 
-        # Get session
-        session = async_get_clientsession(self._hass, verify_ssl=self._verify_ssl)
-
-        # Clear the clients list of MAC addresses
+        # Clear the clients list of MAC addresses, and when each client was first and last seen
         self.devices = {}
-
-        # Initialize the DDWrt object
+        self.conntrack = {}
+        self.first_seen = {}
+        self.last_seen = {}
+
+        # Status pages that are currently polled, and the callbacks to stop polling them
+        self._scan_intervals = {}
+        self._listeners = []
+
+        # Firmware and model info, cached on disk with the router's boot time when it was last fetched
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{slugify(self._host)}")
+        self._static_updated = None
+        self._static_boot_time = None
+
+        # Last known results and clients, restored is true until the router has been polled
+        self._snapshot_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{slugify(self._host)}.snapshot")
+        self.restored = False
+
+        # Health of the connection to the router, and the backoff before the next probe while it's open
+        self.health = HEALTH_HEALTHY
+        self._failures = 0
+        self._backoff = None
+        self._cancel_probe = None
+
+        # Initialize the DDWrt object on a session of Home Assistant, which is closed when the router is
+        # unloaded or Home Assistant stops. DDWrt bounds the number of connections to the router
+        self._session = async_create_clientsession(hass, verify_ssl=self._verify_ssl)
         self._router = DDWrt(
-            aio_session = session,
+            aio_session = self._session,
             host = self._host,
             username = self._username,
             password = self._password,
             protocol = self._protocol,
             verify_ssl = self._verify_ssl,
+            ssl_fingerprint = self._ssl_fingerprint,
         )
 
-    async def async_update_about_data(self):
-        """Get about information from the DD-WRT router."""
+    async def async_update_about_data(self, refresh=True):
+        """Get about information from the DD-WRT router, or from the cache if it's fresh and refresh is False."""
+
+        _LOGGER.debug("DDWrtEntity.update_about_data refresh=%s", refresh)
 
-        _LOGGER.debug("DDWrtEntity.update_about_data")
+        if await self._async_load_static_info() and not refresh:
+            _LOGGER.debug("DDWrtEntity.update_about_data using cached about data")
+            self._async_update_results()
+            return True
 
         try:
-            result = await self._hass.async_add_executor_job(
-                partial(
-                    self._router.update_about_data
-                )
-            )
+            result = await self._engine.async_run(self._host, self._router.async_update_about_data)
         except DDWrt.ExceptionSelfSigned:
             _LOGGER.warning("Can't verify self-signed certificate for %s. Please add 'ssl_verify: false' to your config.", self._host)
             return None
@@ -327,111 +556,639 @@ class DDWrtEntity:
             _LOGGER.warning("Unable to update about data: %s", e)
             return None
 
-#        return self._router.update_about_data()
         _LOGGER.debug("_router.results=%s", self._router.results)
+        self._async_update_results()
+
+        if result:
+            self._static_updated = dt_util.utcnow()
+            self._static_boot_time = self._router.boot_time
+            self._async_save_static_info()
+
         return result
 
-    async def async_update_sensor_data(self):
+    async def _async_load_static_info(self):
+        """Restore the cached about data once, and return true if it's younger than SCAN_INTERVAL_ABOUT."""
+
+        if self._static_updated is None:
+            data = await self._store.async_load()
+            try:
+                updated = dt_util.parse_datetime(data["updated"])
+                boot_time = datetime.fromisoformat(data["boot_time"]) if data["boot_time"] else None
+                results = {key: data["results"][key] for key in STATIC_RESULTS}
+                validators = {url: tuple(value) for url, value in data["validators"].items()}
+            except (KeyError, TypeError, ValueError):
+                return False
+
+            _LOGGER.debug("DDWrtEntity._async_load_static_info results=%s updated=%s", results, updated)
+
+            self._router.results.update(results)
+            self._router.validators.update(validators)
+            self._static_updated = updated
+            self._static_boot_time = boot_time
+
+        return dt_util.utcnow() - self._static_updated < SCAN_INTERVAL_ABOUT
+
+    @callback
+    def _async_save_static_info(self):
+        """Write the about data to disk."""
+
+        self._store.async_delay_save(self._static_info_data, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _static_info_data(self):
+        """Return the about data to write to disk."""
+
+        return {
+            "updated": self._static_updated.isoformat(),
+            "boot_time": self._static_boot_time.isoformat() if self._static_boot_time else None,
+            "results": {key: self._router.results.get(key) for key in STATIC_RESULTS},
+            "validators": self._router.validators,
+        }
+
+    @callback
+    def _async_check_reboot(self):
+        """Refresh the about data when the router has rebooted, its firmware may have been upgraded."""
+
+        boot_time = self._router.boot_time
+        if boot_time is None or self._static_updated is None:
+            return
+
+        if self._static_boot_time is None:
+            self._static_boot_time = boot_time
+            self._async_save_static_info()
+        elif boot_time - self._static_boot_time > REBOOT_TOLERANCE:
+            _LOGGER.info("Router %s has rebooted, updating its firmware and model info", self._host)
+            self._static_boot_time = boot_time
+            self._hass.async_create_task(self.async_update_about_data())
+
+    async def async_restore_snapshot(self):
+        """Restore the last known results and clients, and return true if they could be restored."""
+
+        await self._async_load_static_info()
+        data = await self._snapshot_store.async_load()
+        if self._static_updated is None or data is None:
+            return False
+
+        try:
+            results = {key: value for key, value in data["results"].items() if key in self.results}
+            devices = {key: Client.from_snapshot(value) for key, value in data["devices"].items()}
+            if self._client_filter is not None:
+                devices = {
+                    key: client
+                    for key, client in devices.items()
+                    if self._client_filter.match(client.mac, client.ip, client.sources)
+                }
+            first_seen = {key: dt_util.parse_datetime(value) for key, value in data["first_seen"].items()}
+            last_seen = {key: dt_util.parse_datetime(value) for key, value in data["last_seen"].items()}
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.debug("DDWrtEntity.async_restore_snapshot invalid snapshot: %s", e)
+            return False
+
+        _LOGGER.debug("DDWrtEntity.async_restore_snapshot restored %i results and %i clients", len(results), len(devices))
+
+        self.results.update(self._router.results)
+        self.results.update(results)
+        self.devices = devices
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.restored = True
+
+        return True
+
+    async def async_refresh(self):
+        """Replace the restored results and clients with data from the router."""
+
+        _LOGGER.debug("DDWrtEntity.async_refresh")
+
+        await self.async_update_about_data(refresh=False)
+        await self.async_update_sensor_data()
+
+    @callback
+    def _async_save_snapshot(self):
+        """Write the results and clients to disk."""
+
+        self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_data(self):
+        """Return the results and clients to write to disk, leaving out the results that aren't known."""
+
+        return {
+            "results": {
+                key: value
+                for key, value in self.results.items()
+                if value is not None and key in BINARY_SENSORS.keys() | CAMERAS.keys() | SENSORS.keys()
+            },
+            "devices": {key: client.as_snapshot() for key, client in self.devices.items()},
+            "first_seen": {key: value.isoformat() for key, value in self.first_seen.items()},
+            "last_seen": {key: value.isoformat() for key, value in self.last_seen.items()},
+        }
+
+    def enabled_resources(self):
+        """Return the configured resources that aren't disabled in the entity registry."""
+
+        registry = entity_registry.async_get(self._hass)
+
+        enabled_resources = []
+        for resource in self._resources:
+            if resource in BINARY_SENSORS:
+                platform = CONF_BINARY_SENSOR
+            elif resource in CAMERAS:
+                platform = CONF_CAMERA
+            elif resource in SENSORS:
+                platform = CONF_SENSOR
+            else:
+                # Device trackers create an entity per client, so they can't be disabled as a whole
+                enabled_resources.append(resource)
+                continue
+
+            entity_id = registry.async_get_entity_id(platform, DOMAIN, f"{self._host}_{resource}")
+            if entity_id is None or not registry.async_get(entity_id).disabled:
+                enabled_resources.append(resource)
+
+        return enabled_resources
+
+    def scan_intervals(self):
+        """Return the poll interval for each status page needed by the enabled resources."""
+
+        # The about data is always needed for the device info
+        scan_intervals = {ENDPOINT_ABOUT: SCAN_INTERVAL_ENDPOINTS[ENDPOINT_ABOUT]}
+        if self._conntrack:
+            scan_intervals.update({ENDPOINT_CONNTRACK: SCAN_INTERVAL_ENDPOINTS[ENDPOINT_CONNTRACK]})
+
+        for resource in self.enabled_resources():
+            endpoint = RESOURCE_ENDPOINTS[resource]
+            if endpoint not in SCAN_INTERVAL_ENDPOINTS:
+                continue
+
+            # Device trackers need their status page polled faster than the sensors do
+            interval = SCAN_INTERVAL_ENDPOINTS[endpoint]
+            if resource in DEVICE_TRACKERS:
+                interval = min(interval, DEVICE_TRACKERS[resource][ATTR_SCAN_INTERVAL])
+
+            scan_intervals[endpoint] = min(scan_intervals.get(endpoint, interval), interval)
+
+        _LOGGER.debug("DDWrtEntity.scan_intervals %s", scan_intervals)
+        return scan_intervals
+
+    @callback
+    def async_schedule_updates(self):
+        """Poll each needed status page at its own interval, pages that share an interval are fetched together."""
+
+        scan_intervals = self.scan_intervals()
+        if scan_intervals == self._scan_intervals:
+            return
+
+        # Pages that weren't polled before are fetched right away when the plan changes
+        new_endpoints = []
+        if self._scan_intervals:
+            new_endpoints = [
+                endpoint
+                for endpoint in scan_intervals
+                if endpoint not in self._scan_intervals
+            ]
+
+        self.async_cancel_updates()
+        self._scan_intervals = scan_intervals
+
+        self._listeners.append(
+            self._engine.async_track(
+                self._host,
+                ENDPOINT_ABOUT,
+                self._async_track_time_interval_about_update,
+                scan_intervals[ENDPOINT_ABOUT],
+            )
+        )
+
+        endpoints_by_interval = {}
+        for endpoint, interval in scan_intervals.items():
+            if endpoint != ENDPOINT_ABOUT:
+                endpoints_by_interval.setdefault(interval, []).append(endpoint)
+
+        for interval, endpoints in endpoints_by_interval.items():
+            _LOGGER.debug("DDWrtEntity.async_schedule_updates polling %s every %s", endpoints, interval)
+            self._listeners.append(
+                self._engine.async_track(
+                    self._host,
+                    ",".join(sorted(endpoints)),
+                    partial(self._async_track_time_interval_sensor_update, endpoints),
+                    interval,
+                )
+            )
+
+        if new_endpoints:
+            self._hass.async_create_task(
+                self._async_track_time_interval_sensor_update(new_endpoints, None)
+            )
+
+    @callback
+    def async_cancel_updates(self):
+        """Stop polling the router."""
+
+        for cancel in self._listeners:
+            cancel()
+        self._listeners = []
+        self._scan_intervals = {}
+
+    async def _async_track_time_interval_about_update(self, event_time):
+        """Update the entity's about data and all it's components."""
+
+        _LOGGER.debug("DDWrtEntity._async_track_time_interval_about_update called")
+
+        if self.health == HEALTH_OPEN:
+            return
+
+        if not await self.async_update_about_data():
+            _LOGGER.warning("Failed to update about data")
+
+    async def _async_track_time_interval_sensor_update(self, endpoints, event_time):
+        """Update the entity's sensor data and all it's components."""
+
+        _LOGGER.debug("DDWrtEntity._async_track_time_interval_sensor_update called for %s", endpoints)
+
+        if self.health == HEALTH_OPEN:
+            return
+
+        if not await self.async_update_sensor_data(endpoints):
+            _LOGGER.warning("Failed to update sensor data")
+
+    def _endpoint_updates(self):
+        """Return the update method of each status page."""
+
+        return {
+            ENDPOINT_CONNTRACK: self._router.async_update_conntrack_data,
+            ENDPOINT_LAN: self._router.async_update_lan_data,
+            ENDPOINT_NETWORKING: self._router.async_update_network_data,
+            ENDPOINT_ROUTER: self._router.async_update_router_data,
+            ENDPOINT_INTERNET: self._router.async_update_wan_data,
+            # The traffic camera draws its own chart from the counters in nvram, instead of ttgraph.cgi. They're
+            # read with a command, which is only polled every SCAN_INTERVAL_GRAPH and when the camera is enabled
+            ENDPOINT_TTGRAPH: self._router.async_update_traffic_data,
+            ENDPOINT_WIRELESS: self._router.async_update_wireless_data,
+            ENDPOINT_UPNP: self._router.async_update_upnp_data,
+        }
+
+    async def async_update_sensor_data(self, endpoints=None):
         """Get information from the DD-WRT router."""
 
-        _LOGGER.debug("DDWrtEntity.update_sensor_data")
+        _LOGGER.debug("DDWrtEntity.update_sensor_data endpoints=%s", endpoints)
+
+        # Fetch the status pages concurrently, so a poll cycle takes as long as the slowest page
+        if endpoints is None:
+            endpoints = self._scan_intervals or self.scan_intervals()
+        updates = {
+            endpoint: update
+            for endpoint, update in self._endpoint_updates().items()
+            if endpoint in endpoints
+        }
+
+        results = await asyncio.gather(
+            *(self._engine.async_run(self._host, update) for update in updates.values()),
+            return_exceptions=True,
+        )
 
+        # Only warn about unreachable pages while the router is healthy, the health state logs outages.
+        # The traffic data is read with an administrator command, so its failures don't count for the
+        # health: a user without access to it would otherwise stop the polling of the router
         success = True
+        failed = 0
+        checked = len(updates) - (ENDPOINT_TTGRAPH in updates)
+        for name, result in zip(updates, results):
+            if isinstance(result, KeyError):
+                _LOGGER.warning("Missing key in %s, please report this error to the developer. (%s)", name, result)
+                success = False
+            elif isinstance(result, Exception):
+                log = _LOGGER.warning if self.health == HEALTH_HEALTHY else _LOGGER.debug
+                log("Unable to update data from %s: %s", name, result)
+                success = False
+                if name != ENDPOINT_TTGRAPH:
+                    failed += 1
+
+        if checked:
+            self._async_update_health(checked - failed, failed)
+
+        # The entities drop their restored attribute once the router has responded
+        if self.restored and (failed < checked or not checked):
+            _LOGGER.debug("DDWrtEntity.async_update_sensor_data replacing the restored data")
+            self.restored = False
+            async_dispatcher_send(self._hass, self.signal_health)
 
-        # Update LAN data
-        try:
-            result = await self._hass.async_add_executor_job(self._router.update_lan_data)
-        except KeyError as e:
-            _LOGGER.warning("Missing key in LAN data, please report this error to the developer. (%s)", e)
-            success = False
-        except Exception as e:
-            _LOGGER.warning("Unable to update LAN data: %s", e)
-            success = False
+        _LOGGER.debug("self._router.results = %s", self._router.results)
+        self._async_update_results()
+        self._async_check_reboot()
 
-        # Update networking data
-        try:
-            result = await self._hass.async_add_executor_job(self._router.update_network_data)
-        except KeyError as e:
-            _LOGGER.warning("Missing key in network data, please report this error to the developer. (%s)", e)
-            success = False
-        except Exception as e:
-            _LOGGER.warning("Unable to update network data: %s", e)
-            success = False
+        # The wl_ results are those of the first radio, the values of all radios are added as attributes
+        if len(self._router.radios) > 1:
+            keys = set().union(*self._router.radios.values())
+            self._async_update_results({
+                f"{key}_radios": {radio: results.get(key) for radio, results in self._router.radios.items()}
+                for key in keys
+            })
 
-        # Update router data
-        try:
-            result = await self._hass.async_add_executor_job(self._router.update_router_data)
-        except KeyError as e:
-            _LOGGER.warning("Missing key in router data, please report this error to the developer. (%s)", e)
-            success = False
-        except Exception as e:
-            _LOGGER.warning("Unable to update router data: %s", e)
-            success = False
+        # Update device tracker data
+        self._async_update_devices()
+
+        self._async_save_snapshot()
+
+        return success
+
+    async def async_close(self):
+        """Close the connections to the router."""
+
+        _LOGGER.debug("DDWrtEntity.async_close")
+
+        if self._cancel_probe is not None:
+            self._cancel_probe()
+            self._cancel_probe = None
+        self._engine.async_release(self._host)
+        await self._router.async_close()
+        await self._session.close()
+
+    @property
+    def traffic(self):
+        """Return the daily traffic of this month, or None if it wasn't received yet."""
+
+        return self._router.traffic
+
+    @property
+    def traffic_graph_url(self):
+        """Return the URL of the traffic graph of this month."""
+
+        return self._router.traffic_graph_url(False)
+
+    @property
+    def queue_depth(self):
+        """Return the number of requests to the router that are waiting or running."""
+
+        return self._engine.queue_depth(self._host)
+
+    @property
+    def available(self):
+        """Return true if the router can be polled."""
+
+        return self.health != HEALTH_OPEN
+
+    @property
+    def signal_health(self):
+        """Return the dispatcher signal that is sent when the health of this router changes."""
+
+        return f"{TOPIC_DATA_UPDATE}_{self._host}_health"
+
+    @property
+    def signal_queue_depth(self):
+        """Return the dispatcher signal that is sent when the queue depth of this router changes."""
+
+        return self._engine.signal_queue_depth(self._host)
+
+    @callback
+    def _async_set_health(self, health):
+        """Set the health of the router, and notify the entities when it changes."""
+
+        if health == self.health:
+            return
+
+        _LOGGER.debug("DDWrtEntity._async_set_health %s -> %s", self.health, health)
+
+        self.health = health
+        async_dispatcher_send(self._hass, self.signal_health)
+
+    @callback
+    def _async_update_health(self, succeeded, failed):
+        """Update the health of the router after a poll cycle."""
+
+        if not failed:
+            if self.health != HEALTH_HEALTHY:
+                _LOGGER.info("Router %s is healthy again", self._host)
+            self._failures = 0
+            self._backoff = None
+            self._async_set_health(HEALTH_HEALTHY)
+        elif succeeded:
+            self._async_set_health(HEALTH_DEGRADED)
+        else:
+            self._failures += 1
+            if self._failures >= HEALTH_FAILURES_OPEN:
+                self._async_open_circuit()
+            else:
+                self._async_set_health(HEALTH_DEGRADED)
+
+    @callback
+    def _async_open_circuit(self):
+        """Stop polling the router, and probe it again after an exponential backoff with jitter."""
+
+        # A failed update while the circuit is open doesn't schedule another probe or extend the backoff
+        if self.health == HEALTH_OPEN and self._cancel_probe is not None:
+            _LOGGER.debug("DDWrtEntity._async_open_circuit probe already scheduled")
+            return
+
+        self._backoff = BACKOFF_MIN if self._backoff is None else min(self._backoff * 2, BACKOFF_MAX)
+        delay = self._backoff.total_seconds() * random.uniform(0.5, 1.0)
+
+        if self.health != HEALTH_OPEN:
+            _LOGGER.warning("Router %s is unreachable, polling is paused. Retrying in %i seconds", self._host, delay)
+        else:
+            _LOGGER.debug("DDWrtEntity._async_open_circuit retrying in %i seconds", delay)
+
+        self._async_set_health(HEALTH_OPEN)
+        self._cancel_probe = async_call_later(self._hass, delay, self._async_probe)
+
+    async def _async_probe(self, event_time):
+        """Probe a single status page, and resume polling when the router responds."""
+
+        self._cancel_probe = None
+
+        _LOGGER.debug("DDWrtEntity._async_probe probing %s", HEALTH_PROBE_ENDPOINT)
 
-        # Update WAN data
-        try:
-            result = await self._hass.async_add_executor_job(self._router.update_wan_data)
-        except KeyError as e:
-            _LOGGER.warning("Missing key in WAN data, please report this error to the developer. (%s)", e)
-            success = False
-        except Exception as e:
-            _LOGGER.warning("Unable to update WAN data: %s", e)
-            success = False
-
-#        try:
-        result = await self._hass.async_add_executor_job(self._router.update_wireless_data)
-#        except KeyError as e:
-#            _LOGGER.warning("Missing key in wireless data, please report this error to the developer. (%s)", e)
-#            success = False
-#        except Exception as e:
-#            _LOGGER.warning("Unable to update wireless data: %s", e)
-#            success = False
-
-        # Update UPNP data
         try:
-            result = await self._hass.async_add_executor_job(self._router.update_upnp_data)
-        except KeyError as e:
-            _LOGGER.warning("Missing key in UPNP data, please report this error to the developer. (%s)", e)
-            success = False
+            await self._engine.async_run(self._host, self._endpoint_updates()[HEALTH_PROBE_ENDPOINT])
         except Exception as e:
-            _LOGGER.warning("Unable to update UPNP data: %s", e)
-            success = False
+            _LOGGER.debug("DDWrtEntity._async_probe failed: %s", e)
+            self._async_open_circuit()
+            return
 
-        _LOGGER.debug("self._router.results = %s", self._router.results)
-        for key, value in self._router.results.items():
-            self.results.update({key: value})
+        # A single failed poll cycle opens the circuit again, with a longer backoff
+        _LOGGER.info("Router %s is reachable again, resuming polling", self._host)
+        self._failures = HEALTH_FAILURES_OPEN - 1
+        self._async_set_health(HEALTH_DEGRADED)
+        await self.async_update_sensor_data()
 
-        # Update device tracker data
-        self.devices = {}
-        if self._track_arp:
-            self.devices.update(self._router.clients_arp)
-        if self._track_dhcp:
-            self.devices.update(self._router.clients_dhcp)
-        if self._track_pppoe:
-            self.devices.update(self._router.clients_pppoe)
-        if self._track_pptp:
-            self.devices.update(self._router.clients_pptp)
-        if self._track_wds:
-            self.devices.update(self._router.clients_wds)
+    def signal_update(self, key):
+        """Return the dispatcher signal that is sent when a result of this router changes."""
+
+        return f"{TOPIC_DATA_UPDATE}_{self._host}_{key}"
+
+    @property
+    def signal_device_new(self):
+        """Return the dispatcher signal that is sent when new clients are found."""
+
+        return f"{TOPIC_DATA_UPDATE}_{self._host}_device_new"
+
+    def signal_device_update(self, mac):
+        """Return the dispatcher signal that is sent when a client connects, disconnects or changes."""
+
+        return f"{TOPIC_DATA_UPDATE}_{self._host}_device_{mac}"
+
+    @callback
+    def _async_update_devices(self):
+        """Merge the tracked client lists, and notify only the clients that were added, removed or changed."""
+
+        # The most specific source of a client comes first
+        tables = []
         if self._track_wireless:
-            self.devices.update(self._router.clients_wireless)
+            tables.append(self._router.clients_wireless)
+        if self._track_wds:
+            tables.append(self._router.clients_wds)
+        if self._track_pptp:
+            tables.append(self._router.clients_pptp)
+        if self._track_pppoe:
+            tables.append(self._router.clients_pppoe)
+        if self._track_dhcp:
+            tables.append(self._router.clients_dhcp)
+        if self._track_arp:
+            tables.append(self._router.clients_arp)
+        devices = merge_clients(*tables, client_filter=self._client_filter)
+
+        added = devices.keys() - self.devices.keys()
+        removed = self.devices.keys() - devices.keys()
+        # Join the connections of each client by its IP address
+        conntrack = {
+            mac: self._router.conntrack[client.ip]
+            for mac, client in devices.items()
+            if client.ip in self._router.conntrack
+        }
+
+        changed = {
+            mac
+            for mac in devices.keys() & self.devices.keys()
+            if devices[mac] != self.devices[mac] or conntrack.get(mac) != self.conntrack.get(mac)
+        }
 
-        # Update traffic graphs
-        self.results.update({
-            "traffic": self._router.traffic_graph_url(False)
-        })
+        now = dt_util.utcnow()
+        for mac in added:
+            self.first_seen.update({mac: now})
+        for mac in devices:
+            self.last_seen.update({mac: now})
+        self.devices = devices
+        self.conntrack = conntrack
 
-        return success
+        if not (added or removed or changed):
+            return
+
+        _LOGGER.debug("DDWrtEntity._async_update_devices added=%s removed=%s changed=%s", added, removed, changed)
+
+        if added:
+            async_dispatcher_send(self._hass, self.signal_device_new)
+        for mac in added | removed | changed:
+            async_dispatcher_send(self._hass, self.signal_device_update(mac))
+
+    @callback
+    def _async_update_results(self, results=None):
+        """Merge new results, and notify only the entities whose results changed."""
+
+        if results is None:
+            results = self._router.results
+
+        changed = [
+            key
+            for key, value in results.items()
+            if key not in self.results or self.results[key] != value
+        ]
+        if not changed:
+            return
+
+        _LOGGER.debug("DDWrtEntity._async_update_results changed=%s", changed)
+
+        for key in changed:
+            self.results.update({key: results[key]})
+        for key in changed:
+            async_dispatcher_send(self._hass, self.signal_update(key))
+
+
+    async def async_run_command(self, commands):
+        """Run a batch of commands on the router in one request, and return the output of each command."""
+
+        return await self._engine.async_run(self._host, partial(self._router.async_run_command, commands))
+
+
+    async def async_upnp_delete(self, rule):
+        """Delete an UPnP rule, or all rules, on the router."""
+
+        return await self._engine.async_run(self._host, partial(self._router.async_upnp_delete, rule))
+
+
+    async def async_wan_dhcp_release(self):
+        """Release the DHCP lease of the router's WAN interface."""
+
+        return await self._engine.async_run(self._host, self._router.async_wan_dhcp_release)
+
+
+    async def async_wan_dhcp_renew(self):
+        """Renew the DHCP lease of the router's WAN interface."""
+
+        return await self._engine.async_run(self._host, self._router.async_wan_dhcp_renew)
+
+
+    async def async_wan_pppoe_connect(self):
+        """Connect the router's PPPoE WAN interface."""
+
+        return await self._engine.async_run(self._host, self._router.async_wan_pppoe_connect)
+
+
+    async def async_wan_pppoe_disconnect(self):
+        """Disconnect the router's PPPoE WAN interface."""
+
+        return await self._engine.async_run(self._host, self._router.async_wan_pppoe_disconnect)
+
+
+    async def async_reboot(self, timeout=None):
+        """Reboot the router. With a timeout, wait until the router is healthy again, and return whether it is."""
+
+        boot_time = self._router.boot_time
+        sent = datetime.utcnow()
+        await self._engine.async_run(self._host, self._router.async_reboot)
+        if timeout is None:
+            return True
+
+        # The router still responds for a moment after the reboot command. It's back once it
+        # didn't respond for a while, or when its boot time shows it booted after the command.
+        # Only a single status page is probed while it boots, so the entities and clients keep
+        # their last known state
+        rebooted = False
+        deadline = monotonic() + timeout.total_seconds()
+        while monotonic() < deadline:
+            await asyncio.sleep(REBOOT_PROBE_INTERVAL.total_seconds())
+
+            try:
+                await self._engine.async_run(self._host, self._endpoint_updates()[HEALTH_PROBE_ENDPOINT])
+            except Exception as e:
+                _LOGGER.debug("DDWrtEntity.async_reboot %s is down: %s", self._host, e)
+                rebooted = True
+                continue
+
+            if not rebooted:
+                if not self._booted_since(boot_time, sent):
+                    continue
+                rebooted = True
 
+            # The router is back, resume polling with a full update instead of waiting for a pending probe
+            if self._cancel_probe is not None:
+                self._cancel_probe()
+                self._cancel_probe = None
+            await self.async_update_sensor_data()
+            if self.health == HEALTH_HEALTHY:
+                return True
 
-    async def wan_pppoe_connect(self):
-        return self._router.wan_pppoe_connect
+        return False
 
 
-    async def wan_pppoe_disconnect(self):
-        return self._router.wan_pppoe_disconnect
+    def _booted_since(self, boot_time, sent):
+        """Return true if the router booted after a reboot command, from its boot time before the command."""
 
+        if self._router.boot_time is None:
+            return False
 
-    async def reboot(self):
-        return self._router.reboot
+        # The uptime is rounded down to minutes, so a boot time after the command is a reboot,
+        # also when the boot time before it wasn't known or the router had only just booted
+        if self._router.boot_time > sent:
+            return True
+        return boot_time is not None and self._router.boot_time - boot_time > REBOOT_TOLERANCE
 
@@ -3,6 +3,7 @@
 import logging
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from . import (
     ATTR_ATTRIBUTION,
@@ -11,6 +12,7 @@ from . import (
     ATTR_ICON,
     ATTR_ICON_OFF,
     ATTR_NAME,
+    ATTR_RESTORED,
     ATTRIBUTION,
     BINARY_SENSORS,
     CONF_RESOURCES,
@@ -60,16 +62,26 @@ class DdwrtBinarySensor(BinarySensorEntity):
         self._routername = routername
         self._unique_id = '{}_{}'.format(self._host, self._binary_sensor_type)
  
-    async def async_update(self):
-        """Fetch status from DD-WRT."""
-
-#        _LOGGER.debug("DdwrtSensor::async_update for %s", self._binary_sensor_type)
-
     async def async_added_to_hass(self):
         """Client entity created."""
 
         _LOGGER.debug("DdwrtBinarySensor::async_added_to_hass %s", self._binary_sensor_type)
 
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_update(self._binary_sensor_type),
+                self.async_write_ha_state,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_health,
+                self.async_write_ha_state,
+            )
+        )
+
     @property
     def device_info(self):
         """Return the device info."""
@@ -84,6 +96,16 @@ class DdwrtBinarySensor(BinarySensorEntity):
         _LOGGER.debug("DdwrtBinarySensor::device_info result=%s", result)
         return result
 
+    @property
+    def should_poll(self):
+        """No polling needed, the router pushes its updates."""
+        return False
+
+    @property
+    def available(self):
+        """Return true if the router can be reached."""
+        return self._api.available
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -100,6 +122,8 @@ class DdwrtBinarySensor(BinarySensorEntity):
         attr = {
             ATTR_ATTRIBUTION: ATTRIBUTION,
         }
+        if self._api.restored:
+            attr.update({ATTR_RESTORED: True})
         return attr
 
     @property
@@ -1,16 +1,21 @@
 """DD-WRT camera (usage statistics) - Eelco Huininga 2019-2020."""
 
+from calendar import monthrange
 import logging
+from math import floor, log10
 
 from homeassistant.components.camera import Camera
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from . import (
     ATTR_ATTRIBUTION,
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     ATTR_NAME,
+    ATTR_RESTORED,
     ATTRIBUTION,
     CAMERAS,
+    CHART_CONTENT_TYPE,
     CONF_RESOURCES,
     CONF_HOST,
     CONF_NAME,
@@ -19,6 +24,14 @@ from . import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Size and margins (left, right, top, bottom) of the traffic chart, and the colors of the bars
+_CHART_WIDTH = 640
+_CHART_HEIGHT = 320
+_CHART_MARGINS = (60, 10, 30, 30)
+_CHART_GRID_LINES = 4
+_CHART_COLOR_IN = "#03a9f4"
+_CHART_COLOR_OUT = "#ff9800"
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the DD-WRT camera."""
@@ -56,19 +69,43 @@ class DdwrtCamera(Camera):
         self._friendly_name = CAMERAS[self._camera_type][ATTR_NAME]
         self._routername = routername
         self._unique_id = '{}_{}'.format(self._host, self._camera_type)
- 
-    async def async_update(self):
-        """Fetch status from DD-WRT."""
+        self._chart = None
 
-#        _LOGGER.debug("DdwrtSensor::async_update for %s", self._camera_type)
+        # The chart is drawn here from the traffic counters, instead of fetching ttgraph.cgi
+        self.content_type = CHART_CONTENT_TYPE
 
     async def async_added_to_hass(self):
         """Client entity created."""
 
         _LOGGER.debug("DdwrtCamera::async_added_to_hass camera_type=%s", self._camera_type)
 
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_update(self._camera_type),
+                self.async_write_ha_state,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_health,
+                self.async_write_ha_state,
+            )
+        )
+
     async def async_camera_image(self):
-        return self._api.results[self._camera_type]
+        """Return the traffic chart, which is only drawn again when the traffic data has changed."""
+
+        traffic = self._api.traffic
+        if traffic is None:
+            return None
+
+        if self._chart is None or self._chart[0] != traffic.digest:
+            _LOGGER.debug("DdwrtCamera::async_camera_image drawing the chart of %s", traffic.month)
+            self._chart = (traffic.digest, render_traffic_chart(traffic))
+
+        return self._chart[1]
 
     @property
     def brand(self):
@@ -94,8 +131,16 @@ class DdwrtCamera(Camera):
         """Return the state attributes."""
         attr = {
             ATTR_ATTRIBUTION: ATTRIBUTION,
-            "video_url": self._api.results[self._camera_type],
+            "video_url": self._api.traffic_graph_url,
+            "content_hash": self._api.results.get(self._camera_type),
         }
+        if self._api.traffic is not None:
+            attr.update({
+                "total_in": self._api.traffic.total_in,
+                "total_out": self._api.traffic.total_out,
+            })
+        if self._api.restored:
+            attr.update({ATTR_RESTORED: True})
         return attr
 
     @property
@@ -103,16 +148,21 @@ class DdwrtCamera(Camera):
         """Return the mdi icon of the sensor."""
         return self._icon
 
+    @property
+    def should_poll(self):
+        """No polling needed, the router pushes its updates."""
+        return False
+
+    @property
+    def available(self):
+        """Return true if the router can be reached."""
+        return self._api.available
+
     @property
     def name(self):
         """Return the name of the sensor."""
         return self._camera_type
 
-    @property
-    def state(self):
-        """Return the state of the binary sensor."""
-        return self._api.results[self._camera_type]
-
     @property
     def type(self):
         """Return the camera brand."""
@@ -123,3 +173,63 @@ class DdwrtCamera(Camera):
         """Return the unique ID of the sensor."""
         return self._unique_id
 
+
+
+def _scale_maximum(value):
+    """Return the smallest 1, 2 or 5 times a power of ten that is at least the value."""
+
+    if value <= 1:
+        return 1
+    power = 10 ** floor(log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * power:
+            return step * power
+
+
+def render_traffic_chart(traffic):
+    """Return an SVG bar chart of the incoming and outgoing traffic of each day of a month."""
+
+    month, year = (int(value) for value in traffic.month.split("-"))
+    days = list(traffic.days) + [(0, 0)] * (monthrange(year, month)[1] - len(traffic.days))
+
+    left, right, top, bottom = _CHART_MARGINS
+    width = _CHART_WIDTH - left - right
+    height = _CHART_HEIGHT - top - bottom
+    maximum = _scale_maximum(max(max(day) for day in days))
+    slot = width / len(days)
+    bar = slot * 0.4
+
+    svg = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_CHART_WIDTH}" height="{_CHART_HEIGHT}" '
+        f'font-family="sans-serif" font-size="11">',
+        f'<rect width="{_CHART_WIDTH}" height="{_CHART_HEIGHT}" fill="#ffffff"/>',
+        f'<text x="{left}" y="18" font-size="13">Traffic {traffic.month}: '
+        f'<tspan fill="{_CHART_COLOR_IN}">in {traffic.total_in} MiB</tspan>, '
+        f'<tspan fill="{_CHART_COLOR_OUT}">out {traffic.total_out} MiB</tspan></text>',
+    ]
+
+    for line in range(_CHART_GRID_LINES + 1):
+        y = top + height - height * line / _CHART_GRID_LINES
+        svg.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + width}" y2="{y:.1f}" stroke="#e0e0e0"/>')
+        svg.append(
+            f'<text x="{left - 4}" y="{y + 4:.1f}" text-anchor="end">'
+            f'{maximum * line / _CHART_GRID_LINES:g} MiB</text>'
+        )
+
+    for index, (traffic_in, traffic_out) in enumerate(days):
+        x = left + slot * index + (slot - 2 * bar) / 2
+        for offset, value, color in ((0, traffic_in, _CHART_COLOR_IN), (bar, traffic_out, _CHART_COLOR_OUT)):
+            if value:
+                bar_height = height * value / maximum
+                svg.append(
+                    f'<rect x="{x + offset:.1f}" y="{top + height - bar_height:.1f}" '
+                    f'width="{bar:.1f}" height="{bar_height:.1f}" fill="{color}"/>'
+                )
+        svg.append(
+            f'<text x="{left + slot * (index + 0.5):.1f}" y="{_CHART_HEIGHT - bottom + 14}" '
+            f'text-anchor="middle">{index + 1}</text>'
+        )
+
+    svg.append("</svg>")
+
+    return "\n".join(svg).encode("utf-8")
@@ -26,6 +26,7 @@ from . import (
     CONF_PASSWORD,
     CONF_RESOURCES,
     CONF_SSL,
+    CONF_SSL_FINGERPRINT,
     CONF_VERIFY_SSL,
     CONF_SENSOR,
     CONF_BINARY_SENSOR,
@@ -39,7 +40,8 @@ from . import (
     SENSORS,
 )
 from .pyddwrt import (
-    DDWrt
+    DDWrt,
+    parse_fingerprint,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -139,6 +141,18 @@ class DDWRTFlowHandler(config_entries.ConfigFlow):
             if CONF_NAME not in self.ddwrt_config:
                 self.ddwrt_config.update({CONF_NAME: self.ddwrt_config[CONF_HOST]})
 
+            # The fingerprint is stored as 64 lowercase hex digits
+            if self.ddwrt_config.get(CONF_SSL_FINGERPRINT):
+                try:
+                    self.ddwrt_config.update({
+                        CONF_SSL_FINGERPRINT: parse_fingerprint(self.ddwrt_config[CONF_SSL_FINGERPRINT])
+                    })
+                except ValueError:
+                    _LOGGER.error("DDWRTFlowHandler::async_step_user invalid SSL fingerprint")
+                    errors[CONF_SSL_FINGERPRINT] = "invalid_ssl_fingerprint"
+
+        if user_input is not None and not errors:
+
             session = async_get_clientsession(self.hass, verify_ssl=self.ddwrt_config[CONF_VERIFY_SSL])
 
             router = DDWrt(
@@ -148,15 +162,19 @@ class DDWRTFlowHandler(config_entries.ConfigFlow):
                 password = self.ddwrt_config[CONF_PASSWORD],
                 protocol = "https" if self.ddwrt_config[CONF_SSL] else "http",
                 verify_ssl = self.ddwrt_config[CONF_VERIFY_SSL],
+                ssl_fingerprint = self.ddwrt_config.get(CONF_SSL_FINGERPRINT),
             )
 
             try:
-                 valid_router = await self.hass.async_add_executor_job(router.update_about_data)
+                 valid_router = await router.async_update_about_data()
 #            except SSLError:
 #                return await self._show_setup_form({CONF_HOST: 'ssl_error'})
             except DDWrt.ExceptionSelfSigned:
                 _LOGGER.error("DDWRTFlowHandler::async_step_user SelfSigned")
                 errors["base"] = "ssl_selfsigned"
+            except DDWrt.ExceptionFingerprintMismatch:
+                _LOGGER.error("DDWRTFlowHandler::async_step_user FingerprintMismatch")
+                errors["base"] = "ssl_fingerprint_mismatch"
             except ConnectionRefusedError:
                 _LOGGER.error("DDWRTFlowHandler::async_step_user ConnectionRefusedError")
                 errors["base"] = "connection_refused_error"
@@ -188,6 +206,7 @@ class DDWRTFlowHandler(config_entries.ConfigFlow):
                     vol.Optional(CONF_PASSWORD): str,
                     vol.Required(CONF_SSL, default=DEFAULT_SSL): bool,
                     vol.Required(CONF_VERIFY_SSL, default=DEFAULT_VERIFY_SSL): bool,
+                    vol.Optional(CONF_SSL_FINGERPRINT): str,
                 }
             ),
             errors=errors,
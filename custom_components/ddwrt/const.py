@@ -14,22 +14,43 @@ from homeassistant.const import (
     DEVICE_CLASS_SIGNAL_STRENGTH,
     DEVICE_CLASS_TEMPERATURE,
     LENGTH_METERS,
+    PERCENTAGE,
     TEMP_CELSIUS,
     TIME_MICROSECONDS,
     TIME_MINUTES,
     ELECTRIC_POTENTIAL_VOLT,
 )
 
-_VERSION = "1.1.4"
+from .pyddwrt import (
+    ENDPOINT_ABOUT,
+    ENDPOINT_CONNTRACK,
+    ENDPOINT_DDNS,
+    ENDPOINT_INTERNET,
+    ENDPOINT_LAN,
+    ENDPOINT_NETWORKING,
+    ENDPOINT_ROUTER,
+    ENDPOINT_TTGRAPH,
+    ENDPOINT_UPNP,
+    ENDPOINT_WIRELESS,
+)
+
+_VERSION = "1.2.0"
 
 ATTRIBUTION = "Data provided by DD-WRT router"
+CHART_CONTENT_TYPE = "image/svg+xml"
+
+UNIT_PACKETS_PER_SECOND = "packets/s"
 
 CONF_BINARY_SENSOR = "binary_sensor"
 CONF_CAMERA = "camera"
+CONF_CONNTRACK = "conntrack"
 CONF_DEVICE_TRACKER = "device_tracker"
 CONF_SENSOR = "sensor"
+CONF_SSL_FINGERPRINT = "ssl_fingerprint"
 CONF_TRACK_ARP = "arp_clients"
 CONF_TRACK_DHCP = "dhcp_clients"
+CONF_TRACK_EXCLUDE = "track_exclude"
+CONF_TRACK_INCLUDE = "track_include"
 CONF_TRACK_PPPOE = "pppoe_clients"
 CONF_TRACK_PPTP = "pptp_clients"
 CONF_TRACK_WDS = "wds_clients"
@@ -51,14 +72,51 @@ DEFAULT_VERIFY_SSL = False
 DEFAULT_WIRELESS_ONLY = True
 
 DOMAIN = "ddwrt"
+DATA_ENGINE = "engine"
 DATA_LISTENER = "listener"
 
 MIN_SCAN_INTERVAL   = timedelta(seconds=30)
-SCAN_INTERVAL_ABOUT = timedelta(hours=6)
+SCAN_INTERVAL_ABOUT = timedelta(days=1)
 SCAN_INTERVAL_DATA  = timedelta(seconds=60)
+SCAN_INTERVAL_SLOW  = timedelta(minutes=5)
+SCAN_INTERVAL_GRAPH = timedelta(minutes=30)
+
+# Default poll interval for each status page
+SCAN_INTERVAL_ENDPOINTS = {
+    ENDPOINT_ABOUT: SCAN_INTERVAL_ABOUT,
+    ENDPOINT_CONNTRACK: SCAN_INTERVAL_SLOW,
+    ENDPOINT_INTERNET: SCAN_INTERVAL_DATA,
+    ENDPOINT_LAN: SCAN_INTERVAL_DATA,
+    ENDPOINT_NETWORKING: SCAN_INTERVAL_SLOW,
+    ENDPOINT_ROUTER: SCAN_INTERVAL_DATA,
+    ENDPOINT_TTGRAPH: SCAN_INTERVAL_GRAPH,
+    ENDPOINT_UPNP: SCAN_INTERVAL_SLOW,
+    ENDPOINT_WIRELESS: SCAN_INTERVAL_DATA,
+}
 
 TOPIC_DATA_UPDATE = f"{DOMAIN}_data_update"
 
+# The firmware and model info is cached on disk, and refreshed when the router reboots.
+# A snapshot of the last results and clients is stored too, to set up the entities from
+# at startup while the router is polled in the background
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+SNAPSHOT_SAVE_DELAY = 60
+REBOOT_TOLERANCE = timedelta(minutes=5)
+
+# Maximum number of requests to all routers at the same time
+ENGINE_MAX_REQUESTS = 8
+
+# Health of the connection to a router: polling stops while the circuit is open, and
+# resumes after a probe of a single status page succeeds
+HEALTH_HEALTHY  = "healthy"
+HEALTH_DEGRADED = "degraded"
+HEALTH_OPEN     = "open"
+HEALTH_FAILURES_OPEN = 3
+HEALTH_PROBE_ENDPOINT = ENDPOINT_ROUTER
+BACKOFF_MIN = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(minutes=30)
+
 # Define all available services
 SERVICE_RUN_COMMAND          = "run_command"
 SERVICE_REBOOT               = "reboot"
@@ -80,9 +138,38 @@ SERVICES = {
     SERVICE_WAN_PPPOE_DISCONNECT,
 }
 
+# Fields of the run_command service, and the event with the output of each router
+ATTR_COMMANDS = "commands"
+ATTR_OUTPUT   = "output"
+ATTR_ERROR    = "error"
+ATTR_RESULTS  = "results"
+EVENT_COMMAND_RESULT = f"{DOMAIN}_command_result"
+
+# Fields of the other services. The host field takes a list of routers, or all routers
+ATTR_PARALLEL = "parallel"
+ATTR_RULE     = "rule"
+ATTR_TIMEOUT  = "timeout"
+HOST_ALL      = "all"
+
+# Diagnostic sensor of each router, which is always created: its state is the health of
+# the connection to the router, with the number of waiting or running requests as attribute
+DIAGNOSTIC_SENSOR = "connection"
+DIAGNOSTIC_SENSOR_NAME = "Connection"
+DIAGNOSTIC_SENSOR_ICON = "mdi:lan-connect"
+ENTITY_CATEGORY_DIAGNOSTIC = "diagnostic"
+
+# Rolling reboots: the number of routers rebooted at the same time, how long to wait for
+# each router to be healthy again, and how often to check
+REBOOT_PARALLEL = 1
+REBOOT_TIMEOUT = timedelta(minutes=5)
+REBOOT_PROBE_INTERVAL = timedelta(seconds=10)
+
 # Define attributes
-ATTR_ICON_OFF = "icon_off"
-ATTR_WIRED    = "wired"
+ATTR_ENDPOINT      = "endpoint"
+ATTR_ICON_OFF      = "icon_off"
+ATTR_QUEUE_DEPTH   = "queue_depth"
+ATTR_SCAN_INTERVAL = "scan_interval"
+ATTR_WIRED         = "wired"
 
 # Define units
 DECIBEL_MILLIWATTS = "dBm"
@@ -92,6 +179,7 @@ FREQUENCY_MEGAHERTZ = "MHz"
 BINARY_SENSORS = {
     "wan_connected": {
         ATTR_NAME: "WAN connected",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wan",
         ATTR_ICON_OFF: "mdi:alert-circle-outline",
@@ -99,6 +187,7 @@ BINARY_SENSORS = {
     },
     "wl_radio": {
         ATTR_NAME: "WiFi radio",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_ICON_OFF: "mdi:wifi-off",
@@ -109,6 +198,7 @@ BINARY_SENSORS = {
 CAMERAS = {
     "traffic": {
         ATTR_NAME: "Monthly traffic",
+        ATTR_ENDPOINT: ENDPOINT_TTGRAPH,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:swap-vertical-bold",
         ATTR_DEVICE_CLASS: None,
@@ -118,32 +208,44 @@ CAMERAS = {
 DEVICE_TRACKERS = {
     CONF_TRACK_ARP: {
         ATTR_NAME: "ARP clients",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_ICON: "mdi:network",
+        ATTR_SCAN_INTERVAL: timedelta(seconds=30),
         ATTR_WIRED: True,
     },
     CONF_TRACK_DHCP: {
         ATTR_NAME: "DHCP clients",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_ICON: "mdi:network",
+        ATTR_SCAN_INTERVAL: timedelta(seconds=30),
         ATTR_WIRED: True,
     },
     CONF_TRACK_PPPOE: {
         ATTR_NAME: "PPPoE clients",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_ICON: "mdi:network",
+        ATTR_SCAN_INTERVAL: timedelta(seconds=30),
         ATTR_WIRED: True,
     },
     CONF_TRACK_PPTP: {
         ATTR_NAME: "PPTP clients",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_ICON: "mdi:network",
+        ATTR_SCAN_INTERVAL: timedelta(seconds=30),
         ATTR_WIRED: True,
     },
     CONF_TRACK_WDS: {
         ATTR_NAME: "WDS clients",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_ICON: "mdi:access-point-network",
+        ATTR_SCAN_INTERVAL: timedelta(seconds=10),
         ATTR_WIRED: False,
     },
     CONF_TRACK_WIRELESS: {
         ATTR_NAME: "WiFi clients",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_ICON: "mdi:wireless",
+        ATTR_SCAN_INTERVAL: timedelta(seconds=10),
         ATTR_WIRED: False,
     },
 }
@@ -151,360 +253,490 @@ DEVICE_TRACKERS = {
 SENSORS = {
     "clk_freq": {
         ATTR_NAME: "Clock frequency",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: FREQUENCY_MEGAHERTZ,
         ATTR_ICON: "mdi:metronome",
         ATTR_DEVICE_CLASS: None,
     },
     "cpu_temp": {
         ATTR_NAME: "Temperature",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: TEMP_CELSIUS,
         ATTR_ICON: "mdi:thermometer",
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
     },
     "ddns_status": {
         ATTR_NAME: "DDNS status",
+        ATTR_ENDPOINT: ENDPOINT_DDNS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "sw_build": {
         ATTR_NAME: "Firmware build",
+        ATTR_ENDPOINT: ENDPOINT_ABOUT,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wrench",
         ATTR_DEVICE_CLASS: None,
     },
     "sw_date": {
         ATTR_NAME: "Firmware date",
+        ATTR_ENDPOINT: ENDPOINT_ABOUT,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wrench",
         ATTR_DEVICE_CLASS: None,
     },
     "sw_version": {
         ATTR_NAME: "Firmware version",
+        ATTR_ENDPOINT: ENDPOINT_ABOUT,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wrench",
         ATTR_DEVICE_CLASS: None,
     },
     "ip_connections": {
         ATTR_NAME: "LAN IP connections",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:format-list-bulleted",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_dhcp_start": {
         ATTR_NAME: "LAN DHCP start address",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_dhcp_end": {
         ATTR_NAME: "LAN DHCP end address",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_dhcp_lease_time": {
         ATTR_NAME: "LAN DHCP lease time",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: TIME_MINUTES,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_dns": {
         ATTR_NAME: "LAN DNS address",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_gateway": {
         ATTR_NAME: "LAN gateway",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_ipaddr": {
         ATTR_NAME: "LAN IP address",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_mac": {
         ATTR_NAME: "LAN MAC address",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:network",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_netmask": {
         ATTR_NAME: "LAN network mask",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip",
         ATTR_DEVICE_CLASS: None,
     },
     "lan_proto": {
         ATTR_NAME: "LAN protocol",
+        ATTR_ENDPOINT: ENDPOINT_LAN,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:router-network",
         ATTR_DEVICE_CLASS: None,
     },
     "load_average1": {
         ATTR_NAME: "Load average last minute",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:speedometer",
         ATTR_DEVICE_CLASS: None,
     },
     "load_average5": {
         ATTR_NAME: "Load average last 5 minutes",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:speedometer",
         ATTR_DEVICE_CLASS: None,
     },
     "load_average15": {
         ATTR_NAME: "Load average last 15 minutes",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:speedometer",
         ATTR_DEVICE_CLASS: None,
     },
     "network_bridges": {
         ATTR_NAME: "Network bridges",
+        ATTR_ENDPOINT: ENDPOINT_NETWORKING,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:bridge",
         ATTR_DEVICE_CLASS: None,
     },
     "nvram_used": {
         ATTR_NAME: "NVRAM Used",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: DATA_KILOBYTES,
         ATTR_ICON: "mdi:memory",
         ATTR_DEVICE_CLASS: None,
     },
     "nvram_total": {
         ATTR_NAME: "NVRAM Total",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: DATA_KILOBYTES,
         ATTR_ICON: "mdi:memory",
         ATTR_DEVICE_CLASS: None,
     },
     "router_manufacturer": {
         ATTR_NAME: "Router manufacturer",
+        ATTR_ENDPOINT: ENDPOINT_ABOUT,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:router",
         ATTR_DEVICE_CLASS: None,
     },
     "router_model": {
         ATTR_NAME: "Router model",
+        ATTR_ENDPOINT: ENDPOINT_ABOUT,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:router",
         ATTR_DEVICE_CLASS: None,
     },
     "router_time": {
         ATTR_NAME: "Router time",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:clock-outline",
         ATTR_DEVICE_CLASS: None,
     },
     "uptime": {
         ATTR_NAME: "Uptime",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:clock-outline",
         ATTR_DEVICE_CLASS: None,
     },
     "voltage": {
         ATTR_NAME: "Voltage",
+        ATTR_ENDPOINT: ENDPOINT_ROUTER,
         ATTR_UNIT_OF_MEASUREMENT: ELECTRIC_POTENTIAL_VOLT,
         ATTR_ICON: "mdi:current-dc",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_3g_signal": {
         ATTR_NAME: "WAN 3G signal strength",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: DECIBEL_MILLIWATTS,
         ATTR_ICON: "mdi:signal-3g",
         ATTR_DEVICE_CLASS: DEVICE_CLASS_SIGNAL_STRENGTH,
     },
     "wan_dhcp_remaining": {
         ATTR_NAME: "WAN DHCP remaining",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_dns0": {
         ATTR_NAME: "WAN DNS address 0",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_dns1": {
         ATTR_NAME: "WAN DNS address 1",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_dns2": {
         ATTR_NAME: "WAN DNS address 2",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_dns3": {
         ATTR_NAME: "WAN DNS address 3",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_dns4": {
         ATTR_NAME: "WAN DNS address 4",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_dns5": {
         ATTR_NAME: "WAN DNS address 5",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:dns",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_gateway": {
         ATTR_NAME: "WAN gateway address",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wan",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_ipaddr": {
         ATTR_NAME: "WAN IP address",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_ip6addr": {
         ATTR_NAME: "WAN IP6 address",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_netmask": {
         ATTR_NAME: "WAN network mask",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:ip-network",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_pppoe_ac_name": {
         ATTR_NAME: "WAN PPPoE access concentrator name",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:router-network",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_proto": {
         ATTR_NAME: "WAN protocol",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:router-network",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_status": {
         ATTR_NAME: "WAN status",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:check-network-outline",
         ATTR_DEVICE_CLASS: None,
     },
+    "wan_throughput_in": {
+        ATTR_NAME: "WAN throughput inbound",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
+        ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
+        ATTR_ICON: "mdi:download",
+        ATTR_DEVICE_CLASS: None,
+    },
+    "wan_throughput_in_average": {
+        ATTR_NAME: "WAN throughput inbound (average)",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
+        ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
+        ATTR_ICON: "mdi:download",
+        ATTR_DEVICE_CLASS: None,
+    },
+    "wan_throughput_in_peak": {
+        ATTR_NAME: "WAN throughput inbound (peak)",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
+        ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
+        ATTR_ICON: "mdi:download",
+        ATTR_DEVICE_CLASS: None,
+    },
+    "wan_throughput_out": {
+        ATTR_NAME: "WAN throughput outbound",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
+        ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
+        ATTR_ICON: "mdi:upload",
+        ATTR_DEVICE_CLASS: None,
+    },
+    "wan_throughput_out_average": {
+        ATTR_NAME: "WAN throughput outbound (average)",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
+        ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
+        ATTR_ICON: "mdi:upload",
+        ATTR_DEVICE_CLASS: None,
+    },
+    "wan_throughput_out_peak": {
+        ATTR_NAME: "WAN throughput outbound (peak)",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
+        ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
+        ATTR_ICON: "mdi:upload",
+        ATTR_DEVICE_CLASS: None,
+    },
     "wan_traffic_in": {
         ATTR_NAME: "WAN traffic inbound",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: DATA_MEGABYTES,
         ATTR_ICON: "mdi:download",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_traffic_out": {
         ATTR_NAME: "WAN traffic outbound",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: DATA_MEGABYTES,
         ATTR_ICON: "mdi:upload",
         ATTR_DEVICE_CLASS: None,
     },
     "wan_uptime": {
         ATTR_NAME: "WAN uptime",
+        ATTR_ENDPOINT: ENDPOINT_INTERNET,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:clock-outline",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_ack_timing": {
         ATTR_NAME: "Wireless ACK timing",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: TIME_MICROSECONDS,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_ack_distance": {
         ATTR_NAME: "Wireless ACK distance",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: LENGTH_METERS,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_active": {
         ATTR_NAME: "Wireless network active",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_busy": {
         ATTR_NAME: "wl_busy",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_channel": {
         ATTR_NAME: "Wireless channel",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_count": {
         ATTR_NAME: "Wireless clients",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_mac": {
         ATTR_NAME: "Wireless MAC address",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_quality": {
         ATTR_NAME: "wl_quality",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_rate": {
         ATTR_NAME: "Wireless rate",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: DATA_RATE_MEGABITS_PER_SECOND,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
+    "wl_rx_error_ratio": {
+        ATTR_NAME: "Wireless receive error ratio",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
+        ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+        ATTR_ICON: "mdi:wifi",
+        ATTR_DEVICE_CLASS: None,
+    },
     "wl_rx_packet_error": {
         ATTR_NAME: "Wireless packets received errors",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_rx_packet_ok": {
         ATTR_NAME: "Wireless packets received OK",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
+    "wl_rx_packets_per_second": {
+        ATTR_NAME: "Wireless packets received per second",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
+        ATTR_UNIT_OF_MEASUREMENT: UNIT_PACKETS_PER_SECOND,
+        ATTR_ICON: "mdi:wifi",
+        ATTR_DEVICE_CLASS: None,
+    },
     "wl_ssid": {
         ATTR_NAME: "Wireless SSID",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
+    "wl_tx_error_ratio": {
+        ATTR_NAME: "Wireless transmit error ratio",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
+        ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+        ATTR_ICON: "mdi:wifi",
+        ATTR_DEVICE_CLASS: None,
+    },
     "wl_tx_packet_error": {
         ATTR_NAME: "Wireless packets transmitted errors",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
     "wl_tx_packet_ok": {
         ATTR_NAME: "Wireless packets transmitted OK",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: None,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
     },
+    "wl_tx_packets_per_second": {
+        ATTR_NAME: "Wireless packets transmitted per second",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
+        ATTR_UNIT_OF_MEASUREMENT: UNIT_PACKETS_PER_SECOND,
+        ATTR_ICON: "mdi:wifi",
+        ATTR_DEVICE_CLASS: None,
+    },
     "wl_xmit": {
         ATTR_NAME: "Wireless transmit power",
+        ATTR_ENDPOINT: ENDPOINT_WIRELESS,
         ATTR_UNIT_OF_MEASUREMENT: DECIBEL_MILLIWATTS,
         ATTR_ICON: "mdi:wifi",
         ATTR_DEVICE_CLASS: None,
@@ -517,14 +749,20 @@ RESOURCES.extend(key for key in CAMERAS)
 RESOURCES.extend(key for key in DEVICE_TRACKERS)
 RESOURCES.extend(key for key in SENSORS)
 
+# Status page that provides the data for each resource
+RESOURCE_ENDPOINTS = {}
+RESOURCE_ENDPOINTS.update((key, value[ATTR_ENDPOINT]) for key, value in BINARY_SENSORS.items())
+RESOURCE_ENDPOINTS.update((key, value[ATTR_ENDPOINT]) for key, value in CAMERAS.items())
+RESOURCE_ENDPOINTS.update((key, value[ATTR_ENDPOINT]) for key, value in DEVICE_TRACKERS.items())
+RESOURCE_ENDPOINTS.update((key, value[ATTR_ENDPOINT]) for key, value in SENSORS.items())
+
 # Defaults for when no binary_sensors, cameras, device_trackers or sensors were given
 BINARY_SENSOR_DEFAULTS = [
     "wan_connected",
 ]
 
-CAMERA_DEFAULTS = [
-    "traffic",
-]
+# The traffic camera reads its counters with an administrator command, so it has to be enabled
+CAMERA_DEFAULTS = []
 
 DEVICE_TRACKER_DEFAULTS = [
     CONF_TRACK_ARP,
@@ -538,7 +776,6 @@ SENSOR_DEFAULTS = [
 
 RESOURCES_DEFAULTS = [
     "wan_connected",
-    "traffic",
     CONF_TRACK_ARP,
     CONF_TRACK_DHCP,
     CONF_TRACK_WIRELESS,
@@ -16,9 +16,11 @@ from . import (
     ATTR_ATTRIBUTION,
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
+    ATTR_RESTORED,
     ATTR_WIRED,
     ATTRIBUTION,
     CONF_HOST,
+    DATA_LISTENER,
     DEFAULT_DEVICE_NAME,
     DEVICE_TRACKERS,
     DOMAIN,
@@ -31,22 +33,18 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the DD-WRT device tracker."""
 
     _LOGGER.debug("device_tracker::async_setup_entry start")
-    router = hass.data[DOMAIN][config_entry.unique_id]
+    router = hass.data[DOMAIN][config_entry.data[CONF_HOST]]['entity']
     tracked = set()
 
     @callback
     def update_router():
         """Update the values of the router."""
         _LOGGER.debug("device_tracker::async_setup_entry::update_router")
-        add_entities(
-            hass.data[DOMAIN][config_entry.data[CONF_HOST]]['entity'],
-            async_add_entities,
-            tracked
-        )
+        add_entities(router, async_add_entities, tracked)
 
-#    router.listeners.append(
-#        async_dispatcher_connect(hass, router.signal_device_new, update_router)
-#    )
+    hass.data[DOMAIN][config_entry.data[CONF_HOST]][DATA_LISTENER][config_entry.entry_id].append(
+        async_dispatcher_connect(hass, router.signal_device_new, update_router)
+    )
 
     update_router()
 
@@ -59,9 +57,9 @@ def add_entities(router, async_add_entities, tracked):
 
     _LOGGER.debug("device_tracker::add_entities router=%s", router)
     for mac, details in router.devices.items():
-        _LOGGER.debug("device_tracker::add_entities mac=%s details=%s", mac, details)
         if mac in tracked:
             continue
+        _LOGGER.debug("device_tracker::add_entities mac=%s details=%s", mac, details)
 
         new_tracked.append(DdwrtDevice(router, mac, details))
         tracked.add(mac)
@@ -80,7 +78,7 @@ class DdwrtDevice(ScannerEntity):
 
         self._router = router
         self._details = details
-        self._friendly_name = details["name"] or DEFAULT_DEVICE_NAME
+        self._friendly_name = details.name or DEFAULT_DEVICE_NAME
         self._mac = mac
         self._manufacturer = None
         self._model = None
@@ -90,28 +88,31 @@ class DdwrtDevice(ScannerEntity):
         self._attrs = {}
 
         self._unsub_dispatcher = None
+        self._unsub_health = None
 
-    def update(self) -> None:
+    async def async_update(self) -> None:
         """Update the DD-WRT device."""
 
-        _LOGGER.debug("DdwrtDevice::update details=%s", self._details)
-
-        self._icon = DEVICE_TRACKERS[self._details["type"]][ATTR_ICON]
-        self._is_wired = DEVICE_TRACKERS[self._details["type"]][ATTR_WIRED]
-
-#        device = self._router.devices[self._mac]
-#        self._active = device["active"]
-#        if device.get("attrs") is None:
-#            # device
-#            self._attrs = {
-#                "last_time_reachable": datetime.fromtimestamp(
-#                    device["last_time_reachable"]
-#                ),
-#                "last_time_activity": datetime.fromtimestamp(device["last_activity"]),
-#            }
-#        else:
-#            # router
-#            self._attrs = device["attrs"]
+        self._async_update_device()
+
+    @callback
+    def _async_update_device(self) -> None:
+        """Update the DD-WRT device from the router's client list."""
+
+        # Keep the last known details of a client that has disconnected
+        details = self._router.devices.get(self._mac)
+        self._active = details is not None
+        if self._active:
+            self._details = details
+
+        _LOGGER.debug("DdwrtDevice::_async_update_device active=%s details=%s", self._active, self._details)
+
+        self._icon = DEVICE_TRACKERS[self._details.type][ATTR_ICON]
+        self._is_wired = DEVICE_TRACKERS[self._details.type][ATTR_WIRED]
+        self._attrs = {
+            "first_seen": self._router.first_seen.get(self._mac),
+            "last_seen": self._router.last_seen.get(self._mac),
+        }
 
     @property
     def device_info(self):
@@ -178,10 +179,21 @@ class DdwrtDevice(ScannerEntity):
             ATTR_ATTRIBUTION: ATTRIBUTION,
             "is_wired": self._is_wired,
         }
-        attributes.update(self._details)
+        attributes.update(self._details.as_dict())
+        attributes.update(self._attrs)
+        if self._mac in self._router.conntrack:
+            attributes.update(self._router.conntrack[self._mac].as_dict())
+        if self._router.restored:
+            attributes.update({ATTR_RESTORED: True})
 
         return attributes
 
+    @property
+    def available(self) -> bool:
+        """Return true if the router can be reached."""
+
+        return self._router.available
+
     @property
     def should_poll(self) -> bool:
         """No polling needed."""
@@ -190,28 +202,34 @@ class DdwrtDevice(ScannerEntity):
 
         return False
 
-    async def async_on_demand_update(self):
+    @callback
+    def async_on_demand_update(self):
         """Update state."""
 
         _LOGGER.debug("DdwrtDevice::async_on_demand_update mac=%s", self._mac)
 
-        self.async_schedule_update_ha_state(True)
+        self._async_update_device()
+        self.async_write_ha_state()
 
     async def async_added_to_hass(self):
         """Register state update callback."""
 
         _LOGGER.debug("DdwrtDevice::async_added_to_hass mac=%s", self._mac)
 
-#        self._unsub_dispatcher = async_dispatcher_connect(
-#            self.hass, self._router.signal_device_update, self.async_on_demand_update
-#        )
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass, self._router.signal_device_update(self._mac), self.async_on_demand_update
+        )
+        self._unsub_health = async_dispatcher_connect(
+            self.hass, self._router.signal_health, self.async_write_ha_state
+        )
 
     async def async_will_remove_from_hass(self):
         """Clean up after entity before removal."""
 
         _LOGGER.debug("DdwrtDevice::async_will_remove_from_hass mac=%s", self._mac)
 
-#        self._unsub_dispatcher()
+        self._unsub_dispatcher()
+        self._unsub_health()
 
 
 def icon_for_freebox_device(device) -> str:
@@ -0,0 +1,117 @@
+"""Poll engine that schedules the requests of all DD-WRT routers."""
+
+import asyncio
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import ENGINE_MAX_REQUESTS, TOPIC_DATA_UPDATE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio: each new router is placed in the largest gap
+# between the poll phases of the routers before it
+_PHASE_STEP = 0.6180339887498949
+
+
+class DDWrtEngine:
+    """Schedules the poll jobs of all routers, and limits the number of concurrent requests."""
+
+    def __init__(self, hass, max_requests=ENGINE_MAX_REQUESTS):
+        """Initialize the engine."""
+
+        _LOGGER.debug("DDWrtEngine.__init__ max_requests=%i", max_requests)
+
+        self._hass = hass
+        self._semaphore = asyncio.Semaphore(max_requests)
+        self._slots = {}
+        self._queue_depth = {}
+        self._running = set()
+
+    def phase(self, host, interval):
+        """Return the delay before the first poll of a router, spread over the poll interval."""
+
+        if host not in self._slots:
+            # Reuse the slot of a router that was removed
+            used = set(self._slots.values())
+            self._slots[host] = next(slot for slot in range(len(self._slots) + 1) if slot not in used)
+        slot = self._slots[host]
+        return interval.total_seconds() * (((slot + 1) * _PHASE_STEP) % 1)
+
+    def queue_depth(self, host):
+        """Return the number of requests of a router that are waiting or running."""
+
+        return self._queue_depth.get(host, 0)
+
+    def signal_queue_depth(self, host):
+        """Return the dispatcher signal that is sent when the queue depth of a router changes."""
+
+        return f"{TOPIC_DATA_UPDATE}_{host}_queue_depth"
+
+    @callback
+    def async_release(self, host):
+        """Forget a router that was unloaded, its slot is given to the next router that's added."""
+
+        _LOGGER.debug("DDWrtEngine.async_release %s", host)
+
+        self._slots.pop(host, None)
+
+    async def async_run(self, host, request):
+        """Run a request of a router when fewer than the maximum number of requests are running."""
+
+        self._queue_depth[host] = self._queue_depth.get(host, 0) + 1
+        async_dispatcher_send(self._hass, self.signal_queue_depth(host))
+        try:
+            if self._semaphore.locked():
+                _LOGGER.debug("DDWrtEngine.async_run %s waiting, queue depth %i", host, self._queue_depth[host])
+            async with self._semaphore:
+                return await request()
+        finally:
+            self._queue_depth[host] -= 1
+            if not self._queue_depth[host]:
+                del self._queue_depth[host]
+            async_dispatcher_send(self._hass, self.signal_queue_depth(host))
+
+    @callback
+    def async_track(self, host, name, action, interval):
+        """Call an action of a router every interval, starting at the router's phase. Returns a callback to stop.
+
+        A tick is skipped while the previous call of the same action is still running.
+        """
+
+        key = (host, name)
+        cancel = None
+
+        async def async_tick(event_time):
+            """Call the action, unless it's still running."""
+
+            if key in self._running:
+                _LOGGER.debug("DDWrtEngine.async_track %s %s still running, skipping", host, name)
+                return
+
+            self._running.add(key)
+            try:
+                await action(event_time)
+            finally:
+                self._running.discard(key)
+
+        async def async_start(event_time):
+            """Start calling the action every interval."""
+
+            nonlocal cancel
+            cancel = async_track_time_interval(self._hass, async_tick, interval)
+            await async_tick(event_time)
+
+        @callback
+        def async_cancel():
+            """Stop calling the action."""
+
+            cancel()
+
+        phase = self.phase(host, interval)
+        _LOGGER.debug("DDWrtEngine.async_track %s %s every %s, starting in %.1f seconds", host, name, interval, phase)
+        cancel = async_call_later(self._hass, phase, async_start)
+
+        return async_cancel
@@ -1,17 +1,39 @@
 """Class for querying DD-WRT routers"""
 
-from datetime import date
+import asyncio
+from collections import Counter, deque, namedtuple
+import csv
+from datetime import date, timedelta
+from fnmatch import translate
+from hashlib import sha256
+import html
+from ipaddress import ip_address, ip_network
 import logging
 import re
 import ssl
+from time import monotonic
 import urllib3
+from urllib.parse import urlsplit
+from aiohttp import (
+    BasicAuth,
+    ClientConnectionError,
+    ClientConnectorCertificateError,
+    ClientSession,
+    ClientSSLError,
+    ClientTimeout,
+    Fingerprint,
+    ServerDisconnectedError,
+    ServerFingerprintMismatch,
+    TCPConnector,
+)
 from OpenSSL import crypto
 from datetime import datetime
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout, ConnectionError, SSLError
 
 _LOGGER = logging.getLogger(__name__)
-_VERSION = "0.9.4"
+_VERSION = "0.10.0"
 _X_REQUESTED_WITH = __name__ + "-" + _VERSION
 HTTP_X_REQUESTED_WITH = "X-Requested-With"
 
@@ -39,6 +61,7 @@ ENDPOINT_ROUTER_STATIC = "Status_Router.asp"
 ENDPOINT_ROUTER = "Status_Router.live.asp"
 ENDPOINT_SPUTNIK = "Status_SputnikAPD.live.asp"
 ENDPOINT_WIRELESS = "Status_Wireless.live.asp"
+ENDPOINT_WIRELESS_STATIC = "Status_Wireless.asp"
 ENDPOINT_UPNP = "UPnP.live.asp"
 ENDPOINT_USB = "USB.live.asp"
 REBOOT_PARAMETERS = {
@@ -102,14 +125,776 @@ WIFI_SELECT_INTERFACE_PARAMETERS = {
     'wifi_display': 'wl0',
 }
 
-_DDWRT_DATA_REGEX = re.compile(r"\{(\w+)::([^\}]*)\}")
+# OpenSSL verification error codes used to classify certificate errors
+_SSL_VERIFY_INVALID_DATE = (
+    9,      # X509_V_ERR_CERT_NOT_YET_VALID
+    10,     # X509_V_ERR_CERT_HAS_EXPIRED
+)
+_SSL_VERIFY_HOSTNAME_MISMATCH = 62
+
+# Certificates of the routers, keyed by (host, port). A cached certificate is checked again
+# after _CERTIFICATE_CACHE_TIME, or once its validity period has started or ended.
+_CERTIFICATE_CACHE_TIME = timedelta(hours=1)
+_CERTIFICATES = {}
+
+_CHUNK_SIZE = 4096
+
+# Rows and cells of the connection table, and the number of destinations kept per LAN IP address
+_CONNTRACK_ROW_END = b"</tr>"
+_CONNTRACK_CELL_REGEX = re.compile(rb"<td[^>]*>(.*?)</td>", re.DOTALL | re.IGNORECASE)
+_HTML_TAG_REGEX = re.compile(rb"<[^>]*>")
+_CONNTRACK_TOP_DESTINATIONS = 5
+
+# Connections per router. DD-WRT's httpd serves few requests in parallel, so the pool is kept small,
+# also when the requests go through a shared session
+_POOL_SIZE = 4
+_KEEPALIVE_TIMEOUT = 30
+
+# Samples kept per counter, and the weight of the newest rate in the moving average. A
+# counter starts over when the router's boot time moves by more than _REBOOT_TOLERANCE.
+_RATE_SAMPLES = 16
+_RATE_ALPHA = 0.3
+_REBOOT_TOLERANCE = timedelta(minutes=5)
+
+# The traffic counters are in MiB, their rates in Mbit/s
+_MEBIBYTE_MEGABITS = 1048576 * 8 / 1000000
+
+# The wireless packet counters are 32 bit counters of the radio driver
+_PACKET_COUNTER_WRAP = 2 ** 32
+
+# Seconds between the polls of the radios the wireless status page doesn't show
+_WIFI_SWEEP_INTERVAL = 300
+_DDWRT_DATA_REGEX = re.compile(rb"\{(\w+)::([^\}]*)\}")
+
+
+_MAC_REGEX = re.compile(r"^([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}$")
+_OUI_REGEX = re.compile(r"^([0-9A-Fa-f]{2}[:-]){2}[0-9A-Fa-f]{2}$")
+_FINGERPRINT_REGEX = re.compile(r"^[0-9a-f]{64}$")
+_UPTIME_REGEX = re.compile(r"up\s+(?:(\d+)\s+days?,\s*)?(?:(\d+):(\d+)|(\d+)\s+min)")
+
+# Results of the static pages, which only change when the firmware is upgraded
+STATIC_RESULTS = ("sw_version", "sw_build", "sw_date", "router_manufacturer", "router_model", "wifi_radios")
+_ABOUT_MARKERS = ("DD-WRT v", "<br />")
+_ROUTER_STATIC_MARKERS = ("Capture(status_router.sys_model)</script></div>", "</div>")
+
+# The radio selector of the wireless status page, which is only shown when there's more than one radio
+_WIFI_SELECT_MARKERS = ('name="wifi_display"', "</select>")
+_WIFI_OPTION_REGEX = re.compile(r'<option value="([^"]+)"\s*(selected)?')
+
+# The commands of one batch are separated by markers, so the output of each command can be
+# found in the diagnostics page. The quotes keep the echoed script from matching a marker.
+_COMMAND_MARKER_ECHO = 'echo "@@ddwrt""-command-{}@@"'
+_COMMAND_MARKER_REGEX = re.compile(r"@@ddwrt-command-(\d+|end)@@\r?\n?")
+
+# The daily traffic counters of a month in nvram: "in:out" in MiB for each day, followed by "[in:out]" totals
+_TRAFFIC_NVRAM_KEY = "traff-{}"
+_TRAFFIC_DAY_REGEX = re.compile(r"(\d+):(\d+)")
+
+
+class _Client:
+    """Common behaviour of the client table records."""
+
+    __slots__ = ()
+
+    type = None
+    _key_field = "mac"
+    _name_field = None
+    _optional_fields = 0
+
+    @property
+    def name(self):
+        """Return the name of the client."""
+        return getattr(self, self._name_field)
+
+    def as_dict(self):
+        """Return the client as a dict, including its name and type."""
+        result = {"name": self.name, "type": self.type}
+        result.update(zip(self._fields, self))
+        return result
+
+
+class ArpClient(_Client, namedtuple("ArpClient", ("hostname", "ip", "mac", "connections", "interface"))):
+    """A client from the ARP table. Older firmware doesn't return the interface."""
+
+    __slots__ = ()
+
+    type = CONF_TRACK_ARP
+    _name_field = "hostname"
+    _optional_fields = 1
+
+
+class DhcpClient(_Client, namedtuple("DhcpClient", ("hostname", "ip", "mac", "lease_expiration", "lease_id"))):
+    """A client from the DHCP leases."""
+
+    __slots__ = ()
+
+    type = CONF_TRACK_DHCP
+    _name_field = "hostname"
+
+
+class PppoeClient(_Client, namedtuple("PppoeClient", ("interface", "username", "local_ip"))):
+    """A client from the PPPoE leases."""
+
+    __slots__ = ()
+
+    type = CONF_TRACK_PPPOE
+    _key_field = "local_ip"
+    _name_field = "username"
+
+
+class PptpClient(_Client, namedtuple("PptpClient", ("interface", "username", "local_ip", "remote_ip"))):
+    """A client from the PPTP leases."""
+
+    __slots__ = ()
+
+    type = CONF_TRACK_PPTP
+    _key_field = "local_ip"
+    _name_field = "username"
+
+
+class WdsClient(_Client, namedtuple("WdsClient", ("mac", "interface", "description", "signal", "noise", "snr", "signal_quality"))):
+    """A WDS client."""
+
+    __slots__ = ()
+
+    type = CONF_TRACK_WDS
+    _name_field = "description"
+
+
+class WirelessClient(_Client, namedtuple("WirelessClient", ("mac", "radioname", "interface", "uptime", "tx_rate", "rx_rate", "info", "signal", "noise", "snr", "signal_quality", "ap_mac"))):
+    """A wireless client. The access point MAC address isn't part of the table."""
+
+    __slots__ = ()
+
+    type = CONF_TRACK_WIRELESS
+    _name_field = "radioname"
+
+
+# Client table records by type, to restore a client from a snapshot
+_CLIENT_RECORDS = {
+    record.type: record
+    for record in (ArpClient, DhcpClient, PppoeClient, PptpClient, WdsClient, WirelessClient)
+}
+
+
+class Conntrack(namedtuple("Conntrack", ("connections", "protocols", "top_destinations"))):
+    """The tracked connections of a LAN IP address, with the number per protocol and the most used destinations."""
+
+    __slots__ = ()
+
+    def as_dict(self):
+        """Return the connections as a dict of attributes."""
+        return {
+            "connections": self.connections,
+            "connections_protocols": self.protocols,
+            "connections_top_destinations": dict(self.top_destinations),
+        }
+
+
+class TrafficMonth(namedtuple("TrafficMonth", ("month", "days", "digest"))):
+    """The incoming and outgoing traffic in MiB of each day of a month (MM-YYYY), identified by the SHA-256 hash of the data."""
+
+    __slots__ = ()
+
+    @property
+    def total_in(self):
+        """Return the incoming traffic of the month in MiB."""
+        return sum(day[0] for day in self.days)
+
+    @property
+    def total_out(self):
+        """Return the outgoing traffic of the month in MiB."""
+        return sum(day[1] for day in self.days)
+
+
+UpnpForward = namedtuple("UpnpForward", ("name", "wan_port_start", "wan_port_end", "lan_port_start", "lan_port_end", "lan_ip", "protocol", "enabled"))
+
+
+class Certificate(namedtuple("Certificate", ("fingerprint", "not_before", "not_after", "checked"))):
+    """The certificate of a router, identified by its SHA-256 fingerprint."""
+
+    __slots__ = ()
+
+    def valid(self, now):
+        """Return true if the certificate is within its validity period."""
+        return self.not_before <= now <= self.not_after
+
+    def expired(self, now):
+        """Return true if the cached certificate has to be checked again."""
+        return now - self.checked > _CERTIFICATE_CACHE_TIME or self.valid(now) != self.valid(self.checked)
+
+
+class CounterRate:
+    """Rates of a cumulative counter, from a ring buffer of timestamped samples.
+
+    Each sample is stored as (time, value, delta, rate). A counter that goes backwards has wrapped
+    if a wrap is given and the drop is more than half of it, otherwise it was reset and the
+    rates start over. They also start over when the router rebooted.
+    """
+
+    __slots__ = ("samples", "wrap", "current", "average", "_boot_time")
+
+    def __init__(self, wrap=None, size=_RATE_SAMPLES):
+        """Initialize the counter."""
+        self.samples = deque(maxlen=size)
+        self.wrap = wrap
+        self.current = None
+        self.average = None
+        self._boot_time = None
+
+    @property
+    def peak(self):
+        """Return the highest rate in the ring buffer."""
+        return max((rate for time, value, delta, rate in self.samples if rate is not None), default=None)
+
+    @property
+    def increase(self):
+        """Return the increase of the counter over the ring buffer, or None if there's only one sample."""
+        if len(self.samples) < 2:
+            return None
+        return sum(delta for time, value, delta, rate in self.samples if delta is not None)
+
+    def reset(self):
+        """Forget all samples and rates."""
+        self.samples.clear()
+        self.current = None
+        self.average = None
+
+    def add(self, time, value, boot_time=None):
+        """Add a sample, and return the increase of the counter since the previous sample, or None."""
+
+        if boot_time is not None:
+            if self._boot_time is not None and abs(boot_time - self._boot_time) > _REBOOT_TOLERANCE:
+                _LOGGER.debug("CounterRate.add: Router rebooted, starting over")
+                self.reset()
+            self._boot_time = boot_time
+
+        delta = None
+        rate = None
+        if self.samples:
+            last_time, last_value, last_delta, last_rate = self.samples[-1]
+            delta = value - last_value
+            if delta < 0 and self.wrap and -delta > self.wrap // 2:
+                delta += self.wrap
+            if delta < 0:
+                _LOGGER.debug("CounterRate.add: Counter was reset, starting over")
+                self.reset()
+                delta = None
+            if delta is not None and time > last_time:
+                rate = delta / (time - last_time)
+
+        self.current = rate
+        if rate is not None:
+            self.average = rate if self.average is None else self.average + _RATE_ALPHA * (rate - self.average)
+        self.samples.append((time, value, delta, rate))
+
+        return delta
+
+
+class _FingerprintAdapter(HTTPAdapter):
+    """Transport adapter that only trusts the certificate with the pinned fingerprint."""
+
+    def __init__(self, fingerprint, **kwargs):
+        """Initialize the adapter."""
+
+        self._fingerprint = fingerprint
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Initialize the pool manager, asserting the certificate fingerprint."""
+
+        kwargs["assert_fingerprint"] = self._fingerprint
+        super().init_poolmanager(*args, **kwargs)
+
+
+class Client(namedtuple("Client", ("mac", "ip", "sources"))):
+    """A client of the router, merged from all the client tables that list it.
+
+    The MAC address is stored as a 48 bit integer and the IP address as an integer. All
+    other attributes are looked up in the client table records (sources, in order of
+    priority) when they are needed.
+    """
+
+    __slots__ = ()
+
+    @property
+    def type(self):
+        """Return the type of the client's most specific source."""
+        return self.sources[0].type
+
+    @property
+    def name(self):
+        """Return the first name that one of the sources knows the client by."""
+        for source in self.sources:
+            if source.name:
+                return source.name
+        return None
+
+    @property
+    def mac_address(self):
+        """Return the MAC address as a string."""
+        return None if self.mac is None else _format_mac(self.mac)
+
+    @property
+    def ip_address(self):
+        """Return the IP address as a string."""
+        return None if self.ip is None else str(ip_address(self.ip))
+
+    def get(self, field, default=None):
+        """Return the first value of a field that one of the sources has."""
+        for source in self.sources:
+            value = getattr(source, field, None)
+            if value not in (None, ""):
+                return value
+        return default
+
+    def as_dict(self):
+        """Return the merged attributes of all sources as a dict."""
+        result = {}
+        for source in reversed(self.sources):
+            result.update(source.as_dict())
+        result.update({
+            "name": self.name,
+            "type": self.type,
+            "sources": [source.type for source in self.sources],
+        })
+        if self.mac is not None:
+            result.update({"mac": self.mac_address})
+        if self.ip is not None:
+            result.update({"ip": self.ip_address})
+        return result
+
+    def as_snapshot(self):
+        """Return the client as a compact list of plain values, that can be stored as JSON."""
+        return [self.mac, self.ip, [[source.type, *source] for source in self.sources]]
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Return a client from a list created by as_snapshot()."""
+        mac, ip, sources = snapshot
+        return cls(mac, ip, tuple(_CLIENT_RECORDS[source[0]]._make(source[1:]) for source in sources))
+
+
+def _decode_rows(name, value, strides, key_index=None):
+    """Split a table of quoted, comma separated values into rows of one of the given strides.
+
+    If more than one stride fits the number of values, the first one for which the
+    key column of the second row holds a MAC address is used.
+    """
+
+    elements = [element.strip() for element in next(csv.reader([value.strip()], quotechar="'", skipinitialspace=True), [])]
+
+    for stride in strides:
+        if not elements or len(elements) % stride != 0:
+            continue
+        if key_index is not None and len(strides) > 1 and len(elements) > stride:
+            if not _MAC_REGEX.match(elements[stride + key_index]):
+                continue
+        return zip(*[iter(elements)] * stride)
+
+    _LOGGER.warning("_decode_rows(): invalid number of elements in %s (expected a multiple of %s, found %i)", name, " or ".join(str(stride) for stride in strides), len(elements))
+    return ()
+
+
+def _decode_table(name, value, record, extra=()):
+    """Decode a client table into a dict of records, keyed by the record's key field.
+
+    The extra values are appended to every row, and missing optional fields are set to None.
+    """
+
+    stride = len(record._fields) - len(extra)
+    strides = tuple(range(stride, stride - record._optional_fields - 1, -1))
+    key_index = record._fields.index(record._key_field)
+
+    table = {}
+    for row in _decode_rows(name, value, strides, key_index if record._key_field == "mac" else None):
+        missing = (None,) * (stride - len(row))
+        client = record._make(row + missing + extra)
+        table[client[key_index]] = client
+
+    return table
+
+
+def _parse_mac(value):
+    """Return a MAC address as a 48 bit integer, or None if it isn't a MAC address."""
+
+    if not value or not _MAC_REGEX.match(value):
+        return None
+    return int(value.replace(":", "").replace("-", ""), 16)
+
+
+def _format_mac(value):
+    """Return a 48 bit integer as a MAC address string."""
+
+    digits = "%012X" % value
+    return ":".join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+def parse_fingerprint(value):
+    """Return a SHA-256 fingerprint as 64 lowercase hex digits, the colons are optional.
+
+    Raises ValueError if the value isn't a SHA-256 fingerprint.
+    """
+
+    fingerprint = value.strip().replace(":", "").lower()
+    if not _FINGERPRINT_REGEX.match(fingerprint):
+        raise ValueError(f"Invalid SHA-256 fingerprint: {value}")
+    return fingerprint
+
+
+def _parse_ip(value):
+    """Return an IP address as an integer, or None if it isn't an IP address."""
+
+    try:
+        return int(ip_address(value))
+    except ValueError:
+        return None
+
+
+def _scale(value, factor, digits=3):
+    """Return a value multiplied by a factor and rounded, or None if the value is None."""
+
+    return None if value is None else round(value * factor, digits)
+
+
+def _command_script(commands):
+    """Return a batch of commands as one script, with a marker before each command and at the end."""
+
+    lines = []
+    for index, command in enumerate(commands):
+        lines.append(_COMMAND_MARKER_ECHO.format(index))
+        lines.append(command)
+    lines.append(_COMMAND_MARKER_ECHO.format("end"))
+
+    return "\n".join(lines)
+
+
+def _parse_command_output(body, count):
+    """Return the output of each command of a batch from the diagnostics page, None if it's missing."""
+
+    parts = _COMMAND_MARKER_REGEX.split(html.unescape(body.decode("utf-8", "replace")))
+    if len(parts) == 1:
+        raise(DDWrt.DDWrtException("No command output found in the response"))
+
+    # An output ends at the next marker, what follows the last marker is the rest of the page
+    outputs = [None] * count
+    for marker, output in zip(parts[1:-2:2], parts[2:-1:2]):
+        if marker != "end" and int(marker) < count:
+            outputs[int(marker)] = output
+
+    return outputs
+
+
+class _ClientRules:
+    """A list of client rules, compiled into sets, subnet masks and one regex per glob type."""
+
+    __slots__ = ("macs", "ouis", "networks", "names", "interfaces")
+
+    def __init__(self, rules):
+        """Compile the rules."""
+
+        self.macs = set()
+        self.ouis = set()
+        self.networks = []
+        names = []
+        interfaces = []
+
+        for rule in rules:
+            rule = rule.strip()
+            if rule.lower().startswith("interface:"):
+                interfaces.append(translate(rule.partition(":")[2]))
+            elif _MAC_REGEX.match(rule):
+                self.macs.add(_parse_mac(rule))
+            elif _OUI_REGEX.match(rule):
+                self.ouis.add(int(rule.replace(":", "").replace("-", ""), 16))
+            else:
+                try:
+                    network = ip_network(rule, strict=False)
+                except ValueError:
+                    names.append(translate(rule))
+                else:
+                    self.networks.append((int(network.network_address), int(network.netmask)))
+
+        self.names = re.compile("|".join(names), re.IGNORECASE).match if names else None
+        self.interfaces = re.compile("|".join(interfaces)).match if interfaces else None
+
+    def match(self, mac, ip, records):
+        """Return true if one of the rules matches the client with the given sources."""
+
+        if mac is not None and (mac in self.macs or mac >> 24 in self.ouis):
+            return True
+        if ip is not None and any(ip & mask == network for network, mask in self.networks):
+            return True
+        if self.names is not None and any(record.name and self.names(record.name) for record in records):
+            return True
+        if self.interfaces is not None:
+            return any(self.interfaces(getattr(record, "interface", None) or "") for record in records)
+        return False
+
+
+class ClientFilter:
+    """Include and exclude rules that decide which clients are tracked.
+
+    A rule is a MAC address, an OUI (the first three bytes of a MAC address), a subnet
+    (192.168.2.0/24), an interface glob (interface:wl0.*) or a hostname glob (guest-*).
+    A client is tracked if it matches an include rule (or there are none), and doesn't
+    match an exclude rule.
+    """
+
+    __slots__ = ("_include", "_exclude")
+
+    def __init__(self, include=(), exclude=()):
+        """Compile the rules."""
+        self._include = _ClientRules(include) if include else None
+        self._exclude = _ClientRules(exclude) if exclude else None
+
+    def match(self, mac, ip, records):
+        """Return true if the client with the given MAC and IP address (as integers) and sources is tracked."""
+        if self._include is not None and not self._include.match(mac, ip, records):
+            return False
+        return self._exclude is None or not self._exclude.match(mac, ip, records)
+
+
+def merge_clients(*tables, client_filter=None):
+    """Merge client tables, given in order of priority, into one Client per MAC address.
+
+    Clients that aren't listed by MAC address (PPPoE and PPTP) are keyed by their IP address.
+    Clients that don't match the client filter are left out.
+    """
+
+    sources = {}
+    for table in tables:
+        for key, record in table.items():
+            mac = _parse_mac(key)
+            sources.setdefault(key if mac is None else mac, []).append(record)
+
+    clients = {}
+    for key, records in sources.items():
+        mac = key if isinstance(key, int) else None
+        ip = None
+        for record in records:
+            ip = _parse_ip(getattr(record, "ip", None) or getattr(record, "local_ip", None) or "")
+            if ip is not None:
+                break
+        if client_filter is not None and not client_filter.match(mac, ip, records):
+            continue
+        client = Client(mac, ip, tuple(records))
+        clients[key if mac is None else client.mac_address] = client
+
+    return clients
+
+
+class DDWrtDataParser:
+    """Incremental parser for the {key::value} format of the DD-WRT live pages."""
+
+    def __init__(self, keys=None):
+        """Initialize the parser, optionally stopping once all given keys have been seen."""
+
+        self._buffer = b""
+        self._keys = set(keys) if keys else None
+        self.size = 0
+
+    @property
+    def done(self):
+        """Return true if all requested keys have been seen."""
+        return self._keys is not None and not self._keys
+
+    def feed(self, chunk):
+        """Parse the next chunk of the response body and yield the (key, value) pairs it completes."""
+
+        self.size += len(chunk)
+
+        if self._buffer:
+            buffer = self._buffer + chunk
+        else:
+            start = chunk.find(b"{")
+            if start < 0:
+                return
+            buffer = chunk[start:]
+
+        # A pair can only be completed by a chunk that contains its closing brace
+        if b"}" not in chunk:
+            self._buffer = buffer
+            return
+
+        end = 0
+        for match in _DDWRT_DATA_REGEX.finditer(buffer):
+            key = match.group(1).decode("ascii")
+            yield key, match.group(2).decode("utf-8", "replace")
+            end = match.end()
+
+            if self._keys is not None:
+                self._keys.discard(key)
+                if not self._keys:
+                    self._buffer = b""
+                    return
+
+        # Keep the start of an incomplete pair for the next chunk
+        start = buffer.find(b"{", end)
+        self._buffer = buffer[start:] if start >= 0 else b""
+
+    def parse(self, chunks):
+        """Yield the (key, value) pairs from an iterable of chunks."""
+
+        for chunk in chunks:
+            yield from self.feed(chunk)
+            if self.done:
+                return
+
+    async def async_parse(self, chunks):
+        """Yield the (key, value) pairs from an asynchronous iterable of chunks."""
+
+        async for chunk in chunks:
+            for pair in self.feed(chunk):
+                yield pair
+            if self.done:
+                return
+
+
+class DDWrtPageScanner(DDWrtDataParser):
+    """Incremental reader for the static HTML pages, stopping once the wanted text has been received."""
+
+    def __init__(self, start, end):
+        """Initialize the scanner, stopping at the first end marker after the start marker."""
+
+        self._start = start.encode("ascii")
+        self._end = end.encode("ascii")
+        self._data = bytearray()
+        self._found = -1
+        self._done = False
+        self.size = 0
+
+    @property
+    def done(self):
+        """Return true if the text between the markers has been received."""
+        return self._done
+
+    @property
+    def text(self):
+        """Return the part of the page that has been received."""
+        return self._data.decode("utf-8", "replace")
+
+    @property
+    def result(self):
+        """Return the part of the page that has been received."""
+        return self.text
+
+    def feed(self, chunk):
+        """Add the next chunk of the page. There are no pairs to yield, the page is kept as text."""
+
+        self.size += len(chunk)
+
+        # Markers can be split over two chunks
+        if self._found < 0:
+            search = max(0, len(self._data) - len(self._start) + 1)
+            self._data += chunk
+            self._found = self._data.find(self._start, search)
+            if self._found < 0:
+                return ()
+            search = self._found + len(self._start)
+        else:
+            search = max(self._found + len(self._start), len(self._data) - len(self._end) + 1)
+            self._data += chunk
+
+        self._done = self._data.find(self._end, search) >= 0
+        return ()
+
+
+class DDWrtConntrackScanner(DDWrtDataParser):
+    """Incremental reader for the connection table of Status_Conntrack.asp.
+
+    The rows are aggregated per LAN IP address while they are received, so the table
+    itself is never kept in memory. The LAN side of a connection is the address in the
+    given (network, mask) as integers, or a private address if no LAN is given.
+    """
+
+    def __init__(self, lan=None):
+        """Initialize the scanner."""
+
+        self._lan = lan
+        self._buffer = b""
+        self._index = {}
+        self.connections = 0
+        self.size = 0
+
+    @property
+    def done(self):
+        """The whole table has to be read."""
+        return False
+
+    @property
+    def result(self):
+        """Return the connections of each LAN IP address, keyed by the address as an integer."""
+
+        return {
+            ip: Conntrack(count, dict(protocols), tuple(destinations.most_common(_CONNTRACK_TOP_DESTINATIONS)))
+            for ip, (count, protocols, destinations) in self._index.items()
+        }
+
+    def _is_lan(self, ip, address):
+        """Return true if an address is on the LAN."""
+
+        if self._lan is None:
+            return ip_address(address).is_private
+        network, mask = self._lan
+        return ip & mask == network
+
+    def feed(self, chunk):
+        """Aggregate the rows completed by the next chunk of the page. There are no pairs to yield."""
+
+        self.size += len(chunk)
+
+        buffer = self._buffer + chunk
+        end = buffer.rfind(_CONNTRACK_ROW_END)
+        if end < 0:
+            self._buffer = buffer
+            return ()
+        self._buffer = buffer[end + len(_CONNTRACK_ROW_END):]
+
+        # Protocol, timeout, source address, remote address, service and state
+        for row in buffer[:end].split(_CONNTRACK_ROW_END):
+            cells = _CONNTRACK_CELL_REGEX.findall(row)
+            if len(cells) < 4:
+                continue
+            protocol, timeout, source, remote = (
+                _HTML_TAG_REGEX.sub(b"", cell).strip().decode("ascii", "replace")
+                for cell in cells[:4]
+            )
+            source_ip = _parse_ip(source)
+            remote_ip = _parse_ip(remote)
+            if source_ip is None or remote_ip is None:
+                continue
+
+            self.connections += 1
+
+            # Count incoming connections for the LAN address too
+            if self._is_lan(source_ip, source):
+                ip, destination = source_ip, remote
+            elif self._is_lan(remote_ip, remote):
+                ip, destination = remote_ip, source
+            else:
+                continue
+
+            entry = self._index.get(ip)
+            if entry is None:
+                entry = self._index[ip] = [0, Counter(), Counter()]
+            entry[0] += 1
+            entry[1][protocol.lower()] += 1
+            entry[2][destination] += 1
+
+        return ()
 
 
 class DDWrt:
     """This class queries a wireless router running DD-WRT firmware."""
 
-    def __init__(self, aio_session, host, username, password, protocol, verify_ssl):
-        """Initialize the DD-WRT class."""
+    def __init__(self, aio_session, host, username, password, protocol, verify_ssl, ssl_fingerprint=None):
+        """Initialize the DD-WRT class.
+
+        If an SSL fingerprint (SHA-256, hex digits with or without colons) is given, only the
+        certificate with that fingerprint is trusted, and the certificate isn't verified otherwise.
+        Raises ValueError if the fingerprint isn't a SHA-256 fingerprint.
+        """
 
         self._aio_session = aio_session
         self._host = host
@@ -117,6 +902,7 @@ class DDWrt:
         self._password = password
         self._protocol = protocol
         self._verify_ssl = verify_ssl
+        self._ssl_fingerprint = parse_fingerprint(ssl_fingerprint) if ssl_fingerprint else None
 
         self.data = None
         self.results = {}
@@ -128,7 +914,56 @@ class DDWrt:
         self.clients_wireless = {}
         self.upnp_forwards = {}
 
-        self._session = Session()
+        # Tracked connections of each LAN IP address, keyed by the address as an integer
+        self.conntrack = {}
+
+        # Daily traffic of this month
+        self.traffic = None
+
+        # Wireless results of each radio, and the radio that the wireless status page shows
+        self.radios = {}
+        self._radio_clients = {}
+        self._wifi_display = None
+        self._wifi_swept = None
+        self._wifi_lock = None
+
+        # Whether the router keeps connections open after a response (None if not known yet)
+        self.keep_alive = None
+
+        # When the router booted (estimated from its uptime), and the ETag and Last-Modified
+        # headers of the static pages
+        self.boot_time = None
+        self.validators = {}
+
+        # Rates of the cumulative counters, keyed by result
+        self.counters = {}
+
+        # The requests session is only created when the sync API is used. The asynchronous requests
+        # to the router are bounded to _POOL_SIZE, the connector of a given session may allow more
+        self._session = None
+        self._aio_session_owned = False
+        self._aio_connections = None
+        self._aio_auth = BasicAuth(self._username or "", self._password or "")
+
+        if self._ssl_fingerprint:
+            self._verify_ssl = False
+            self._aio_ssl = Fingerprint(bytes.fromhex(self._ssl_fingerprint))
+        else:
+            self._aio_ssl = None if self._verify_ssl else False
+
+
+    async def async_close(self):
+        """Close the connections to the router."""
+
+        _LOGGER.debug("DDWrt.async_close: Closing connections")
+
+        if self._aio_session_owned:
+            await self._aio_session.close()
+            self._aio_session = None
+            self._aio_session_owned = False
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
     def update_about_data(self):
@@ -138,36 +973,118 @@ class DDWrt:
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_ABOUT}"
 
+        # Only read the pages up to the firmware and model strings, and skip them if they didn't change
+        if not all(self.results.get(key) is not None for key in STATIC_RESULTS):
+            self.validators.clear()
         try:
-            self.data = self._get_ddwrt_data(url, False)
+            data = self._get_ddwrt_data(url, False, scanner=DDWrtPageScanner(*_ABOUT_MARKERS), conditional=True)
+        except DDWrt.SETUP_EXCEPTIONS:
+            raise
         except Exception as e:
-#            pass
             raise(DDWrt.DDWrtException("Unable to update about data: %s", e))
-            return None
 
-        if not self.data:
+        if data is not None and not self._process_about_data(data):
             return False
 
-        # Get firmware info
-        firmware = self.data.partition("DD-WRT v")[2].split("<br />")[0]
-        self.results.update({"sw_version": firmware.split("-r")[0]})
-        self.results.update({"sw_build": firmware.split("-r")[1].split(" ")[0]})
-        self.results.update({"sw_date": firmware.split("(")[1].split(")")[0]})
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_ROUTER_STATIC}"
+
+        try:
+            data = self._get_ddwrt_data(url, False, scanner=DDWrtPageScanner(*_ROUTER_STATIC_MARKERS), conditional=True)
+        except DDWrt.SETUP_EXCEPTIONS:
+            raise
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update router model data: %s", e))
+
+        if data is not None and not self._process_router_static_data(data):
+            return False
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_WIRELESS_STATIC}"
+
+        try:
+            data = self._get_ddwrt_data(url, False, scanner=DDWrtPageScanner(*_WIFI_SELECT_MARKERS), conditional=True)
+        except DDWrt.SETUP_EXCEPTIONS:
+            raise
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update wireless radio data: %s", e))
+
+        if data is None:
+            _LOGGER.debug("DDWrt.update_about_data: Static pages not modified")
+            return True
+
+        return self._process_wireless_static_data(data)
+
+
+    async def async_update_about_data(self):
+        """Gets firmware version info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_about_data: Updating about data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_ABOUT}"
+
+        # Only read the pages up to the firmware and model strings, and skip them if they didn't change
+        if not all(self.results.get(key) is not None for key in STATIC_RESULTS):
+            self.validators.clear()
+        try:
+            data = await self._async_get_ddwrt_data(url, False, scanner=DDWrtPageScanner(*_ABOUT_MARKERS), conditional=True)
+        except DDWrt.SETUP_EXCEPTIONS:
+            raise
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update about data: %s", e))
+
+        if data is not None and not self._process_about_data(data):
+            return False
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_ROUTER_STATIC}"
 
         try:
-            self.data = self._get_ddwrt_data(url, False)
+            data = await self._async_get_ddwrt_data(url, False, scanner=DDWrtPageScanner(*_ROUTER_STATIC_MARKERS), conditional=True)
+        except DDWrt.SETUP_EXCEPTIONS:
+            raise
         except Exception as e:
-#            pass
             raise(DDWrt.DDWrtException("Unable to update router model data: %s", e))
-            return None
 
-        if not self.data:
+        if data is not None and not self._process_router_static_data(data):
+            return False
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_WIRELESS_STATIC}"
+
+        try:
+            data = await self._async_get_ddwrt_data(url, False, scanner=DDWrtPageScanner(*_WIFI_SELECT_MARKERS), conditional=True)
+        except DDWrt.SETUP_EXCEPTIONS:
+            raise
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update wireless radio data: %s", e))
+
+        if data is None:
+            _LOGGER.debug("DDWrt.async_update_about_data: Static pages not modified")
+            return True
+
+        return self._process_wireless_static_data(data)
+
+
+    def _process_about_data(self, data):
+        """Process the About.htm page"""
+
+        if not data:
+            return False
+
+        # Get firmware info
+        firmware = data.partition("DD-WRT v")[2].split("<br />")[0]
+        self.results.update({"sw_version": firmware.split("-r")[0]})
+        self.results.update({"sw_build": firmware.split("-r")[1].split(" ")[0]})
+        self.results.update({"sw_date": firmware.split("(")[1].split(")")[0]})
+
+        return True
+
+
+    def _process_router_static_data(self, data):
+        """Process the static Status_Router.asp page"""
+
+        if not data:
             return False
 
         # Get router model
-        router_model = self.data.partition("Capture(status_router.sys_model)</script></div>")[2].split("</div>")[0].split(" ", 1)
+        router_model = data.partition("Capture(status_router.sys_model)</script></div>")[2].split("</div>")[0].split(" ", 1)
         self.results.update({"router_manufacturer": router_model[0]})
         self.results.update({"router_model": router_model[1]})
 
@@ -176,56 +1093,102 @@ class DDWrt:
         return True
 
 
+    def _process_wireless_static_data(self, data):
+        """Process the radio selector of the static Status_Wireless.asp page"""
+
+        # Routers with a single radio don't show the selector
+        radios = []
+        selector = data.partition(_WIFI_SELECT_MARKERS[0])[2].split(_WIFI_SELECT_MARKERS[1])[0]
+        for radio, selected in _WIFI_OPTION_REGEX.findall(selector):
+            radios.append(radio)
+            if selected:
+                self._wifi_display = radio
+
+        self.results.update({"wifi_radios": radios})
+
+        _LOGGER.debug("DDWrt::update_about_data radios=%s, showing %s", radios, self._wifi_display)
+
+        return True
+
+
     def update_wan_data(self):
         """Gets WAN info from the DD-WRT router"""
 
-        _LOGGER.debug("DDWrt.update_router_data: Updating WAN data...")
+        _LOGGER.debug("DDWrt.update_wan_data: Updating WAN data...")
 
         # Get data from internet endpoint
         url = f"{self._protocol}://{self._host}/{ENDPOINT_INTERNET}"
         try:
-            self.data = self._get_ddwrt_data(url, True)
+            data = self._get_ddwrt_data(url, True)
         except Exception as e:
             raise(DDWrt.DDWrtException("Unable to update WAN data: %s", e))
-            return None
 
-        if not self.data:
+        return self._process_wan_data(data)
+
+
+    async def async_update_wan_data(self):
+        """Gets WAN info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_wan_data: Updating WAN data...")
+
+        # Get data from internet endpoint
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_INTERNET}"
+        try:
+            data = await self._async_get_ddwrt_data(url, True)
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update WAN data: %s", e))
+
+        return self._process_wan_data(data)
+
+
+    def _process_wan_data(self, data):
+        """Process the Status_Internet.live.asp page"""
+
+        if not data:
             return False
 
         # Get WAN info
-        self.results.update({"wan_3g_signal": self.data.pop("wan_3g_signal").split(" ")[0]})
+        self.results.update({"wan_3g_signal": data.pop("wan_3g_signal").split(" ")[0]})
         if self.results["wan_3g_signal"].lower() == "n.a.":
             self.results.update({"wan_3g_signal": None})
-        self._get_parameter("wan_dhcp_remaining", "dhcp_remaining")
-        self._get_parameter("wan_dns0", "wan_dns0")
-        self._get_parameter("wan_dns1", "wan_dns1")
-        self._get_parameter("wan_dns2", "wan_dns2")
-        self._get_parameter("wan_dns3", "wan_dns3")
-        self._get_parameter("wan_dns4", "wan_dns4")
-        self._get_parameter("wan_dns5", "wan_dns5")
-        self._get_parameter("wan_gateway", "wan_gateway")
-        self._get_parameter("wan_ipaddr", "wan_ipaddr")
-        if "wan_ipv6addr" in self.data:
-            self.results.update({"wan_ip6addr": self.data.pop("wan_ipv6addr")})
-            del self.data["ipinfo"]
+        self._get_parameter(data, "wan_dhcp_remaining", "dhcp_remaining")
+        self._get_parameter(data, "wan_dns0", "wan_dns0")
+        self._get_parameter(data, "wan_dns1", "wan_dns1")
+        self._get_parameter(data, "wan_dns2", "wan_dns2")
+        self._get_parameter(data, "wan_dns3", "wan_dns3")
+        self._get_parameter(data, "wan_dns4", "wan_dns4")
+        self._get_parameter(data, "wan_dns5", "wan_dns5")
+        self._get_parameter(data, "wan_gateway", "wan_gateway")
+        self._get_parameter(data, "wan_ipaddr", "wan_ipaddr")
+        if "wan_ipv6addr" in data:
+            self.results.update({"wan_ip6addr": data.pop("wan_ipv6addr")})
+            del data["ipinfo"]
         else:
-            if "IPv6" in self.data.get("ipinfo", None):
-                self.results.update({"wan_ip6addr": self.data.pop("ipinfo").split("IPv6:")[1].strip()})
+            if "IPv6" in data.get("ipinfo", None):
+                self.results.update({"wan_ip6addr": data.pop("ipinfo").split("IPv6:")[1].strip()})
             else:
-                del self.data["ipinfo"]
+                del data["ipinfo"]
                 self.results.update({"wan_ip6addr": None})
-        self._get_parameter("wan_netmask", "wan_netmask")
-        self._get_parameter("wan_pppoe_ac_name", "pppoe_ac_name")
-        self._get_parameter("wan_proto", "wan_shortproto")
-        self._get_parameter("wan_traffic_in", "ttraff_in")
-        self._get_parameter("wan_traffic_out", "ttraff_out")
-        self.results.update({"wan_status": self.data.pop("wan_status").strip().split("&nbsp;")[0]})
+        self._get_parameter(data, "wan_netmask", "wan_netmask")
+        self._get_parameter(data, "wan_pppoe_ac_name", "pppoe_ac_name")
+        self._get_parameter(data, "wan_proto", "wan_shortproto")
+        self._get_parameter(data, "wan_traffic_in", "ttraff_in")
+        self._get_parameter(data, "wan_traffic_out", "ttraff_out")
+        self.results.update({"wan_status": data.pop("wan_status").strip().split("&nbsp;")[0]})
         self.results.update({"wan_connected": True if self.results["wan_status"]  == "Connected" else False})
-        self.results.update({"wan_uptime": self.data.pop("wan_uptime").strip().split(",  ")[0]})
+        self.results.update({"wan_uptime": data.pop("wan_uptime").strip().split(",  ")[0]})
+
+        self._update_boot_time(data.pop("uptime"))
 
-        del self.data["uptime"]
-        if self.data:
-            _LOGGER.warning("Extra fields in WAN data found. Please contact developer to report this warning. (%s)", self.data)
+        # Throughput from the monthly traffic totals
+        for direction in ("in", "out"):
+            rate = self._update_counter(f"wan_traffic_{direction}", self.results.get(f"wan_traffic_{direction}"))
+            self.results.update({f"wan_throughput_{direction}": _scale(rate.current, _MEBIBYTE_MEGABITS)})
+            self.results.update({f"wan_throughput_{direction}_average": _scale(rate.average, _MEBIBYTE_MEGABITS)})
+            self.results.update({f"wan_throughput_{direction}_peak": _scale(rate.peak, _MEBIBYTE_MEGABITS)})
+
+        if data:
+            _LOGGER.warning("Extra fields in WAN data found. Please contact developer to report this warning. (%s)", data)
 
         return True
 
@@ -238,132 +1201,278 @@ class DDWrt:
         # Get data from router endpoint
         url = f"{self._protocol}://{self._host}/{ENDPOINT_ROUTER}"
         try:
-            self.data = self._get_ddwrt_data(url, True)
+            data = self._get_ddwrt_data(url, True)
         except Exception as e:
             raise(DDWrt.DDWrtException("Unable to update router data: %s", e))
-            return None
 
-        if not self.data:
+        return self._process_router_data(data)
+
+
+    async def async_update_router_data(self):
+        """Gets router info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_router_data: Updating router data...")
+
+        # Get data from router endpoint
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_ROUTER}"
+        try:
+            data = await self._async_get_ddwrt_data(url, True)
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update router data: %s", e))
+
+        return self._process_router_data(data)
+
+
+    def _process_router_data(self, data):
+        """Process the Status_Router.live.asp page"""
+
+        if not data:
             return False
 
         # Get router info
         cpu_temp = None
-        if self.data.get("cpu_temp", None).strip() != "":
-            if self.data.get("cpu_temp", None).strip() != "Not available":
+        if data.get("cpu_temp", None).strip() != "":
+            if data.get("cpu_temp", None).strip() != "Not available":
                 cpu_temp = {}
-                for item in self.data.get("cpu_temp", None).split("/"):
+                for item in data.get("cpu_temp", None).split("/"):
                     cpu_temp.update({item.strip().split(" ")[0]: float(item.strip().split(" ")[1])})
-        del self.data["cpu_temp"]
+        del data["cpu_temp"]
         self.results.update({"cpu_temp":        cpu_temp})
 
-        uptime = self.data.get("uptime", None).split(",  ")[0].split(" up ")[1].strip()
-        load_average1  = self.data.get("uptime", None).split("load average:")[1].split(",")[0].strip()
-        load_average5  = self.data.get("uptime", None).split("load average:")[1].split(",")[1].strip()
-        load_average15 = self.data.get("uptime", None).split("load average:")[1].split(",")[2].strip()
+        uptime = data.get("uptime", None).split(",  ")[0].split(" up ")[1].strip()
+        load_average1  = data.get("uptime", None).split("load average:")[1].split(",")[0].strip()
+        load_average5  = data.get("uptime", None).split("load average:")[1].split(",")[1].strip()
+        load_average15 = data.get("uptime", None).split("load average:")[1].split(",")[2].strip()
         self.results.update({"uptime":          uptime})
         self.results.update({"load_average1":   load_average1})
         self.results.update({"load_average5":   load_average5})
         self.results.update({"load_average15":  load_average15})
 
         # Add data to the _results array
-        self._get_parameter("clk_freq", "clkfreq")
-        self._get_parameter("ip_connections", "ip_conntrack")
-        self._get_parameter("router_time", "router_time")
-        self.results.update({"voltage":         self.data.pop("voltage").strip().split(" ")[0]})
-        if "voltage" in self.data:
-            if self.data["voltage"] == '':
+        self._get_parameter(data, "clk_freq", "clkfreq")
+        self._get_parameter(data, "ip_connections", "ip_conntrack")
+        self._get_parameter(data, "router_time", "router_time")
+        self.results.update({"voltage":         data.pop("voltage").strip().split(" ")[0]})
+        if "voltage" in data:
+            if data["voltage"] == '':
                 self.results.update({"voltage":     None})
             else:
-                self.results.update({"voltage":     self.data.pop("voltage").strip().split(" ")[0]})
+                self.results.update({"voltage":     data.pop("voltage").strip().split(" ")[0]})
         else:
             self.results.update({"voltage":     None})
 #                self.results["voltage"] = float(self.results["voltage"])
-        nvram = self.data.pop("nvram", None).split(" / ")
+        nvram = data.pop("nvram", None).split(" / ")
         self.results.update({"nvram_used":     nvram[0].split(" ")[0]})
         self.results.update({"nvram_total":     nvram[1].split(" ")[0]})
 
-        # TODO: mem_info isn't implemented in pyddwrt yet
-        del self.data["mem_info"]
-        del self.data["uptime"]
-        del self.data["ipinfo"]
-        if self.data:
-            _LOGGER.warning("Extra fields in router data found. Please contact developer to report this warning. (%s)", self.data)
+        # TODO: mem_info isn't implemented in pyddwrt yet
+        del data["mem_info"]
+        self._update_boot_time(data.pop("uptime"))
+        del data["ipinfo"]
+        if data:
+            _LOGGER.warning("Extra fields in router data found. Please contact developer to report this warning. (%s)", data)
+
+        return True
+
+
+    def update_network_data(self):
+        """Gets Networking info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.update_network_data: Updating Networking data...")
+
+        # Get data from networking endpoint
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_NETWORKING}"
+        try:
+            data = self._get_ddwrt_data(url, True)
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update networking data: %s", e))
+
+        return self._process_network_data(data)
+
+
+    async def async_update_network_data(self):
+        """Gets Networking info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_network_data: Updating Networking data...")
+
+        # Get data from networking endpoint
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_NETWORKING}"
+        try:
+            data = await self._async_get_ddwrt_data(url, True)
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update networking data: %s", e))
+
+        return self._process_network_data(data)
+
+
+    def _process_network_data(self, data):
+        """Process the Networking.live.asp page"""
+
+        if not data:
+            return False
+
+        # Get Networking info
+        network_bridges = [item.strip("'").strip() for item in data.pop("bridges_table").split(",")]
+
+        self.results.update({"network_bridges": network_bridges})
+
+        self._update_boot_time(data.pop("uptime"))
+        del data["ipinfo"]
+        if data:
+            _LOGGER.warning("Extra fields in networking data found. Please contact developer to report this warning. (%s)", data)
+
+        return True
+
+
+    def update_wireless_data(self):
+        """Gets wireless info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.update_wireless_data: Updating wireless data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_WIRELESS}"
+        radios = self.results.get("wifi_radios")
+        if not radios:
+            try:
+                data = self._get_ddwrt_data(url, True)
+            except Exception as e:
+                raise(DDWrt.DDWrtException("Unable to update wireless data: %s", e))
+
+            return self._process_wireless_data(data)
+
+        # Select each radio on the status page before fetching it, the others are only fetched now and then
+        for radio in self._wifi_order(radios):
+            try:
+                if radio != self._wifi_display:
+                    self._wifi_display = None
+                    self._post_ddwrt_data(f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}", self._wifi_select_parameters(radio))
+                    self._wifi_display = radio
+                data = self._get_ddwrt_data(url, True)
+            except Exception as e:
+                raise(DDWrt.DDWrtException("Unable to update wireless data of %s: %s", radio, e))
+
+            if not self._process_wireless_data(data, radio):
+                return False
+
+        return self._merge_radios(radios)
+
+
+    async def async_update_wireless_data(self):
+        """Gets wireless info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_wireless_data: Updating wireless data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_WIRELESS}"
+        radios = self.results.get("wifi_radios")
+        if not radios:
+            try:
+                data = await self._async_get_ddwrt_data(url, True)
+            except Exception as e:
+                raise(DDWrt.DDWrtException("Unable to update wireless data: %s", e))
+
+            return self._process_wireless_data(data)
+
+        # Select each radio on the status page before fetching it, the others are only fetched now and then.
+        # The selection is shared by all requests, so the radios are fetched one at a time.
+        if self._wifi_lock is None:
+            self._wifi_lock = asyncio.Lock()
+        async with self._wifi_lock:
+            for radio in self._wifi_order(radios):
+                try:
+                    if radio != self._wifi_display:
+                        self._wifi_display = None
+                        await self._async_post_ddwrt_data(f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}", self._wifi_select_parameters(radio))
+                        self._wifi_display = radio
+                    data = await self._async_get_ddwrt_data(url, True)
+                except Exception as e:
+                    raise(DDWrt.DDWrtException("Unable to update wireless data of %s: %s", radio, e))
+
+                if not self._process_wireless_data(data, radio):
+                    return False
+
+        return self._merge_radios(radios)
+
 
-        return True
+    def _wifi_order(self, radios):
+        """Return the radios to fetch in this poll.
 
+        The radio the wireless status page shows is fetched on every poll. Selecting another radio
+        also changes the radio shown in the router's web interface, so the other radios are only
+        fetched every _WIFI_SWEEP_INTERVAL, after which the shown radio is selected again.
+        """
 
-    def update_network_data(self):
-        """Gets Networking info from the DD-WRT router"""
+        shown = self._wifi_display if self._wifi_display in radios else radios[0]
+        if (
+            self._wifi_swept is not None
+            and monotonic() - self._wifi_swept < _WIFI_SWEEP_INTERVAL
+            and all(radio in self._radio_clients for radio in radios)
+        ):
+            return [shown]
 
-        _LOGGER.debug("DDWrt.update_network_data: Updating Networking data...")
+        self._wifi_swept = monotonic()
+        return [radio for radio in radios if radio != shown] + [shown]
 
-        # Get data from networking endpoint
-        url = f"{self._protocol}://{self._host}/{ENDPOINT_NETWORKING}"
-        try:
-            self.data = self._get_ddwrt_data(url, True)
-        except Exception as e:
-            raise(DDWrt.DDWrtException("Unable to update networking data: %s", e))
-            return None
 
-        if not self.data:
-            return False
+    def _wifi_select_parameters(self, radio):
+        """Return the parameters to show a radio on the wireless status page."""
 
-        # Get Networking info
-        network_bridges = [item.strip("'").strip() for item in self.data.pop("bridges_table").split(",")]
+        parameters = dict(WIFI_SELECT_INTERFACE_PARAMETERS)
+        parameters.update({"wifi_display": radio})
+        return parameters
 
-        self.results.update({"network_bridges": network_bridges})
 
-        del self.data["uptime"]
-        del self.data["ipinfo"]
-        if self.data:
-            _LOGGER.warning("Extra fields in networking data found. Please contact developer to report this warning. (%s)", self.data)
+    def _merge_radios(self, radios):
+        """Use the results of the first radio for the wl_ results, and merge the clients of all radios."""
 
-        return True
+        for radio in set(self.radios) - set(radios):
+            del self.radios[radio]
+            del self._radio_clients[radio]
 
+        self.results.update(self.radios[radios[0]])
 
-    def update_wireless_data(self):
-        """Gets wireless info from the DD-WRT router"""
+        self.clients_wireless = {}
+        self.clients_wds = {}
+        for radio in radios:
+            clients_wireless, clients_wds = self._radio_clients[radio]
+            self.clients_wireless.update(clients_wireless)
+            self.clients_wds.update(clients_wds)
 
-        _LOGGER.debug("DDWrt.update_wireless_data: Updating wireless data...")
+        return True
 
-        url = f"{self._protocol}://{self._host}/{ENDPOINT_WIRELESS}"
-        try:
-            self.data = self._get_ddwrt_data(url, True)
-        except Exception as e:
-            raise(DDWrt.DDWrtException("Unable to update wireless data: %s", e))
-            return None
 
-        if not self.data:
+    def _process_wireless_data(self, data, radio=None):
+        """Process the Status_Wireless.live.asp page, of the given radio if the router has more than one"""
+
+        if not data:
             return False
 
         # Get wireless info
-        wl_ack = self.data.pop("wl_ack")
+        wl_ack = data.pop("wl_ack")
         if wl_ack and not wl_ack == "" and not wl_ack == "N/A":
             self.results.update({"wl_ack_timing": wl_ack.split("&#181;")[0]})
             self.results.update({"wl_ack_distance": wl_ack.split("(")[1].split("m")[0]})
         else:
             self.results.update({"wl_ack_timing": None})
             self.results.update({"wl_ack_distance": None})
-        self._get_parameter("wl_active", "wl_active")
-        self._get_parameter("wl_busy", "wl_busy")
-        self._get_parameter("wl_channel", "wl_channel")
-        self._get_parameter("wl_count", "assoc_count")
-        self._get_parameter("wl_mac", "wl_mac")
-        self._get_parameter("wl_quality", "wl_quality")
-        wl_radio = self.data.pop("wl_radio").strip().split(" ")
+        self._get_parameter(data, "wl_active", "wl_active")
+        self._get_parameter(data, "wl_busy", "wl_busy")
+        self._get_parameter(data, "wl_channel", "wl_channel")
+        self._get_parameter(data, "wl_count", "assoc_count")
+        self._get_parameter(data, "wl_mac", "wl_mac")
+        self._get_parameter(data, "wl_quality", "wl_quality")
+        wl_radio = data.pop("wl_radio").strip().split(" ")
         try:
             self.results.update({"wl_radio": True if wl_radio[2]  == "On" else False})
         except:
             _LOGGER.error("Unknown wireless radio status, please report this to the author: %s", wl_radio)
             self.results.update({"wl_radio": None})
-        self.results.update({"wl_rate": self.data.pop("wl_rate").split(" ")[0]})
-        self._get_parameter("wl_ssid", "wl_ssid")
-        self.results.update({"wl_xmit": self.data.pop("wl_xmit").split(" ")[0]})
+        self.results.update({"wl_rate": data.pop("wl_rate").split(" ")[0]})
+        self._get_parameter(data, "wl_ssid", "wl_ssid")
+        self.results.update({"wl_xmit": data.pop("wl_xmit").split(" ")[0]})
         if self.results["wl_xmit"] == "Radio":
             self.results.update({"wl_xmit": None})
 
         # Get wireless packet info
-        packet_info = self.data.pop("packet_info")
+        packet_info = data.pop("packet_info")
 
         if packet_info:
             elements = dict((key.strip(), value.strip()) for key, value in (item.split('=') for item in packet_info.strip(';').split(';')))
@@ -384,70 +1493,32 @@ class DDWrt:
             self.results.update({"wl_tx_packet_ok": None})
 
 
-        # Get wireless clients
-        active_clients = self.data.pop("active_wireless", None)
-
+        # Get wireless clients, an empty table means the last client has left
+        active_clients = data.pop("active_wireless", None)
+        self.clients_wireless = {}
         if active_clients:
-            self.clients_wireless = {}
-            elements = [item.strip().strip("'") for item in active_clients.strip().split(",")]
-            if (len(elements) != 0) and ((len(elements) % 11) == 0):
-                # Wireless elements: MAC Address | Radioname | Interface | Uptime | Tx rate | Rx rate | Info | Signal | Noise | SNR | Signal Quality
-                for i in range(0, len(elements), 11):
-                    self.clients_wireless.update( {
-                        elements[i]: {
-                            "name": elements[i + 1],
-                            "type": CONF_TRACK_WIRELESS,
-                            "ap_mac": self.results["wl_mac"],
-                            "radioname": elements[i + 1],
-                            "interface": elements[i + 2],
-                            "uptime": elements[i + 3],
-                            "tx_rate": elements[i + 4],
-                            "rx_rate": elements[i + 5],
-                            "info": elements[i + 6],
-                            "signal": elements[i + 7],
-                            "noise": elements[i + 8],
-                            "snr": elements[i + 9],
-                            "signal_quality": elements[i + 10],
-                        }
-                    }
-                )
-            else:
-                _LOGGER.warning("update_wireless_data(): invalid number of elements in active_wireless (expected 11, found %i)", len(elements))
+            self.clients_wireless = _decode_table("active_wireless", active_clients, WirelessClient, (self.results["wl_mac"],))
 
         _LOGGER.debug("DDWrt.update_wireless_data: Wireless clients: %s", self.clients_wireless)
 
         # Get WDS clients
-        active_clients = self.data.pop("active_wds", None)
-
+        active_clients = data.pop("active_wds", None)
+        self.clients_wds = {}
         if active_clients:
-            self.clients_wds = {}
-            elements = [item.strip().strip("'") for item in active_clients.strip().split(",")]
-            if (len(elements) != 0) and ((len(elements) % 7) == 0):
-                # WDS elements: MAC Address | Interface | Description | Signal | Noise | SNR | Signal Quality
-                for i in range(0, len(elements), 7):
-                    _LOGGER.info("interface=%s", elements[i+4])
-                    self.clients_wds.update( {
-                        elements[i]: {
-                            "name": elements[i + 2],
-                            "type": CONF_TRACK_WDS,
-                            "interface": elements[i + 1],
-                            "description": elements[i + 2],
-                            "signal": elements[i + 3],
-                            "noise": elements[i + 4],
-                            "snr": elements[i + 5],
-                            "signal_quality": elements[i + 6],
-                        }
-                    }
-                )
-            else:
-                _LOGGER.warning("update_wireless_data(): invalid number of elements in active_wds (expected 7, found %i)", len(elements))
+            self.clients_wds = _decode_table("active_wds", active_clients, WdsClient)
 
         _LOGGER.debug("DDWrt.update_wireless_data: WDS clients: %s", self.clients_wds)
 
-        del self.data["uptime"]
-        del self.data["ipinfo"]
-        if self.data:
-            _LOGGER.warning("Extra fields in wireless data found. Please contact developer to report this warning. (%s)", self.data)
+        self._update_boot_time(data.pop("uptime"))
+        self._update_packet_rates("wl", radio)
+
+        if radio is not None:
+            self.radios[radio] = {key: value for key, value in self.results.items() if key.startswith("wl_")}
+            self._radio_clients[radio] = (self.clients_wireless, self.clients_wds)
+
+        del data["ipinfo"]
+        if data:
+            _LOGGER.warning("Extra fields in wireless data found. Please contact developer to report this warning. (%s)", data)
 
         return True
 
@@ -459,153 +1530,148 @@ class DDWrt:
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_LAN}"
         try:
-            self.data = self._get_ddwrt_data(url, True)
+            data = self._get_ddwrt_data(url, True)
         except Exception as e:
             raise(DDWrt.DDWrtException("Unable to update LAN data: %s", e))
-            return None
 
-        if not self.data:
+        return self._process_lan_data(data)
+
+
+    async def async_update_lan_data(self):
+        """Gets LAN info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_lan_data: Updating LAN data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_LAN}"
+        try:
+            data = await self._async_get_ddwrt_data(url, True)
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update LAN data: %s", e))
+
+        return self._process_lan_data(data)
+
+
+    def _process_lan_data(self, data):
+        """Process the Status_Lan.live.asp page"""
+
+        if not data:
             return False
 
         # Get LAN info
-        if "lan_ip_prefix" in self.data:
-            dhcp_prefix = self.data.pop("lan_ip_prefix")
-            dhcp_start = self.data.pop("dhcp_start")
+        if "lan_ip_prefix" in data:
+            dhcp_prefix = data.pop("lan_ip_prefix")
+            dhcp_start = data.pop("dhcp_start")
             lan_dhcp_start = "{}{}".format(dhcp_prefix, dhcp_start)
-            lan_dhcp_end = "{}{}".format(dhcp_prefix, int(dhcp_start)+int(self.data.pop("dhcp_num"))-1)
+            lan_dhcp_end = "{}{}".format(dhcp_prefix, int(dhcp_start)+int(data.pop("dhcp_num"))-1)
         else:
-            lan_dhcp_start = self.data.pop("dhcp_start")
-            lan_dhcp_end = self.data.pop("dhcp_end")
-            del self.data["dhcp_num"]
+            lan_dhcp_start = data.pop("dhcp_start")
+            lan_dhcp_end = data.pop("dhcp_end")
+            del data["dhcp_num"]
         self.results.update({"lan_dhcp_start": lan_dhcp_start})
         self.results.update({"lan_dhcp_end": lan_dhcp_end})
 
-        self._get_parameter("lan_dhcp_daemon", "dhcp_daemon")
-        self._get_parameter("lan_dhcp_lease_time", "dhcp_lease_time")
+        self._get_parameter(data, "lan_dhcp_daemon", "dhcp_daemon")
+        self._get_parameter(data, "lan_dhcp_lease_time", "dhcp_lease_time")
 
-        self._get_parameter("lan_dns", "lan_dns")
-        self._get_parameter("lan_gateway", "lan_gateway")
-        self._get_parameter("lan_ipaddr", "lan_ip")
-        self._get_parameter("lan_mac", "lan_mac")
-        self._get_parameter("lan_netmask", "lan_netmask")
-        self._get_parameter("lan_proto", "lan_proto")
+        self._get_parameter(data, "lan_dns", "lan_dns")
+        self._get_parameter(data, "lan_gateway", "lan_gateway")
+        self._get_parameter(data, "lan_ipaddr", "lan_ip")
+        self._get_parameter(data, "lan_mac", "lan_mac")
+        self._get_parameter(data, "lan_netmask", "lan_netmask")
+        self._get_parameter(data, "lan_proto", "lan_proto")
 
-        # Get clients from ARP table
-        active_clients = self.data.pop("arp_table", None)
+        # Get clients from ARP table, an empty table means the last client has left
+        active_clients = data.pop("arp_table", None)
+        self.clients_arp = {}
         if active_clients:
-            elements = [item.strip().strip("'") for item in active_clients.strip().split(",")]
-
-            # ARP elements: Hostname | IP Address | MAC Address | Connections (| Interface)
-            self.clients_arp = {}
-
-            # Check if this specific router returns the interface in the ARP list
-            if len(elements) % 4 == 0:
-                items_per_element = 4
-                interface = None
-            elif len(elements) % 5 == 0:
-                items_per_element = 5
-            else:
-                _LOGGER.warning("update_lan_data(): invalid number of elements in arp_table (expected 4 or 5, found %i)", len(elements))
-
-            for i in range(0, len(elements), items_per_element):
-                if items_per_element == 5:
-                    interface = elements[i + 4]
-
-                self.clients_arp.update( {
-                    elements[i + 2]: {
-                        "name": elements[i],
-                        "type": CONF_TRACK_ARP,
-                        "ip": elements[i + 1],
-                        "hostname": elements[i],
-                        "connections": elements[i + 3],
-                        "interface": interface
-                    }
-                }
-            )
+            self.clients_arp = _decode_table("arp_table", active_clients, ArpClient)
 
         _LOGGER.debug("DDWrt.update_lan_data: ARP clients: %s", self.clients_arp)
 
         # Get clients from DHCP leases
-        active_clients = self.data.pop("dhcp_leases", None)
+        active_clients = data.pop("dhcp_leases", None)
+        self.clients_dhcp = {}
         if active_clients:
-            self.clients_dhcp = {}
-            elements = [item.strip().strip("'") for item in active_clients.strip().split(",")]
-
-            # DHCP elements: Hostname | IP Address | MAC Address | Lease Expiration
-            if (len(elements) != 0) and ((len(elements) % 5) == 0):
-                for i in range(0, len(elements), 5):
-                    self.clients_dhcp.update( {
-                        elements[i + 2]: {
-                            "name": elements[i],
-                            "type": CONF_TRACK_DHCP,
-                            "ip": elements[i + 1],
-                            "hostname": elements[i],
-                            "lease_expiration": elements[i + 3]
-                        }
-                    }
-                )
-            else:
-                _LOGGER.warning("update_lan_data(): invalid number of elements in dhcp_leases (expected 5, found %i)", len(elements))
+            self.clients_dhcp = _decode_table("dhcp_leases", active_clients, DhcpClient)
 
         _LOGGER.debug("DDWrt.update_lan_data: DHCP clients: %s", self.clients_dhcp)
 
         # Get clients from PPPoE leases
-        active_clients = self.data.pop("pppoe_leases", None)
+        active_clients = data.pop("pppoe_leases", None)
+        self.clients_pppoe = {}
         if active_clients:
-            self.clients_pppoe = {}
-            elements = [item.strip().strip("'") for item in active_clients.strip().split(",")]
-
-            # PPPoE elements: Interface | Username | Local IP
-            if (len(elements) != 0) and ((len(elements) % 3) == 0):
-                for i in range(0, len(elements), 3):
-                    self.clients_pppoe.update( {
-                        elements[i + 2]: {
-                            "name": elements[i + 1],
-                            "type": CONF_TRACK_PPPOE,
-                            "interface": elements[i],
-                            "username": elements[i + 1],
-                            "local_ip": elements[i + 2]
-                       }
-                    }
-                )
-            else:
-                _LOGGER.warning("update_lan_data(): invalid number of elements in pppoe_leases (expected 3, found %i)", len(elements))
+            self.clients_pppoe = _decode_table("pppoe_leases", active_clients, PppoeClient)
 
         _LOGGER.debug("DDWrt.update_lan_data: PPPoE clients: %s", self.clients_pppoe)
 
         # Get clients from PPTP leases
-        active_clients = self.data.pop("pptp_leases", None)
+        active_clients = data.pop("pptp_leases", None)
+        self.clients_pptp = {}
         if active_clients:
-            self.clients_pptp = {}
-            elements = [item.strip().strip("'") for item in active_clients.strip().split(",")]
-
-            # PPTP elements: Interface | Username | Local IP | Remote IP
-            if (len(elements) != 0) and ((len(elements) % 4) == 0):
-                for i in range(0, len(elements), 4):
-                    self.clients_pptp.update( {
-                        elements[i + 2]: {
-                            "name": elements[i + 1],
-                            "type": CONF_TRACK_PPTP,
-                            "interface": elements[i],
-                            "username": elements[i + 1],
-                            "local_ip": elements[i + 2],
-                            "remote_ip": elements[i + 3]
-                        }
-                    }
-                 )
-            else:
-                _LOGGER.warning("update_lan_data(): invalid number of elements in pptp_leases (expected 4, found %i)", len(elements))
+            self.clients_pptp = _decode_table("pptp_leases", active_clients, PptpClient)
 
         _LOGGER.debug("DDWrt.update_lan_data: PPTP clients: %s", self.clients_pptp)
 
-        del self.data["uptime"]
-        del self.data["ipinfo"]
-        if self.data:
-            _LOGGER.warning("Extra fields in LAN data found. Please contact developer to report this warning. (%s)", self.data)
+        self._update_boot_time(data.pop("uptime"))
+        del data["ipinfo"]
+        if data:
+            _LOGGER.warning("Extra fields in LAN data found. Please contact developer to report this warning. (%s)", data)
+
+        return True
+
+
+    def update_conntrack_data(self):
+        """Gets the tracked connections of each LAN IP address from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.update_conntrack_data: Updating conntrack data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_CONNTRACK}"
+        try:
+            data = self._get_ddwrt_data(url, False, scanner=DDWrtConntrackScanner(self._lan_network()))
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update conntrack data: %s", e))
+
+        return self._process_conntrack_data(data)
+
+
+    async def async_update_conntrack_data(self):
+        """Gets the tracked connections of each LAN IP address from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_conntrack_data: Updating conntrack data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_CONNTRACK}"
+        try:
+            data = await self._async_get_ddwrt_data(url, False, scanner=DDWrtConntrackScanner(self._lan_network()))
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update conntrack data: %s", e))
+
+        return self._process_conntrack_data(data)
+
+
+    def _process_conntrack_data(self, data):
+        """Process the connections of each LAN IP address, aggregated from the Status_Conntrack.asp page"""
+
+        if data is None:
+            return False
+
+        self.conntrack = data
+
+        _LOGGER.debug("DDWrt.update_conntrack_data: Connections of %i LAN IP addresses", len(self.conntrack))
 
         return True
 
 
+    def _lan_network(self):
+        """Return the LAN network and mask as integers, or None if the LAN data hasn't been received."""
+
+        network = _parse_ip(self.results.get("lan_ipaddr") or "")
+        mask = _parse_ip(self.results.get("lan_netmask") or "")
+        if network is None or mask is None:
+            return None
+
+        return network & mask, mask
+
+
     def update_upnp_data(self):
         """Gets UPNP info from the DD-WRT router"""
 
@@ -613,226 +1679,428 @@ class DDWrt:
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_UPNP}"
         try:
-            self.data = self._get_ddwrt_data(url, True)
+            data = self._get_ddwrt_data(url, True)
         except Exception as e:
             raise(DDWrt.DDWrtException("Unable to update UPNP data: %s", e))
-            return None
 
-        if not self.data:
+        return self._process_upnp_data(data)
+
+
+    async def async_update_upnp_data(self):
+        """Gets UPNP info from the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_upnp_data: Updating UPNP data...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_UPNP}"
+        try:
+            data = await self._async_get_ddwrt_data(url, True)
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update UPNP data: %s", e))
+
+        return self._process_upnp_data(data)
+
+
+    def _process_upnp_data(self, data):
+        """Process the UPnP.live.asp page"""
+
+        if not data:
             return False
 
         # Get UPNP forwards
-        upnp_data = self.data.pop("upnp_forwards", None)
+        upnp_data = data.pop("upnp_forwards", None)
 
         if upnp_data:
             self.upnp_forwards = {}
-            elements = [item.strip().strip("'") for item in upnp_data.strip().split(",")]
-
-            _LOGGER.debug("DDWrt.update_upnp_data: UPNP len=%s elements=%s", len(elements), elements)
 
             # UPNP forwards:  WAN start port-WAN end port>LAN IP address:LAN start port-LAN end port | Protocol | Enabled | Name
-            if (len(elements) != 0) and ((len(elements) % 4) == 0):
-                for i in range(0, len(elements), 4):
-                    if elements[i] != '':
-                        upnp_temp = re.split('[->:]+', elements[i])
-                        self.upnp_forwards.update( {
-                            elements[i + 3]: {
-                                "name": elements[i + 3],
-                                "wan_port_start": upnp_temp[0],
-                                "wan_port_end": upnp_temp[1],
-                                "lan_port_start": upnp_temp[3],
-                                "lan_port_end": upnp_temp[4],
-                                "lan_ip": upnp_temp[2],
-                                "protocol": elements[i + 1],
-                                "enabled": elements[i + 2],
-                            }
-                        }
-                )
-            else:
-                _LOGGER.warning("update_upnp_data(): invalid number of elements in pptp_leases (expected 4, found %i)", len(elements))
+            for ports, protocol, enabled, name in _decode_rows("upnp_forwards", upnp_data, (4,)):
+                if ports != '':
+                    upnp_temp = re.split('[->:]+', ports)
+                    self.upnp_forwards.update({
+                        name: UpnpForward(
+                            name,
+                            upnp_temp[0],
+                            upnp_temp[1],
+                            upnp_temp[3],
+                            upnp_temp[4],
+                            upnp_temp[2],
+                            protocol,
+                            enabled,
+                        )
+                    })
 
         _LOGGER.debug("DDWrt.update_upnp_data: UPNP forwards: %s", self.upnp_forwards)
 
-        del self.data["uptime"]
-        del self.data["ipinfo"]
-        if self.data:
-            _LOGGER.warning("Extra fields in UPNP data found. Please contact developer to report this warning. (%s)", self.data)
+        self._update_boot_time(data.pop("uptime"))
+        del data["ipinfo"]
+        if data:
+            _LOGGER.warning("Extra fields in UPNP data found. Please contact developer to report this warning. (%s)", data)
+
+        return True
+
+
+    def wan_dhcp_release(self):
+        """Releases the DHCP lease from the WAN interface."""
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        try:
+            self.data = self._post_ddwrt_data(url, WAN_RELEASE_PARAMETERS)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.wan_dhcp_release: Unable to send WAN DHCP release command.")
+            raise(DDWrt.DDWrtException("Unable to send WAN DHCP release command: %s", e))
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.wan_dhcp_release: Unable to release DHCP lease from WAN interface (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to release DHCP lease from WAN interface (no data returned)"))
+
+        _LOGGER.debug("DDWrt.wan_dhcp_release: succes.")
+        return True
+
+
+    def wan_dhcp_renew(self):
+        """Renews the DHCP lease for the WAN interface."""
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        try:
+            self.data = self._post_ddwrt_data(url, WAN_RENEW_PARAMETERS)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.wan_dhcp_renew: Unable to send WAN DHCP renew command.")
+            raise(DDWrt.DDWrtException("Unable to send WAN DHCP renew command: %s", e))
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.wan_dhcp_renew: Unable to renew DHCP lease from WAN interface (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to renew DHCP lease from WAN interface (no data returned)"))
+
+        _LOGGER.debug("DDWrt.wan_dhcp_renew: succes.")
+        return True
+
+
+    def wan_pppoe_connect(self):
+        """Connects the PPPoE WAN interface."""
+
+        _LOGGER.debug("DDWrt.wan_pppoe_connect: Connecting PPPoE WAN interface...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        try:
+            self.data = self._post_ddwrt_data(url, WAN_CONNECT_PPPOE_PARAMETERS)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.pppoe_connect: Unable to send PPPoE WAN connect command.")
+            raise(DDWrt.DDWrtException("Unable to send PPPoE WAN connect command: %s", e))
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.pppoe_connect: Unable to connect from WAN PPPoE interface (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to connect from WAN PPPoE interface (no data returned)"))
+
+        _LOGGER.debug("DDWrt.pppoe_disconnect: succes.")
+        return True
+
+
+    def wan_pppoe_disconnect(self):
+        """Disconnects the PPPoE WAN interface."""
+
+        _LOGGER.debug("DDWrt.wan_pppoe_disconnect: Disconnecting PPPoE WAN interface...")
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        try:
+            self.data = self._post_ddwrt_data(url, WAN_DISCONNECT_PPPOE_PARAMETERS)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.pppoe_disconnect: Unable to send PPPoE WAN disconnect command.")
+            raise(DDWrt.DDWrtException("Unable to send PPPoE WAN disconnect command: %s", e))
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.pppoe_disconnect: Unable to disconnect from WAN PPPoE interface (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to disconnect from WAN PPPoE interface (no data returned)"))
+
+        _LOGGER.debug("DDWrt.pppoe_disconnect: succes.")
+        return True
+
+
+    def run_command(self, commands):
+        """Execute one or more commands on the router in one request, and return the output of each command."""
+
+        if isinstance(commands, str):
+            commands = [commands]
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        parameters = dict(RUN_COMMAND_PARAMETERS, ping_ip=_command_script(commands))
+
+        try:
+            self.data = self._post_ddwrt_data(url, parameters, body=True)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.run_command: Unable to send run_command.")
+            raise(DDWrt.DDWrtException("Unable to send run command: %s", e))
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.run_command: Running command failed (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to run command (no data returned)"))
+
+        _LOGGER.debug("DDWrt.run_command: succes.")
+        return _parse_command_output(self.data, len(commands))
+
+
+    def upnp_delete(self, rule='all'):
+        """Delete an UPnP rule on the router."""
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        parameters = dict(UPNP_DELETE_PARAMETERS, remove=rule)
+
+        try:
+            self.data = self._post_ddwrt_data(url, parameters)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.upnp_delete: Unable to send upnp_delete.")
+            raise(DDWrt.DDWrtException("Unable to send UPnP delete command: %s", e))
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.upnp_delete: Deleting UPnP rule failed (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to delete UPnP rule (no data returned)"))
+
+        _LOGGER.debug("DDWrt.upnp_delete: succes.")
+        return True
+
+
+    def wake_on_lan(self, mac, network, port):
+        """Perform a Wake-On-Lan on the router."""
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        parameters = RUN_COMMAND_PARAMETERS.update({
+            'manual_wol_mac': mac,
+            'manual_wol_network': network,
+            'manual_wol_port': port,
+        })
+
+        try:
+            self.data = self._post_ddwrt_data(url, parameters)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.wake_on_lan: Unable to send Wake-On-Lan.")
+            raise(DDWrt.DDWrtException("Unable to send Wake-On-Lan command: %s", e))
+            return None
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.wake_on_lan: Wake-On-Lan failed (no data returned).")
+            raise(DDWrt.DDWrtException("Unable to run Wake-On-Lan (no data returned)"))
+
+        _LOGGER.debug("DDWrt.wake_on_lan: succes.")
+        return True
+
+
+    def reboot(self):
+        """Reboots the router."""
+
+        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+
+        try:
+            self.data = self._post_ddwrt_data(url, REBOOT_PARAMETERS)
+        except Exception as e:
+            _LOGGER.debug("DDWrt.reboot: Rebooting router failed.")
+            raise(DDWrt.DDWrtException("Unable to send reboot command: %s", e))
+            return None
+
+        if not self.data:
+            _LOGGER.debug("DDWrt.reboot: Rebooting router failed (no data returned).")
+            raise(DDWrt.DDWrtException("Rebooting router failed (no data returned)"))
 
+        _LOGGER.debug("DDWrt.reboot: succes.")
         return True
 
 
-    def wan_dhcp_release(self):
+    async def async_wan_dhcp_release(self):
         """Releases the DHCP lease from the WAN interface."""
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
         try:
-            self.data = self._post_ddwrt_data(url, WAN_RELEASE_PARAMETERS)
+            self.data = await self._async_post_ddwrt_data(url, WAN_RELEASE_PARAMETERS)
         except Exception as e:
-            _LOGGER.debug("DDWrt.wan_dhcp_release: Unable to send WAN DHCP release command.")
+            _LOGGER.debug("DDWrt.async_wan_dhcp_release: Unable to send WAN DHCP release command.")
             raise(DDWrt.DDWrtException("Unable to send WAN DHCP release command: %s", e))
 
         if not self.data:
-            _LOGGER.debug("DDWrt.wan_dhcp_release: Unable to release DHCP lease from WAN interface (no data returned).")
+            _LOGGER.debug("DDWrt.async_wan_dhcp_release: Unable to release DHCP lease from WAN interface (no data returned).")
             raise(DDWrt.DDWrtException("Unable to release DHCP lease from WAN interface (no data returned)"))
 
-        _LOGGER.debug("DDWrt.wan_dhcp_release: succes.")
+        _LOGGER.debug("DDWrt.async_wan_dhcp_release: succes.")
         return True
 
 
-    def wan_dhcp_renew(self):
+    async def async_wan_dhcp_renew(self):
         """Renews the DHCP lease for the WAN interface."""
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
         try:
-            self.data = self._post_ddwrt_data(url, WAN_RENEW_PARAMETERS)
+            self.data = await self._async_post_ddwrt_data(url, WAN_RENEW_PARAMETERS)
         except Exception as e:
-            _LOGGER.debug("DDWrt.wan_dhcp_renew: Unable to send WAN DHCP renew command.")
+            _LOGGER.debug("DDWrt.async_wan_dhcp_renew: Unable to send WAN DHCP renew command.")
             raise(DDWrt.DDWrtException("Unable to send WAN DHCP renew command: %s", e))
 
         if not self.data:
-            _LOGGER.debug("DDWrt.wan_dhcp_renew: Unable to renew DHCP lease from WAN interface (no data returned).")
+            _LOGGER.debug("DDWrt.async_wan_dhcp_renew: Unable to renew DHCP lease from WAN interface (no data returned).")
             raise(DDWrt.DDWrtException("Unable to renew DHCP lease from WAN interface (no data returned)"))
 
-        _LOGGER.debug("DDWrt.wan_dhcp_renew: succes.")
+        _LOGGER.debug("DDWrt.async_wan_dhcp_renew: succes.")
         return True
 
 
-    def wan_pppoe_connect(self):
+    async def async_wan_pppoe_connect(self):
         """Connects the PPPoE WAN interface."""
 
-        _LOGGER.debug("DDWrt.wan_pppoe_connect: Connecting PPPoE WAN interface...")
+        _LOGGER.debug("DDWrt.async_wan_pppoe_connect: Connecting PPPoE WAN interface...")
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
         try:
-            self.data = self._post_ddwrt_data(url, WAN_CONNECT_PPPOE_PARAMETERS)
+            self.data = await self._async_post_ddwrt_data(url, WAN_CONNECT_PPPOE_PARAMETERS)
         except Exception as e:
-            _LOGGER.debug("DDWrt.pppoe_connect: Unable to send PPPoE WAN connect command.")
+            _LOGGER.debug("DDWrt.async_wan_pppoe_connect: Unable to send PPPoE WAN connect command.")
             raise(DDWrt.DDWrtException("Unable to send PPPoE WAN connect command: %s", e))
 
         if not self.data:
-            _LOGGER.debug("DDWrt.pppoe_connect: Unable to connect from WAN PPPoE interface (no data returned).")
+            _LOGGER.debug("DDWrt.async_wan_pppoe_connect: Unable to connect from WAN PPPoE interface (no data returned).")
             raise(DDWrt.DDWrtException("Unable to connect from WAN PPPoE interface (no data returned)"))
 
-        _LOGGER.debug("DDWrt.pppoe_disconnect: succes.")
+        _LOGGER.debug("DDWrt.async_wan_pppoe_connect: succes.")
         return True
 
 
-    def wan_pppoe_disconnect(self):
+    async def async_wan_pppoe_disconnect(self):
         """Disconnects the PPPoE WAN interface."""
 
-        _LOGGER.debug("DDWrt.wan_pppoe_disconnect: Disconnecting PPPoE WAN interface...")
+        _LOGGER.debug("DDWrt.async_wan_pppoe_disconnect: Disconnecting PPPoE WAN interface...")
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
         try:
-            self.data = self._post_ddwrt_data(url, WAN_DISCONNECT_PPPOE_PARAMETERS)
+            self.data = await self._async_post_ddwrt_data(url, WAN_DISCONNECT_PPPOE_PARAMETERS)
         except Exception as e:
-            _LOGGER.debug("DDWrt.pppoe_disconnect: Unable to send PPPoE WAN disconnect command.")
+            _LOGGER.debug("DDWrt.async_wan_pppoe_disconnect: Unable to send PPPoE WAN disconnect command.")
             raise(DDWrt.DDWrtException("Unable to send PPPoE WAN disconnect command: %s", e))
 
         if not self.data:
-            _LOGGER.debug("DDWrt.pppoe_disconnect: Unable to disconnect from WAN PPPoE interface (no data returned).")
+            _LOGGER.debug("DDWrt.async_wan_pppoe_disconnect: Unable to disconnect from WAN PPPoE interface (no data returned).")
             raise(DDWrt.DDWrtException("Unable to disconnect from WAN PPPoE interface (no data returned)"))
 
-        _LOGGER.debug("DDWrt.pppoe_disconnect: succes.")
+        _LOGGER.debug("DDWrt.async_wan_pppoe_disconnect: succes.")
         return True
 
 
-    def run_command(self, commands):
-        """Execute a command on the router."""
+    async def async_run_command(self, commands):
+        """Execute one or more commands on the router in one request, and return the output of each command."""
 
-        commands = commands.replace(' ', '+')
-        commands = commands.replace('=', '%3D')
-        commands = commands.replace('\n', '%0A')
-        commands = commands.replace('\r', '%0D')
+        if isinstance(commands, str):
+            commands = [commands]
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
-        parameters = RUN_COMMAND_PARAMETERS.update({'ping_ip': commands})
+        parameters = dict(RUN_COMMAND_PARAMETERS, ping_ip=_command_script(commands))
 
         try:
-            self.data = self._post_ddwrt_data(url, parameters)
+            self.data = await self._async_post_ddwrt_data(url, parameters, body=True)
         except Exception as e:
-            _LOGGER.debug("DDWrt.run_command: Unable to send run_command.")
-            raise(DDWrt.DDWrtException("Unable to send reboot command: %s", e))
-            return None
+            _LOGGER.debug("DDWrt.async_run_command: Unable to send run_command.")
+            raise(DDWrt.DDWrtException("Unable to send run command: %s", e))
 
         if not self.data:
-            _LOGGER.debug("DDWrt.run_command: Rebooting router failed (no data returned).")
+            _LOGGER.debug("DDWrt.async_run_command: Running command failed (no data returned).")
             raise(DDWrt.DDWrtException("Unable to run command (no data returned)"))
 
-        _LOGGER.debug("DDWrt.run_command: succes.")
-        return True
+        _LOGGER.debug("DDWrt.async_run_command: succes.")
+        return _parse_command_output(self.data, len(commands))
 
 
-    def upnp_delete(self, rule='all'):
+    async def async_upnp_delete(self, rule='all'):
         """Delete an UPnP rule on the router."""
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
-        parameters = UPNP_DELETE_PARAMETERS.update({'remove': rule})
+        parameters = dict(UPNP_DELETE_PARAMETERS, remove=rule)
 
         try:
-            self.data = self._post_ddwrt_data(url, parameters)
+            self.data = await self._async_post_ddwrt_data(url, parameters)
         except Exception as e:
-            _LOGGER.debug("DDWrt.run_command: Unable to send upnp_delete.")
+            _LOGGER.debug("DDWrt.async_upnp_delete: Unable to send upnp_delete.")
             raise(DDWrt.DDWrtException("Unable to send UPnP delete command: %s", e))
-            return None
 
         if not self.data:
-            _LOGGER.debug("DDWrt.run_command: Deleting UPnP rule failed (no data returned).")
+            _LOGGER.debug("DDWrt.async_upnp_delete: Deleting UPnP rule failed (no data returned).")
             raise(DDWrt.DDWrtException("Unable to delete UPnP rule (no data returned)"))
 
-        _LOGGER.debug("DDWrt.upnp_delete: succes.")
+        _LOGGER.debug("DDWrt.async_upnp_delete: succes.")
         return True
 
 
-    def wake_on_lan(self, mac, network, port):
-        """Perform a Wake-On-Lan on the router."""
+    async def async_reboot(self):
+        """Reboots the router."""
 
         url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
 
-        parameters = RUN_COMMAND_PARAMETERS.update({
-            'manual_wol_mac': mac,
-            'manual_wol_network': network,
-            'manual_wol_port': port,
-        })
-
         try:
-            self.data = self._post_ddwrt_data(url, parameters)
+            self.data = await self._async_post_ddwrt_data(url, REBOOT_PARAMETERS)
         except Exception as e:
-            _LOGGER.debug("DDWrt.wake_on_lan: Unable to send Wake-On-Lan.")
-            raise(DDWrt.DDWrtException("Unable to send Wake-On-Lan command: %s", e))
-            return None
+            _LOGGER.debug("DDWrt.async_reboot: Rebooting router failed.")
+            raise(DDWrt.DDWrtException("Unable to send reboot command: %s", e))
 
         if not self.data:
-            _LOGGER.debug("DDWrt.wake_on_lan: Wake-On-Lan failed (no data returned).")
-            raise(DDWrt.DDWrtException("Unable to run Wake-On-Lan (no data returned)"))
+            _LOGGER.debug("DDWrt.async_reboot: Rebooting router failed (no data returned).")
+            raise(DDWrt.DDWrtException("Rebooting router failed (no data returned)"))
 
-        _LOGGER.debug("DDWrt.wake_on_lan: succes.")
+        _LOGGER.debug("DDWrt.async_reboot: succes.")
         return True
 
 
-    def reboot(self):
-        """Reboots the router."""
+    def update_traffic_data(self):
+        """Gets the daily traffic of this month from the nvram of the DD-WRT router
 
-        url = f"{self._protocol}://{self._host}/{ENDPOINT_APPLY}"
+        No status page has the daily counters, so they're read with run_command(), which is a POST to
+        apply.cgi that needs the administrator account. Call it at a slow interval."""
 
+        _LOGGER.debug("DDWrt.update_traffic_data: Updating traffic data...")
+
+        month = date.today().strftime("%m-%Y")
         try:
-            self.data = self._post_ddwrt_data(url, REBOOT_PARAMETERS)
+            output, = self.run_command(f"nvram get {_TRAFFIC_NVRAM_KEY.format(month)}")
         except Exception as e:
-            _LOGGER.debug("DDWrt.reboot: Rebooting router failed.")
-            raise(DDWrt.DDWrtException("Unable to send reboot command: %s", e))
-            return None
+            raise(DDWrt.DDWrtException("Unable to update traffic data: %s", e))
 
-        if not self.data:
-            _LOGGER.debug("DDWrt.reboot: Rebooting router failed (no data returned).")
-            raise(DDWrt.DDWrtException("Rebooting router failed (no data returned)"))
+        return self._process_traffic_data(month, output)
+
+
+    async def async_update_traffic_data(self):
+        """Gets the daily traffic of this month from the nvram of the DD-WRT router"""
+
+        _LOGGER.debug("DDWrt.async_update_traffic_data: Updating traffic data...")
+
+        month = date.today().strftime("%m-%Y")
+        try:
+            output, = await self.async_run_command(f"nvram get {_TRAFFIC_NVRAM_KEY.format(month)}")
+        except Exception as e:
+            raise(DDWrt.DDWrtException("Unable to update traffic data: %s", e))
+
+        return self._process_traffic_data(month, output)
+
+
+    def _process_traffic_data(self, month, output):
+        """Process the daily traffic counters of a month, the traffic result is the hash of the data"""
+
+        if output is None:
+            return False
+
+        # The totals between brackets are left out, they're the sum of the days
+        value = output.split("[", 1)[0].strip()
+        digest = sha256(f"{month} {value}".encode()).hexdigest()
+        if self.traffic is None or self.traffic.digest != digest:
+            days = tuple((int(rx), int(tx)) for rx, tx in _TRAFFIC_DAY_REGEX.findall(value))
+            _LOGGER.debug("DDWrt._process_traffic_data: New traffic data for %s (%i days)", month, len(days))
+            self.traffic = TrafficMonth(month, days, digest)
+
+        self.results.update({"traffic": digest})
 
-        _LOGGER.debug("DDWrt.reboot: succes.")
         return True
 
 
@@ -845,15 +2113,18 @@ class DDWrt:
 
         if convert:
             _LOGGER.debug("DDWrt.traffic_graph_url: Returning traffic graph image for %s", url)
-            return _get_ddwrt_image(url)
+            return self._get_ddwrt_image(url)
         else:
             _LOGGER.debug("DDWrt.traffic_graph_url: Returning traffic graph URL: %s", url)
             return url
 
 
     # Make a GET request to the router
-    def _get_ddwrt_data(self, url, convert):
-        """Make a GET request to a DD-WRT router and return parsed result."""
+    def _get_ddwrt_data(self, url, convert, keys=None, scanner=None, conditional=False):
+        """Make a GET request to a DD-WRT router and return parsed result.
+
+        A conditional request returns None if the page wasn't modified since it was last received.
+        """
 
         _LOGGER.debug("DDWrt._get_ddwrt_data: Connecting to %s", url)
 
@@ -862,11 +2133,12 @@ class DDWrt:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         try:
-            response = self._session.get(
+            response = self._get_session().get(
                 url = url,
                 auth = (self._username, self._password),
-                headers = {HTTP_X_REQUESTED_WITH: _X_REQUESTED_WITH},
+                headers = self._headers(url if conditional else None),
                 timeout = DEFAULT_TIMEOUT,
+                stream = convert or scanner is not None,
                 verify = self._verify_ssl,
             )
         except urllib3.exceptions.InsecureRequestWarning as e:
@@ -874,32 +2146,8 @@ class DDWrt:
             raise(DDWrt.ExceptionCannotVerify(e))
 
         except SSLError as e:
-            errmsg = str(e)
-
-            # Check for hostname mismatch error
-            if errmsg.startswith("hostname"):
-                _LOGGER.debug("DDWrt._get_ddwrt_data: SSLError hostname mismatch")
-                raise(DDWrt.ExceptionHostnameMismatch(e))
-
-            # Get certificate from the router
-            try:
-                raw_cert = ssl.get_server_certificate((self._host, 443))
-            except Exception as e:
-                _LOGGER.debug("DDWrt._get_ddwrt_data: SSLError unknown error")
-                raise(DDWrt.ExceptionSSLError(e))
-
-            # Check for valid date in certificate
-            x509 = crypto.load_certificate(crypto.FILETYPE_PEM, raw_cert)
-            now = datetime.now()
-            not_after = datetime.strptime(x509.get_notAfter().decode('utf-8'), "%Y%m%d%H%M%SZ")
-            not_before = datetime.strptime(x509.get_notBefore().decode('utf-8'), "%Y%m%d%H%M%SZ")
-            if now > not_after or now < not_before:
-                _LOGGER.debug("DDWrt._get_ddwrt_data: SSLError invalid date")
-                raise(DDWrt.ExceptionInvalidDate(e))
-
-            # Return self-signed error
-            _LOGGER.debug("DDWrt._get_ddwrt_data: SSLError self signed")
-            raise(DDWrt.ExceptionSelfSigned(e))
+            _LOGGER.debug("DDWrt._get_ddwrt_data: SSLError")
+            raise(self._ssl_exception(e))
 
         except ConnectionError as e:
             _LOGGER.debug("DDWrt._get_ddwrt_data: ConnectionError")
@@ -913,18 +2161,42 @@ class DDWrt:
             _LOGGER.debug("DDWrt._get_ddwrt_data: Unable to connect to the router Connection error: %s", e)
             raise(DDWrt.ExceptionUnknown(e))
 
+        self._check_keep_alive(response.raw.version == 10, response.headers.get("Connection"))
+
+        # Not modified
+        if conditional and response.status_code == 304:
+            response.close()
+            _LOGGER.debug("DDWrt._get_ddwrt_data: Not modified %s", url)
+            return None
+
         # Valid response
         if response.status_code == 200:
-            if response.text:
-                if convert:
-                    result = dict(_DDWRT_DATA_REGEX.findall(response.text))
-                else:
-                    result = response.text
+            if conditional:
+                self._update_validators(url, response.headers)
+            if convert:
+                parser = DDWrtDataParser(keys)
+                with response:
+                    result = dict(parser.parse(response.iter_content(chunk_size=_CHUNK_SIZE)))
+                if parser.size:
+                    _LOGGER.debug("DDWrt._get_ddwrt_data: received data: %s", result)
+                    return result
+            elif scanner is not None:
+                with response:
+                    for _ in scanner.parse(response.iter_content(chunk_size=_CHUNK_SIZE)):
+                        pass
+                if scanner.size:
+                    result = scanner.result
+                    _LOGGER.debug("DDWrt._get_ddwrt_data: received data: %s", result)
+                    return result
+            elif response.text:
+                result = response.text
                 _LOGGER.debug("DDWrt._get_ddwrt_data: received data: %s", result)
                 return result
-            else:
-                _LOGGER.debug("DDWrt._get_ddwrt_data: Received empty response querying %s", url)
-                raise(DDWrt.ExceptionEmptyResponse())
+
+            _LOGGER.debug("DDWrt._get_ddwrt_data: Received empty response querying %s", url)
+            raise(DDWrt.ExceptionEmptyResponse())
+
+        response.close()
 
         # Authentication error
         if response.status_code == 401:
@@ -937,8 +2209,8 @@ class DDWrt:
 
 
     # Make a POST request to the router
-    def _post_ddwrt_data(self, url, data):
-        """Make a POST request to a DD-WRT router."""
+    def _post_ddwrt_data(self, url, data, body=False):
+        """Make a POST request to a DD-WRT router, and return the response body if asked for."""
 
         _LOGGER.debug("DDWrt._post_ddwrt_data: Connecting to %s", url)
 
@@ -947,11 +2219,11 @@ class DDWrt:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         try:
-            response = self._session.post(
+            response = self._get_session().post(
                 url = url,
                 auth = (self._username, self._password),
                 data = data,
-                headers = {HTTP_X_REQUESTED_WITH: _X_REQUESTED_WITH},
+                headers = self._headers(),
                 timeout = DEFAULT_TIMEOUT,
                 verify = self._verify_ssl,
             )
@@ -960,32 +2232,8 @@ class DDWrt:
             raise(DDWrt.ExceptionCannotVerify(e))
 
         except SSLError as e:
-            errmsg = str(e)
-
-            # Check for hostname mismatch error
-            if errmsg.startswith("hostname"):
-                _LOGGER.debug("DDWrt._post_ddwrt_data: SSLError hostname mismatch")
-                raise(DDWrt.ExceptionHostnameMismatch(e))
-
-            # Get certificate from the router
-            try:
-                raw_cert = ssl.get_server_certificate((self._host, 443))
-            except Exception as e:
-                _LOGGER.debug("DDWrt._post_ddwrt_data: SSLError unknown error")
-                raise(DDWrt.ExceptionSSLError(e))
-
-            # Check for valid date in certificate
-            x509 = crypto.load_certificate(crypto.FILETYPE_PEM, raw_cert)
-            now = datetime.now()
-            not_after = datetime.strptime(x509.get_notAfter().decode('utf-8'), "%Y%m%d%H%M%SZ")
-            not_before = datetime.strptime(x509.get_notBefore().decode('utf-8'), "%Y%m%d%H%M%SZ")
-            if now > not_after or now < not_before:
-                _LOGGER.debug("DDWrt._post_ddwrt_data: SSLError invalid date")
-                raise(DDWrt.ExceptionInvalidDate(e))
-
-            # Return self-signed error
-            _LOGGER.debug("DDWrt._post_ddwrt_data: SSLError self signed")
-            raise(DDWrt.ExceptionSelfSigned(e))
+            _LOGGER.debug("DDWrt._post_ddwrt_data: SSLError")
+            raise(self._ssl_exception(e))
 
         except ConnectionError as e:
             _LOGGER.debug("DDWrt._post_ddwrt_data: ConnectionError")
@@ -999,10 +2247,12 @@ class DDWrt:
             _LOGGER.debug("DDWrt._post_ddwrt_data: Unable to connect to the router Connection error: %s", e)
             raise(DDWrt.ExceptionUnknown(e))
 
+        self._check_keep_alive(response.raw.version == 10, response.headers.get("Connection"))
+
         # Valid response
         if response.status_code == 200:
             _LOGGER.debug("DDWrt._post_ddwrt_data: Received valid response for %s", url)
-            return True
+            return response.content if body else True
 
         # Authentication error
         if response.status_code == 401:
@@ -1025,10 +2275,10 @@ class DDWrt:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         try:
-            response = self._session.get(
+            response = self._get_session().get(
                 url = url,
                 auth = (self._username, self._password),
-                headers = {HTTP_X_REQUESTED_WITH: _X_REQUESTED_WITH},
+                headers = self._headers(),
                 timeout = DEFAULT_TIMEOUT,
                 verify = self._verify_ssl,
             )
@@ -1037,32 +2287,8 @@ class DDWrt:
             raise(DDWrt.ExceptionCannotVerify(e))
 
         except SSLError as e:
-            errmsg = str(e)
-
-            # Check for hostname mismatch error
-            if errmsg.startswith("hostname"):
-                _LOGGER.debug("DDWrt._get_ddwrt_image: SSLError hostname mismatch")
-                raise(DDWrt.ExceptionHostnameMismatch(e))
-
-            # Get certificate from the router
-            try:
-                raw_cert = ssl.get_server_certificate((self._host, 443))
-            except Exception as e:
-                _LOGGER.debug("DDWrt._get_ddwrt_image: SSLError unknown error")
-                raise(DDWrt.ExceptionSSLError(e))
-
-            # Check for valid date in certificate
-            x509 = crypto.load_certificate(crypto.FILETYPE_PEM, raw_cert)
-            now = datetime.now()
-            not_after = datetime.strptime(x509.get_notAfter().decode('utf-8'), "%Y%m%d%H%M%SZ")
-            not_before = datetime.strptime(x509.get_notBefore().decode('utf-8'), "%Y%m%d%H%M%SZ")
-            if now > not_after or now < not_before:
-                _LOGGER.debug("DDWrt._get_ddwrt_image: SSLError invalid date")
-                raise(DDWrt.ExceptionInvalidDate(e))
-
-            # Return self-signed error
-            _LOGGER.debug("DDWrt._get_ddwrt_image: SSLError self signed")
-            raise(DDWrt.ExceptionSelfSigned(e))
+            _LOGGER.debug("DDWrt._get_ddwrt_image: SSLError")
+            raise(self._ssl_exception(e))
 
         except ConnectionError as e:
             _LOGGER.debug("DDWrt._get_ddwrt_image: ConnectionError")
@@ -1076,6 +2302,8 @@ class DDWrt:
             _LOGGER.debug("DDWrt._get_ddwrt_image: Unable to connect to the router Connection error: %s", e)
             raise(DDWrt.ExceptionUnknown(e))
 
+        self._check_keep_alive(response.raw.version == 10, response.headers.get("Connection"))
+
         # Valid response
         if response.status_code == 200:
             if response.content:
@@ -1094,9 +2322,364 @@ class DDWrt:
         _LOGGER.debug("DDWrt._get_ddwrt_image: Invalid HTTP status code %s", response)
         raise(DDWrt.ExceptionHTTPError(response.status_code))
 
-    def _get_parameter(self, py_parameter, router_parameter):
-        if router_parameter in self.data:
-            self.results.update({py_parameter: self.data.pop(router_parameter)})
+    # Make an asynchronous request to the router
+    async def _async_request(self, method, url, data=None, parser=None, conditional=False):
+        """Make an asynchronous request to a DD-WRT router and return the HTTP status code and body.
+
+        When a parser is given, the body is parsed while it's received and returned as a dict. A
+        conditional request sends the validators of the last response, and stores the new ones.
+        """
+
+        _LOGGER.debug("DDWrt._async_request: Connecting to %s", url)
+
+        try:
+            try:
+                return await self._async_request_once(method, url, data, parser, conditional)
+            except ServerDisconnectedError:
+                # The router closed a connection that was kept open, retry once on a new connection.
+                # A POST isn't sent again, the router may already have run the command
+                if method != "GET" or (parser is not None and parser.size):
+                    raise
+                _LOGGER.debug("DDWrt._async_request: Server disconnected, retrying %s", url)
+                return await self._async_request_once(method, url, data, parser, conditional)
+
+        except ClientConnectorCertificateError as e:
+            verify_code = getattr(e.certificate_error, "verify_code", None)
+
+            # Check for hostname mismatch error
+            if verify_code == _SSL_VERIFY_HOSTNAME_MISMATCH:
+                _LOGGER.debug("DDWrt._async_request: SSLError hostname mismatch")
+                raise(DDWrt.ExceptionHostnameMismatch(e))
+
+            # Check for valid date in certificate
+            if verify_code in _SSL_VERIFY_INVALID_DATE:
+                _LOGGER.debug("DDWrt._async_request: SSLError invalid date")
+                raise(DDWrt.ExceptionInvalidDate(e))
+
+            # Return self-signed error
+            _LOGGER.debug("DDWrt._async_request: SSLError self signed")
+            raise(DDWrt.ExceptionSelfSigned(e))
+
+        except ServerFingerprintMismatch as e:
+            _LOGGER.debug("DDWrt._async_request: SSLError fingerprint mismatch")
+            raise(DDWrt.ExceptionFingerprintMismatch(e))
+
+        except ClientSSLError as e:
+            _LOGGER.debug("DDWrt._async_request: SSLError unknown error")
+            raise(DDWrt.ExceptionSSLError(e))
+
+        except ClientConnectionError as e:
+            _LOGGER.debug("DDWrt._async_request: ConnectionError")
+            raise(DDWrt.ExceptionConnectionError(e))
+
+        except asyncio.TimeoutError as e:
+            _LOGGER.debug("DDWrt._async_request: Timeout")
+            raise(DDWrt.ExceptionTimeout(e))
+
+        except Exception as e:
+            _LOGGER.debug("DDWrt._async_request: Unable to connect to the router Connection error: %s", e)
+            raise(DDWrt.ExceptionUnknown(e))
+
+
+    async def _async_request_once(self, method, url, data, parser, conditional):
+        """Make one asynchronous request to a DD-WRT router."""
+
+        if self._aio_connections is None:
+            self._aio_connections = asyncio.Semaphore(_POOL_SIZE)
+        async with self._aio_connections, self._get_aio_session().request(
+            method,
+            url,
+            auth = self._aio_auth,
+            data = data,
+            headers = self._headers(url if conditional else None),
+            timeout = ClientTimeout(total=DEFAULT_TIMEOUT),
+            ssl = self._aio_ssl,
+        ) as response:
+            self._check_keep_alive(response.version == (1, 0), response.headers.get("Connection"))
+            if conditional and response.status == 200:
+                self._update_validators(url, response.headers)
+
+            if parser is None or response.status != 200:
+                return response.status, await response.read()
+
+            return response.status, dict([
+                pair
+                async for pair in parser.async_parse(response.content.iter_chunked(_CHUNK_SIZE))
+            ])
+
+
+    def _get_aio_session(self):
+        """Return the aiohttp session, creating one with its own connection pool if none was given."""
+
+        if self._aio_session is None:
+            self._aio_session = ClientSession(
+                connector = TCPConnector(
+                    limit_per_host = _POOL_SIZE,
+                    keepalive_timeout = _KEEPALIVE_TIMEOUT,
+                ),
+            )
+            self._aio_session_owned = True
+
+        return self._aio_session
+
+
+    def _get_session(self):
+        """Return the requests session for the sync API, creating it on first use."""
+
+        if self._session is None:
+            pool = {"pool_connections": 1, "pool_maxsize": _POOL_SIZE, "pool_block": True}
+            self._session = Session()
+            self._session.mount("http://", HTTPAdapter(**pool))
+            if self._ssl_fingerprint:
+                self._session.mount("https://", _FingerprintAdapter(self._ssl_fingerprint, **pool))
+            else:
+                self._session.mount("https://", HTTPAdapter(**pool))
+
+        return self._session
+
+
+    def _headers(self, conditional_url=None):
+        """Return the request headers, with the validators of the last response for a conditional request."""
+
+        headers = {HTTP_X_REQUESTED_WITH: _X_REQUESTED_WITH}
+
+        etag, last_modified = self.validators.get(conditional_url, (None, None))
+        if etag:
+            headers.update({"If-None-Match": etag})
+        if last_modified:
+            headers.update({"If-Modified-Since": last_modified})
+
+        # Don't keep idle connections to a router that closes them anyway
+        if self.keep_alive is False:
+            headers.update({"Connection": "close"})
+
+        return headers
+
+
+    def _update_validators(self, url, headers):
+        """Remember the ETag and Last-Modified headers of a response, if the router sends them."""
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag or last_modified:
+            self.validators.update({url: (etag, last_modified)})
+        else:
+            self.validators.pop(url, None)
+
+
+    def _update_boot_time(self, uptime):
+        """Estimate when the router booted from the uptime on a live page."""
+
+        match = _UPTIME_REGEX.search(uptime or "")
+        if match is None:
+            return
+
+        days, hours, minutes, only_minutes = match.groups()
+        minutes = (int(days or 0) * 24 + int(hours or 0)) * 60 + int(minutes or only_minutes)
+        self.boot_time = datetime.utcnow() - timedelta(minutes=minutes)
+
+
+    def _update_counter(self, key, value, wrap=None):
+        """Add a sample of a cumulative counter, and return its rates."""
+
+        rate = self.counters.get(key)
+        if rate is None:
+            rate = self.counters[key] = CounterRate(wrap)
+
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            rate.reset()
+            return rate
+
+        rate.add(monotonic(), value, self.boot_time)
+        return rate
+
+
+    def _update_packet_rates(self, prefix, radio=None):
+        """Calculate the packet rates of a radio, and the share of errors over the last samples."""
+
+        counter = f"{radio}:{prefix}" if radio else prefix
+        for direction in ("rx", "tx"):
+            ok = self._update_counter(f"{counter}_{direction}_packet_ok", self.results.get(f"{prefix}_{direction}_packet_ok"), _PACKET_COUNTER_WRAP)
+            error = self._update_counter(f"{counter}_{direction}_packet_error", self.results.get(f"{prefix}_{direction}_packet_error"), _PACKET_COUNTER_WRAP)
+
+            ratio = None
+            if ok.increase is not None and error.increase is not None and ok.increase + error.increase > 0:
+                ratio = 100 * error.increase / (ok.increase + error.increase)
+
+            self.results.update({f"{prefix}_{direction}_packets_per_second": _scale(ok.current, 1, 1)})
+            self.results.update({f"{prefix}_{direction}_error_ratio": _scale(ratio, 1, 2)})
+
+
+    def _check_keep_alive(self, http_1_0, connection):
+        """Remember whether the router keeps the connection open after a response."""
+
+        connection = (connection or "").lower()
+        keep_alive = "keep-alive" in connection if http_1_0 else "close" not in connection
+
+        # Once the router closed a connection, all later requests ask for it to be closed
+        if self.keep_alive is None:
+            _LOGGER.debug("DDWrt._check_keep_alive: Router %s keep-alive", "supports" if keep_alive else "doesn't support")
+            self.keep_alive = keep_alive
+
+
+    # Make an asynchronous GET request to the router
+    async def _async_get_ddwrt_data(self, url, convert, keys=None, scanner=None, conditional=False):
+        """Make an asynchronous GET request to a DD-WRT router and return parsed result.
+
+        A conditional request returns None if the page wasn't modified since it was last received.
+        """
+
+        parser = DDWrtDataParser(keys) if convert else scanner
+        status, body = await self._async_request("GET", url, parser=parser, conditional=conditional)
+
+        # Not modified
+        if conditional and status == 304:
+            _LOGGER.debug("DDWrt._async_get_ddwrt_data: Not modified %s", url)
+            return None
+
+        # Valid response
+        if status == 200:
+            if convert:
+                if parser.size:
+                    _LOGGER.debug("DDWrt._async_get_ddwrt_data: received data: %s", body)
+                    return body
+            elif scanner is not None:
+                if scanner.size:
+                    result = scanner.result
+                    _LOGGER.debug("DDWrt._async_get_ddwrt_data: received data: %s", result)
+                    return result
+            elif body:
+                result = body.decode("utf-8", "replace")
+                _LOGGER.debug("DDWrt._async_get_ddwrt_data: received data: %s", result)
+                return result
+
+            _LOGGER.debug("DDWrt._async_get_ddwrt_data: Received empty response querying %s", url)
+            raise(DDWrt.ExceptionEmptyResponse())
+
+        # Authentication error
+        if status == 401:
+            _LOGGER.debug("DDWrt._async_get_ddwrt_data: Failed to authenticate, please check your username and password")
+            raise(DDWrt.ExceptionAuthenticationError())
+
+        # Unknown HTTP error
+        _LOGGER.debug("DDWrt._async_get_ddwrt_data: Invalid HTTP status code %s", status)
+        raise(DDWrt.ExceptionHTTPError(status))
+
+
+    # Make an asynchronous POST request to the router
+    async def _async_post_ddwrt_data(self, url, data, body=False):
+        """Make an asynchronous POST request to a DD-WRT router, and return the response body if asked for."""
+
+        status, content = await self._async_request("POST", url, data)
+
+        # Valid response
+        if status == 200:
+            _LOGGER.debug("DDWrt._async_post_ddwrt_data: Received valid response for %s", url)
+            return content if body else True
+
+        # Authentication error
+        if status == 401:
+            _LOGGER.debug("DDWrt._async_post_ddwrt_data: Failed to authenticate, please check your username and password")
+            raise(DDWrt.ExceptionAuthenticationError())
+
+        # Unknown HTTP error
+        _LOGGER.debug("DDWrt._async_post_ddwrt_data: Invalid HTTP status code %s", status)
+        raise(DDWrt.ExceptionHTTPError(status))
+
+
+    # Return an image from the router by making an asynchronous GET request
+    async def _async_get_ddwrt_image(self, url):
+        """Make an asynchronous GET request to a DD-WRT router and return the image."""
+
+        status, body = await self._async_request("GET", url)
+
+        # Valid response
+        if status == 200:
+            if body:
+                _LOGGER.debug("DDWrt._async_get_ddwrt_image: received image")
+                return body
+            else:
+                _LOGGER.debug("DDWrt._async_get_ddwrt_image: Received empty response querying %s", url)
+                raise(DDWrt.ExceptionEmptyResponse())
+
+        # Authentication error
+        if status == 401:
+            _LOGGER.debug("DDWrt._async_get_ddwrt_image: Failed to authenticate, please check your username and password")
+            raise(DDWrt.ExceptionAuthenticationError())
+
+        # Unknown HTTP error
+        _LOGGER.debug("DDWrt._async_get_ddwrt_image: Invalid HTTP status code %s", status)
+        raise(DDWrt.ExceptionHTTPError(status))
+
+    def _ssl_address(self):
+        """Return the (host, port) of the router's HTTPS server."""
+
+        url = urlsplit(f"https://{self._host}")
+        return url.hostname, url.port or 443
+
+
+    def _get_certificate(self):
+        """Return the router's certificate, only connecting to the router if the cached one has expired."""
+
+        address = self._ssl_address()
+        now = datetime.utcnow()
+
+        certificate = _CERTIFICATES.get(address)
+        if certificate is not None and not certificate.expired(now):
+            return certificate
+
+        _LOGGER.debug("DDWrt._get_certificate: Getting certificate from %s:%s", *address)
+        x509 = crypto.load_certificate(crypto.FILETYPE_PEM, ssl.get_server_certificate(address))
+        certificate = Certificate(
+            x509.digest("sha256").decode("ascii"),
+            datetime.strptime(x509.get_notBefore().decode("ascii"), "%Y%m%d%H%M%SZ"),
+            datetime.strptime(x509.get_notAfter().decode("ascii"), "%Y%m%d%H%M%SZ"),
+            now,
+        )
+        if _CERTIFICATES.get(address, certificate).fingerprint != certificate.fingerprint:
+            _LOGGER.debug("DDWrt._get_certificate: Certificate of %s:%s has changed", *address)
+        _CERTIFICATES[address] = certificate
+
+        return certificate
+
+
+    def _ssl_exception(self, error):
+        """Return the exception for an SSLError of the requests session."""
+
+        errmsg = str(error)
+
+        # Check for pinned fingerprint mismatch
+        if "Fingerprints did not match" in errmsg:
+            _LOGGER.debug("DDWrt._ssl_exception: SSLError fingerprint mismatch")
+            return DDWrt.ExceptionFingerprintMismatch(error)
+
+        # Check for hostname mismatch error
+        if errmsg.startswith("hostname") or "Hostname mismatch" in errmsg:
+            _LOGGER.debug("DDWrt._ssl_exception: SSLError hostname mismatch")
+            return DDWrt.ExceptionHostnameMismatch(error)
+
+        # Get certificate from the router
+        try:
+            certificate = self._get_certificate()
+        except Exception as e:
+            _LOGGER.debug("DDWrt._ssl_exception: SSLError unknown error")
+            return DDWrt.ExceptionSSLError(e)
+
+        # Check for valid date in certificate
+        if not certificate.valid(datetime.utcnow()):
+            _LOGGER.debug("DDWrt._ssl_exception: SSLError invalid date")
+            return DDWrt.ExceptionInvalidDate(error)
+
+        # Return self-signed error
+        _LOGGER.debug("DDWrt._ssl_exception: SSLError self signed (fingerprint %s)", certificate.fingerprint)
+        return DDWrt.ExceptionSelfSigned(error)
+
+
+    def _get_parameter(self, data, py_parameter, router_parameter):
+        if router_parameter in data:
+            self.results.update({py_parameter: data.pop(router_parameter)})
             if self.results[py_parameter] == "":
                 self.results.update({py_parameter: None})
 
@@ -1131,9 +2714,24 @@ class DDWrt:
     class ExceptionHostnameMismatch(Exception):
         pass
 
+    class ExceptionFingerprintMismatch(Exception):
+        pass
+
     class ExceptionUnknown(Exception):
         pass
 
     class ExceptionTimeout(Exception):
         pass
 
+
+    # Errors that the about data updates pass on as is, so a caller can tell the user what's wrong
+    SETUP_EXCEPTIONS = (
+        ExceptionAuthenticationError,
+        ExceptionCannotVerify,
+        ExceptionFingerprintMismatch,
+        ExceptionHostnameMismatch,
+        ExceptionInvalidDate,
+        ExceptionSelfSigned,
+        ExceptionSSLError,
+        ExceptionTimeout,
+    )
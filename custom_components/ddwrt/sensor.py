@@ -2,6 +2,7 @@
 
 import logging
 
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 from statistics import mean
 
@@ -11,12 +12,18 @@ from . import (
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     ATTR_NAME,
+    ATTR_QUEUE_DEPTH,
+    ATTR_RESTORED,
     ATTR_UNIT_OF_MEASUREMENT,
     ATTRIBUTION,
     CONF_RESOURCES,
     CONF_HOST,
     CONF_NAME,
+    DIAGNOSTIC_SENSOR,
+    DIAGNOSTIC_SENSOR_ICON,
+    DIAGNOSTIC_SENSOR_NAME,
     DOMAIN,
+    ENTITY_CATEGORY_DIAGNOSTIC,
     SENSORS,
 )
 
@@ -39,6 +46,12 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             )
     )
 
+    # The diagnostic sensor doesn't depend on the configured resources
+    sensors.append(DdwrtDiagnosticSensor(
+        hass.data[DOMAIN][config_entry.data[CONF_HOST]]['entity'],
+        config_entry.data[CONF_NAME],
+    ))
+
     async_add_entities(sensors, True)
 
 
@@ -62,16 +75,33 @@ class DdwrtSensor(Entity):
         self._unique_id = '{}_{}'.format(self._host, self._sensor_type)
         self._unit_of_measurement = SENSORS[self._sensor_type][ATTR_UNIT_OF_MEASUREMENT]
 
-    async def async_update(self):
-        """Fetch status from DD-WRT."""
-
-#        _LOGGER.debug("DdwrtSensor::async_update for %s", self._sensor_type)
-
     async def async_added_to_hass(self):
         """Client entity created."""
 
         _LOGGER.debug("DdwrtSensor::async_added_to_hass %s", self._sensor_type)
 
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_update(self._sensor_type),
+                self.async_write_ha_state,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_update(f"{self._sensor_type}_radios"),
+                self.async_write_ha_state,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_health,
+                self.async_write_ha_state,
+            )
+        )
+
     @property
     def device_info(self):
         """Return the device info."""
@@ -87,6 +117,16 @@ class DdwrtSensor(Entity):
         _LOGGER.debug("DdwrtSensor::device_info result=%s", result)
         return result
 
+    @property
+    def should_poll(self):
+        """No polling needed, the router pushes its updates."""
+        return False
+
+    @property
+    def available(self):
+        """Return true if the router can be reached."""
+        return self._api.available
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -105,6 +145,12 @@ class DdwrtSensor(Entity):
         attr = {
             ATTR_ATTRIBUTION: ATTRIBUTION,
         }
+        if self._api.restored:
+            attr.update({ATTR_RESTORED: True})
+
+        # Set attributes for each radio of a router with more than one radio
+        if self._api.results.get(f"{self._sensor_type}_radios"):
+            attr.update(self._api.results[f"{self._sensor_type}_radios"])
 
         # Set attributes for all individual temperature sensor in the router
         if self._sensor_type == 'cpu_temp':
@@ -139,3 +185,89 @@ class DdwrtSensor(Entity):
         else:
             return self._api.results[self._sensor_type]
 
+
+
+class DdwrtDiagnosticSensor(Entity):
+    """Representation of the health of the connection to a ddwrt router."""
+
+    def __init__(self, api, routername):
+        """Initialize the sensor."""
+
+        _LOGGER.debug("DdwrtDiagnosticSensor::__init__")
+
+        self._api = api
+        self._host = self._api._host
+        self._routername = routername
+        self._sw_version = f"{self._api.results['sw_version']}.{self._api.results['sw_build']}"
+        self._unique_id = '{}_{}'.format(self._host, DIAGNOSTIC_SENSOR)
+
+    async def async_added_to_hass(self):
+        """Client entity created."""
+
+        _LOGGER.debug("DdwrtDiagnosticSensor::async_added_to_hass")
+
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_health,
+                self.async_write_ha_state,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._api.signal_queue_depth,
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def device_info(self):
+        """Return the device info."""
+        return {
+            "identifiers": {(DOMAIN, self._host)},
+            ATTR_FRIENDLY_NAME: DIAGNOSTIC_SENSOR_NAME,
+            "manufacturer": self._api.results["router_manufacturer"],
+            "model": self._api.results["router_model"],
+            ATTR_NAME: self._routername,
+            "sw_version": self._sw_version,
+            "via_device": (DOMAIN),
+        }
+
+    @property
+    def should_poll(self):
+        """No polling needed, the router pushes its updates."""
+        return False
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return DIAGNOSTIC_SENSOR
+
+    @property
+    def entity_category(self):
+        """Return the category of the sensor."""
+        return ENTITY_CATEGORY_DIAGNOSTIC
+
+    @property
+    def device_state_attributes(self):
+        """Return the number of requests to the router that are waiting or running."""
+        return {
+            ATTR_ATTRIBUTION: ATTRIBUTION,
+            ATTR_QUEUE_DEPTH: self._api.queue_depth,
+        }
+
+    @property
+    def icon(self):
+        """Return the mdi icon of the sensor."""
+        return DIAGNOSTIC_SENSOR_ICON
+
+    @property
+    def unique_id(self):
+        """Return the unique ID of the sensor."""
+        return self._unique_id
+
+    @property
+    def state(self):
+        """Return the health of the connection to the router."""
+        return self._api.health
@@ -0,0 +1,77 @@
+"""Shared fixtures for the DD-WRT tests."""
+
+import asyncio
+import os
+import ssl
+import sys
+
+from aiohttp import web
+from OpenSSL import crypto
+import pytest
+
+# pyddwrt is a standalone module, it's imported without Home Assistant. The integration
+# itself is imported as custom_components.ddwrt
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "custom_components", "ddwrt"))
+sys.path.insert(0, ROOT)
+
+
+class RouterServer:
+    """A local stand-in for a DD-WRT router, serving pages from a handler."""
+
+    def __init__(self, handler):
+        """Initialize the server."""
+        self.handler = handler
+        self.requests = []
+        self.host = None
+        self._runner = None
+
+    async def _handle(self, request):
+        """Record the request and pass it to the handler."""
+        self.requests.append((request.method, request.path, dict(request.headers)))
+        return await self.handler(request)
+
+    async def start(self, ssl_context=None):
+        """Start the server on a free port."""
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0, ssl_context=ssl_context)
+        await site.start()
+        self.host = "127.0.0.1:%i" % site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop the server."""
+        await self._runner.cleanup()
+
+
+@pytest.fixture
+def ssl_context(tmp_path):
+    """Return a server SSL context with a new self-signed certificate."""
+
+    key = crypto.PKey()
+    key.generate_key(crypto.TYPE_RSA, 2048)
+    certificate = crypto.X509()
+    certificate.get_subject().CN = "router"
+    certificate.set_serial_number(1)
+    certificate.gmtime_adj_notBefore(0)
+    certificate.gmtime_adj_notAfter(3600)
+    certificate.set_issuer(certificate.get_subject())
+    certificate.set_pubkey(key)
+    certificate.sign(key, "sha256")
+
+    certificate_file = tmp_path / "router.pem"
+    key_file = tmp_path / "router.key"
+    certificate_file.write_bytes(crypto.dump_certificate(crypto.FILETYPE_PEM, certificate))
+    key_file.write_bytes(crypto.dump_privatekey(crypto.FILETYPE_PEM, key))
+
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certificate_file, key_file)
+    return context
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine in a new event loop."""
+    return asyncio.run
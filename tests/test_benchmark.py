@@ -0,0 +1,37 @@
+"""Tests of the offline benchmark of the live pages."""
+
+import io
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import benchmark  # noqa: E402
+
+
+def test_synthetic_pages_have_the_given_clients():
+    """The synthetic pages are processed without errors, with one client of each table per given client."""
+
+    lan = benchmark._parse(benchmark.ENDPOINT_LAN, benchmark._chunks(benchmark.page_lan(25).encode()))
+    wireless = benchmark._parse(benchmark.ENDPOINT_WIRELESS, benchmark._chunks(benchmark.page_wireless(25).encode()))
+
+    assert len(lan.clients_arp) == len(lan.clients_dhcp) == 25
+    assert len(wireless.clients_wireless) == 25
+
+
+def test_report_has_a_row_per_page(tmp_path):
+    """The benchmark reports each page, and reads recorded pages instead of the synthetic ones."""
+
+    (tmp_path / benchmark.ENDPOINT_LAN).write_text(benchmark.page_lan(3))
+    pages = benchmark.load_pages(tmp_path)
+    output = io.StringIO()
+
+    benchmark.run([2], pages, 2, True, output)
+
+    rows = output.getvalue().splitlines()[2:]
+    assert len(rows) == len(benchmark.SYNTHETIC_PAGES)
+    assert any(row.split()[:2] == [benchmark.ENDPOINT_LAN, "recorded"] for row in rows)
+    assert not any(row.split()[:2] == [benchmark.ENDPOINT_LAN, "2"] for row in rows)
+    assert all(row.split()[-1] != "-" for row in rows)
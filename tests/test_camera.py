@@ -0,0 +1,35 @@
+"""Tests of the DD-WRT traffic chart."""
+
+from xml.etree import ElementTree
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.ddwrt.camera import render_traffic_chart  # noqa: E402
+from custom_components.ddwrt.pyddwrt import TrafficMonth  # noqa: E402
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def test_traffic_chart_has_a_slot_per_day():
+    """The chart has a label for each day of the month, and a bar for each day with traffic."""
+
+    chart = ElementTree.fromstring(render_traffic_chart(TrafficMonth("02-2021", ((10, 5), (0, 0), (180, 0)), "digest")))
+    texts = ["".join(text.itertext()) for text in chart.iter(f"{SVG}text")]
+
+    assert texts[0] == "Traffic 02-2021: in 190 MiB, out 5 MiB"
+    assert texts[1:6] == ["0 MiB", "50 MiB", "100 MiB", "150 MiB", "200 MiB"]
+    assert texts[6:] == [str(day) for day in range(1, 29)]
+    assert len(chart.findall(f"{SVG}rect")) == 1 + 3
+
+
+def test_empty_traffic_chart():
+    """A month without traffic is drawn without bars, on a scale of 1 MiB."""
+
+    chart = ElementTree.fromstring(render_traffic_chart(TrafficMonth("04-2021", (), "digest")))
+    texts = ["".join(text.itertext()) for text in chart.iter(f"{SVG}text")]
+
+    assert texts[5] == "1 MiB"
+    assert texts[6:] == [str(day) for day in range(1, 31)]
+    assert len(chart.findall(f"{SVG}rect")) == 1
@@ -0,0 +1,53 @@
+"""Tests of the DD-WRT config flow."""
+
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant import config_entries, data_entry_flow  # noqa: E402
+
+from custom_components.ddwrt.const import DOMAIN  # noqa: E402
+from custom_components.ddwrt.pyddwrt import DDWrt  # noqa: E402
+
+USER_INPUT = {
+    "host": "192.168.1.1",
+    "username": "root",
+    "password": "admin",
+    "ssl": True,
+    "verify_ssl": False,
+    "ssl_fingerprint": "00" * 32,
+}
+
+
+async def test_user_step_fingerprint_mismatch(hass, enable_custom_integrations):
+    """A router certificate that doesn't match the pinned fingerprint is shown as a fingerprint error."""
+
+    with patch.object(DDWrt, "_async_request", side_effect=DDWrt.ExceptionFingerprintMismatch()):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_USER},
+            data=USER_INPUT,
+        )
+
+    assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"base": "ssl_fingerprint_mismatch"}
+
+
+@pytest.mark.parametrize("fingerprint", ["zz", "00" * 20, "00:" * 31 + "0"])
+async def test_user_step_invalid_fingerprint(hass, enable_custom_integrations, fingerprint):
+    """A fingerprint that isn't 64 hex digits is shown as an error of the field, without connecting."""
+
+    with patch.object(DDWrt, "_async_request") as request:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_USER},
+            data={**USER_INPUT, "ssl_fingerprint": fingerprint},
+        )
+
+    assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"ssl_fingerprint": "invalid_ssl_fingerprint"}
+    request.assert_not_called()
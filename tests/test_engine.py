@@ -0,0 +1,91 @@
+"""Tests of the poll engine shared by the DD-WRT routers."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.ddwrt.const import HEALTH_HEALTHY  # noqa: E402
+from custom_components.ddwrt.engine import DDWrtEngine  # noqa: E402
+from custom_components.ddwrt.sensor import DdwrtDiagnosticSensor  # noqa: E402
+
+
+def test_released_slot_is_reused():
+    """A router added after another was unloaded takes its phase, instead of a new slot."""
+
+    engine = DDWrtEngine(None)
+    interval = timedelta(seconds=60)
+    phases = [engine.phase(host, interval) for host in ("a", "b", "c")]
+
+    engine.async_release("b")
+
+    assert engine.phase("d", interval) == phases[1]
+    assert len(engine._slots) == 3
+
+
+@patch("custom_components.ddwrt.engine.async_dispatcher_send")
+def test_queue_depth_is_released(dispatcher_send, run):
+    """The queue depth of a router is dropped when its last request finished."""
+
+    engine = DDWrtEngine(None)
+
+    async def request():
+        await asyncio.sleep(0)
+        return True
+
+    async def test():
+        task = asyncio.ensure_future(engine.async_run("a", request))
+        await asyncio.sleep(0)
+        assert engine.queue_depth("a") == 1
+        assert await task
+
+    run(test())
+
+    assert engine.queue_depth("a") == 0
+    assert engine._queue_depth == {}
+
+
+class Router:
+    """Router entity as seen by the diagnostic sensor, its queue depth is read from the engine."""
+
+    def __init__(self, engine, host):
+        self._engine = engine
+        self._host = host
+        self.results = {"sw_version": "v3.0", "sw_build": "1", "router_manufacturer": None, "router_model": None}
+        self.health = HEALTH_HEALTHY
+        self.signal_health = f"{host}_health"
+        self.signal_queue_depth = engine.signal_queue_depth(host)
+
+    @property
+    def queue_depth(self):
+        return self._engine.queue_depth(self._host)
+
+
+def test_diagnostic_sensor_follows_queue_depth(run):
+    """The diagnostic sensor is written each time a request of its router is queued or finished."""
+
+    engine = DDWrtEngine(None)
+    sensor = DdwrtDiagnosticSensor(Router(engine, "a"), "router")
+    written = []
+
+    def dispatcher_send(hass, signal):
+        if signal == sensor._api.signal_queue_depth:
+            written.append(sensor.device_state_attributes["queue_depth"])
+
+    release = asyncio.Event()
+
+    async def test():
+        tasks = [asyncio.ensure_future(engine.async_run("a", release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert sensor.device_state_attributes["queue_depth"] == 2
+        release.set()
+        await asyncio.gather(*tasks)
+
+    with patch("custom_components.ddwrt.engine.async_dispatcher_send", side_effect=dispatcher_send):
+        run(test())
+
+    assert written == [1, 2, 1, 0]
+    assert sensor.state == HEALTH_HEALTHY
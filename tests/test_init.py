@@ -0,0 +1,350 @@
+"""Tests of the DD-WRT integration's router entity."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import voluptuous as vol
+
+pytest.importorskip("homeassistant")
+
+from custom_components.ddwrt import DDWrtEntity, ssl_fingerprint  # noqa: E402
+from custom_components.ddwrt.const import (  # noqa: E402
+    BACKOFF_MIN,
+    ENDPOINT_ABOUT,
+    ENDPOINT_INTERNET,
+    ENDPOINT_LAN,
+    ENDPOINT_ROUTER,
+    ENDPOINT_TTGRAPH,
+    ENDPOINT_WIRELESS,
+    HEALTH_HEALTHY,
+    HEALTH_OPEN,
+    RESOURCES_DEFAULTS,
+    SCAN_INTERVAL_ABOUT,
+    SCAN_INTERVAL_DATA,
+)
+from custom_components.ddwrt.engine import DDWrtEngine  # noqa: E402
+from custom_components.ddwrt.pyddwrt import ArpClient, DDWrt, DhcpClient, merge_clients  # noqa: E402
+
+HOST = "192.168.1.1"
+
+
+def make_entity(resources=()):
+    """Return a router entity without a config entry, with a router that isn't polled."""
+
+    entity = DDWrtEntity.__new__(DDWrtEntity)
+    entity._hass = MagicMock()
+    entity._host = HOST
+    entity._engine = DDWrtEngine(entity._hass)
+    entity._router = DDWrt(None, HOST, "user", "password", "http", False)
+    entity._resources = list(resources)
+    entity._conntrack = False
+    entity._client_filter = None
+    for source in ("arp", "dhcp", "pppoe", "pptp", "wds", "wireless"):
+        setattr(entity, f"_track_{source}", f"{source}_clients" in entity._resources)
+    entity.results = {}
+    entity.devices = {}
+    entity.conntrack = {}
+    entity.first_seen = {}
+    entity.last_seen = {}
+    entity._scan_intervals = {}
+    entity._listeners = []
+    entity._snapshot_store = MagicMock()
+    entity._static_updated = None
+    entity._static_boot_time = None
+    entity.restored = False
+    entity.health = HEALTH_HEALTHY
+    entity._failures = 0
+    entity._backoff = None
+    entity._cancel_probe = None
+    return entity
+
+
+def test_open_circuit_schedules_one_probe():
+    """Failures while the circuit is open don't add probes or extend the backoff."""
+
+    entity = make_entity()
+    with patch("custom_components.ddwrt.async_call_later") as call_later, \
+            patch("custom_components.ddwrt.async_dispatcher_send"):
+        for _ in range(5):
+            entity._async_open_circuit()
+
+    assert entity.health == HEALTH_OPEN
+    assert call_later.call_count == 1
+    assert entity._backoff == BACKOFF_MIN
+
+
+def test_failed_probe_extends_backoff():
+    """A failed probe schedules the next probe with a doubled backoff."""
+
+    entity = make_entity()
+    with patch("custom_components.ddwrt.async_call_later") as call_later, \
+            patch("custom_components.ddwrt.async_dispatcher_send"):
+        entity._async_open_circuit()
+
+        # The probe clears its callback when it runs, then fails
+        entity._cancel_probe = None
+        entity._async_open_circuit()
+
+    assert call_later.call_count == 2
+    assert entity._backoff == BACKOFF_MIN * 2
+
+
+def test_status_pages_are_fetched_concurrently(run):
+    """All status pages of a poll cycle are requested before any of them has been received."""
+
+    entity = make_entity()
+    started = []
+    received = asyncio.Event()
+
+    def page(endpoint):
+        async def update():
+            started.append(endpoint)
+            if len(started) == 3:
+                received.set()
+            await asyncio.wait_for(received.wait(), 1)
+            return True
+        return update
+
+    for endpoint, name in (
+        (ENDPOINT_INTERNET, "async_update_wan_data"),
+        (ENDPOINT_LAN, "async_update_lan_data"),
+        (ENDPOINT_ROUTER, "async_update_router_data"),
+    ):
+        setattr(entity._router, name, page(endpoint))
+
+    with patch("custom_components.ddwrt.async_dispatcher_send"):
+        assert run(entity.async_update_sensor_data([ENDPOINT_INTERNET, ENDPOINT_LAN, ENDPOINT_ROUTER]))
+
+    assert sorted(started) == sorted([ENDPOINT_INTERNET, ENDPOINT_LAN, ENDPOINT_ROUTER])
+    assert entity.health == HEALTH_HEALTHY
+
+
+def test_each_page_is_polled_at_its_own_interval():
+    """Sensors poll their page every minute, a tracker polls its page faster, pages with one interval are polled together."""
+
+    entity = make_entity(["uptime", "wan_ipaddr", "wireless_clients"])
+    entity._engine = MagicMock()
+
+    with patch("custom_components.ddwrt.entity_registry") as registry:
+        registry.async_get.return_value.async_get_entity_id.return_value = None
+        assert entity.scan_intervals() == {
+            ENDPOINT_ABOUT: SCAN_INTERVAL_ABOUT,
+            ENDPOINT_INTERNET: SCAN_INTERVAL_DATA,
+            ENDPOINT_ROUTER: SCAN_INTERVAL_DATA,
+            ENDPOINT_WIRELESS: timedelta(seconds=10),
+        }
+        entity.async_schedule_updates()
+
+    tracked = {call.args[1]: call.args[3] for call in entity._engine.async_track.call_args_list}
+    assert tracked == {
+        ENDPOINT_ABOUT: SCAN_INTERVAL_ABOUT,
+        ",".join(sorted([ENDPOINT_INTERNET, ENDPOINT_ROUTER])): SCAN_INTERVAL_DATA,
+        ENDPOINT_WIRELESS: timedelta(seconds=10),
+    }
+
+
+def test_page_of_disabled_entities_is_not_polled():
+    """A status page is left out when all entities that need it are disabled in the entity registry."""
+
+    entity = make_entity(["uptime", "wan_ipaddr"])
+
+    def entity_id(platform, domain, unique_id):
+        return f"{platform}.{unique_id}"
+
+    with patch("custom_components.ddwrt.entity_registry") as registry:
+        registry.async_get.return_value.async_get_entity_id.side_effect = entity_id
+        registry.async_get.return_value.async_get.side_effect = lambda entity_id: MagicMock(
+            disabled=entity_id.endswith("_wan_ipaddr")
+        )
+        assert entity.enabled_resources() == ["uptime"]
+        assert entity.scan_intervals() == {
+            ENDPOINT_ABOUT: SCAN_INTERVAL_ABOUT,
+            ENDPOINT_ROUTER: SCAN_INTERVAL_DATA,
+        }
+
+
+def test_only_changed_results_are_notified():
+    """Entities are only notified when their own result changed."""
+
+    entity = make_entity()
+    entity.results = {"uptime": "1 day", "wan_ipaddr": "1.2.3.4"}
+
+    with patch("custom_components.ddwrt.async_dispatcher_send") as send:
+        entity._async_update_results({"uptime": "2 days", "wan_ipaddr": "1.2.3.4"})
+        entity._async_update_results({"uptime": "2 days", "wan_ipaddr": "1.2.3.4"})
+
+    assert [call.args[1] for call in send.call_args_list] == [entity.signal_update("uptime")]
+    assert entity.results == {"uptime": "2 days", "wan_ipaddr": "1.2.3.4"}
+
+
+def test_client_leaving_is_disconnected():
+    """A client that left is removed from the devices when its table comes back empty, and its tracker is notified."""
+
+    entity = make_entity(["arp_clients"])
+    mac = "AA:BB:CC:00:00:03"
+    entity._router.clients_arp = {mac: ArpClient("phone", "192.168.1.12", mac, "5", "br0")}
+
+    with patch("custom_components.ddwrt.async_dispatcher_send") as send:
+        entity._async_update_devices()
+        assert list(entity.devices) == [mac]
+
+        entity._router._process_lan_data({
+            "lan_ip_prefix": "192.168.1.", "dhcp_start": "100", "dhcp_num": "50", "arp_table": "",
+            "uptime": " 12:00:00 up 1 day,  2:03,  load average: 0.01, 0.05, 0.10", "ipinfo": "",
+        })
+        send.reset_mock()
+        entity._async_update_devices()
+
+    assert entity.devices == {}
+    assert [call.args[1] for call in send.call_args_list] == [entity.signal_device_update(mac)]
+
+
+def test_configured_fingerprint_is_validated():
+    """A fingerprint in configuration.yaml is checked and stored as 64 lowercase hex digits."""
+
+    assert ssl_fingerprint(":".join(["AB"] * 32)) == "ab" * 32
+    with pytest.raises(vol.Invalid):
+        ssl_fingerprint("ab" * 20)
+
+
+def test_router_uses_a_home_assistant_session(run):
+    """The router's requests go through a session created by Home Assistant, which is closed on unload."""
+
+    config = MagicMock(data={
+        "name": "router", "host": HOST, "username": "user", "password": "password",
+        "ssl": False, "verify_ssl": True, "resources": [],
+    })
+    session = MagicMock()
+    session.close = MagicMock(side_effect=lambda: asyncio.sleep(0))
+    hass = MagicMock()
+
+    with patch("custom_components.ddwrt.async_create_clientsession", return_value=session) as create, \
+            patch("custom_components.ddwrt.Store"):
+        entity = DDWrtEntity(hass, config, DDWrtEngine(hass))
+
+    create.assert_called_once_with(hass, verify_ssl=True)
+    assert entity._router._aio_session is session
+
+    run(entity.async_close())
+    session.close.assert_called_once_with()
+
+
+def test_snapshot_restores_results_and_clients(run):
+    """A snapshot stored as JSON restores the results and clients, which are marked as restored."""
+
+    mac = "AA:BB:CC:00:00:03"
+    now = datetime.now(timezone.utc)
+    entity = make_entity(["uptime", "arp_clients", "dhcp_clients"])
+    entity.results = {"uptime": "1 day", "wan_ipaddr": None}
+    entity.devices = merge_clients(
+        {mac: DhcpClient("phone", "192.168.1.12", mac, "1 day 00:00:00", "12")},
+        {mac: ArpClient("phone", "192.168.1.12", mac, "5", "br0")},
+    )
+    entity.first_seen = {mac: now}
+    entity.last_seen = {mac: now}
+    snapshot = json.loads(json.dumps(entity._snapshot_data()))
+
+    restored = make_entity(["uptime", "arp_clients", "dhcp_clients"])
+    restored.results = {"uptime": None, "wan_ipaddr": None}
+    restored._static_updated = now
+    restored._snapshot_store.async_load = MagicMock(side_effect=lambda: asyncio.sleep(0, snapshot))
+
+    assert run(restored.async_restore_snapshot())
+    assert restored.restored
+    assert restored.results == {"uptime": "1 day", "wan_ipaddr": None}
+    assert restored.devices == entity.devices
+    assert restored.devices[mac].name == "phone"
+    assert restored.last_seen == {mac: now}
+
+
+@pytest.mark.parametrize(
+    "boot_time, probes",
+    [
+        # Boot time unknown before the command
+        (None, ["booted"]),
+        # Uptime of less than the reboot tolerance before the command
+        (timedelta(minutes=2), ["same", "booted"]),
+        # Uptime of days before the command
+        (timedelta(days=1), ["same", "booted"]),
+        # A probe failed while the router was down, the boot time isn't known afterwards
+        (None, ["same", "down", "unknown"]),
+    ],
+)
+def test_reboot_is_completed(boot_time, probes, run):
+    """A reboot is completed when the router booted after the command, or it was down for a while."""
+
+    entity = make_entity()
+    before = None if boot_time is None else datetime.utcnow() - boot_time
+    entity._router.boot_time = before
+
+    async def reboot():
+        return True
+
+    async def probe():
+        state = probes.pop(0)
+        if state == "down":
+            raise DDWrt.DDWrtException("Unable to update router data")
+        entity._router.boot_time = {"same": before, "booted": datetime.utcnow(), "unknown": None}[state]
+        return True
+
+    async def update_sensor_data():
+        assert not probes
+        return True
+
+    entity._router.async_reboot = reboot
+    entity._endpoint_updates = MagicMock(return_value={ENDPOINT_ROUTER: probe})
+    entity.async_update_sensor_data = update_sensor_data
+    with patch("custom_components.ddwrt.REBOOT_PROBE_INTERVAL", timedelta(0)):
+        assert run(entity.async_reboot(timedelta(seconds=1)))
+
+
+def test_reboot_times_out_while_router_is_up(run):
+    """A router that keeps responding with the same boot time hasn't rebooted."""
+
+    entity = make_entity()
+    entity._router.boot_time = datetime.utcnow() - timedelta(minutes=2)
+    probes = []
+
+    async def reboot():
+        return True
+
+    async def probe():
+        probes.append(True)
+        return True
+
+    entity._router.async_reboot = reboot
+    entity._endpoint_updates = MagicMock(return_value={ENDPOINT_ROUTER: probe})
+    entity.async_update_sensor_data = MagicMock()
+    with patch("custom_components.ddwrt.REBOOT_PROBE_INTERVAL", timedelta(0)):
+        assert not run(entity.async_reboot(timedelta(seconds=0.05)))
+
+    assert probes
+    entity.async_update_sensor_data.assert_not_called()
+
+
+def test_traffic_failures_dont_open_the_circuit(run):
+    """The traffic camera is opt-in, and a user that can't read its counters keeps the router healthy."""
+
+    entity = make_entity(["uptime", "traffic"])
+
+    async def update_router_data():
+        return True
+
+    async def update_traffic_data():
+        raise DDWrt.DDWrtException("Unable to update traffic data: not an administrator")
+
+    entity._router.async_update_router_data = update_router_data
+    entity._router.async_update_traffic_data = update_traffic_data
+
+    with patch("custom_components.ddwrt.async_dispatcher_send"), \
+            patch("custom_components.ddwrt.async_call_later") as call_later:
+        for endpoints in ([ENDPOINT_ROUTER, ENDPOINT_TTGRAPH], [ENDPOINT_TTGRAPH]) * 3:
+            run(entity.async_update_sensor_data(endpoints))
+
+    assert "traffic" not in RESOURCES_DEFAULTS
+    assert entity.health == HEALTH_HEALTHY
+    assert entity._failures == 0
+    call_later.assert_not_called()
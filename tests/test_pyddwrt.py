@@ -0,0 +1,656 @@
+"""Tests of the DD-WRT router library."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+import html
+from ipaddress import ip_address
+import json
+from unittest.mock import patch
+
+from aiohttp import ClientSession, web
+import pytest
+
+from conftest import RouterServer
+from pyddwrt import (
+    ArpClient,
+    DDWrt,
+    DDWrtConntrackScanner,
+    DDWrtDataParser,
+    DhcpClient,
+    PppoeClient,
+    _POOL_SIZE,
+    Client,
+    ClientFilter,
+    CounterRate,
+    WirelessClient,
+    _command_script,
+    _decode_table,
+    merge_clients,
+    parse_fingerprint,
+)
+
+WAN_PAGE = (
+    "{wan_shortproto::dhcp}{wan_status::Connected}{wan_uptime::1 day, 2:03,  x}{wan_3g_signal::N.A.}"
+    "{wan_ipaddr::1.2.3.4}{wan_netmask::255.255.255.0}{wan_gateway::1.2.3.1}{wan_dns0::8.8.8.8}"
+    "{wan_dns1::}{wan_dns2::}{wan_dns3::}{wan_dns4::}{wan_dns5::}{dhcp_remaining::1 day}"
+    "{ttraff_in::1234}{ttraff_out::567}{pppoe_ac_name::}"
+    "{uptime:: 12:00:00 up 1 day,  2:03,  load average: 0.01, 0.05, 0.10}{ipinfo::&nbsp;IP: 1.2.3.4}"
+)
+
+LAN_PAGE = (
+    "{lan_mac::AA:BB:CC:00:00:01}{lan_ip::192.168.1.1}{lan_ip_prefix::192.168.1.}{lan_netmask::255.255.255.0}"
+    "{lan_gateway::0.0.0.0}{lan_dns::0.0.0.0}{lan_proto::dhcp}{dhcp_daemon::DNSMasq}{dhcp_start::100}{dhcp_num::50}"
+    "{dhcp_lease_time::1440}{dhcp_leases::%s}{pptp_leases::}{pppoe_leases::}{arp_table::%s}"
+    "{uptime:: 12:00:00 up 1 day,  2:03,  load average: 0.01, 0.05, 0.10}{ipinfo::&nbsp;IP: 1.2.3.4}"
+)
+
+WIRELESS_PAGE = (
+    "{wl_mac::AA:BB:CC:00:00:02}{wl_ssid::test}{wl_channel::6}{wl_radio::Radio is On}{wl_xmit::71 mW}"
+    "{wl_rate::144 Mbps}{wl_ack::}{wl_active::1}{wl_busy::2}{wl_quality::3}{assoc_count::1}"
+    "{active_wireless::%s}{active_wds::}"
+    "{packet_info::SWRXgoodPacket=%i;SWRXerrorPacket=%i;SWTXgoodPacket=%i;SWTXerrorPacket=%i;}"
+    "{uptime:: 12:00:00 up 1 day,  2:03,  load average: 0.01, 0.05, 0.10}{ipinfo::&nbsp;IP: 1.2.3.4}"
+)
+
+LAN_CLIENT_ARP = "'phone','192.168.1.12','AA:BB:CC:00:00:03','5','br0'"
+LAN_CLIENT_DHCP = "'phone','192.168.1.12','AA:BB:CC:00:00:03','1 day 00:00:00','12'"
+WIRELESS_CLIENT = "'AA:BB:CC:00:00:03','phone','wlan0','1:00:00','72M','72M','HT20','-50','-95','45','1000'"
+
+
+def parse_page(page):
+    """Return the pairs of a live page."""
+
+    return dict(DDWrtDataParser().parse([page.encode()]))
+
+
+def make_router():
+    """Return a router that isn't connected to."""
+
+    return DDWrt(None, "192.168.1.1", "user", "password", "http", False)
+
+
+def test_live_page_with_etag_is_polled_unconditionally(run):
+    """A live page is fetched in full on every poll, even when the router sends an ETag."""
+
+    async def handler(request):
+        if request.headers.get("If-None-Match") == '"wan"':
+            return web.Response(status=304)
+        return web.Response(text=WAN_PAGE, headers={"ETag": '"wan"'})
+
+    async def test():
+        server = RouterServer(handler)
+        await server.start()
+        router = DDWrt(None, server.host, "user", "password", "http", False)
+        try:
+            assert await router.async_update_wan_data()
+            assert await router.async_update_wan_data()
+        finally:
+            await router.async_close()
+            await server.stop()
+
+        assert router.results["wan_ipaddr"] == "1.2.3.4"
+        assert not any("If-None-Match" in headers for _, _, headers in server.requests)
+        assert not router.validators
+
+    run(test())
+
+
+def test_about_data_passes_on_fingerprint_mismatch(run, ssl_context):
+    """A certificate that doesn't match the pinned fingerprint is reported as such, not as a connection error."""
+
+    async def handler(request):
+        return web.Response(text="DD-WRT v3.0-r44715 std (11/03/20)<br />")
+
+    async def test():
+        server = RouterServer(handler)
+        await server.start(ssl_context)
+        router = DDWrt(None, server.host, "user", "password", "https", False, ssl_fingerprint="00" * 32)
+        try:
+            with pytest.raises(DDWrt.ExceptionFingerprintMismatch):
+                await router.async_update_about_data()
+        finally:
+            await router.async_close()
+            await server.stop()
+
+    run(test())
+
+
+def test_command_is_not_sent_again_after_disconnect(run):
+    """A POST to apply.cgi isn't retried when the router closes the connection."""
+
+    async def handler(request):
+        await request.read()
+        request.transport.close()
+        return web.Response(text="ok")
+
+    async def test():
+        server = RouterServer(handler)
+        await server.start()
+        router = DDWrt(None, server.host, "user", "password", "http", False)
+        try:
+            with pytest.raises(DDWrt.DDWrtException):
+                await router.async_reboot()
+        finally:
+            await router.async_close()
+            await server.stop()
+
+        assert [method for method, _, _ in server.requests] == ["POST"]
+
+    run(test())
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(WAN_PAGE)])
+def test_live_page_parsed_across_chunks(size):
+    """Pairs split over chunks of any size are parsed like the page in one piece."""
+
+    page = ("<html>" + WAN_PAGE).encode()
+    chunks = [page[start:start + size] for start in range(0, len(page), size)]
+    result = dict(DDWrtDataParser().parse(chunks))
+
+    assert len(result) == WAN_PAGE.count("::")
+    assert result["wan_uptime"] == "1 day, 2:03,  x"
+    assert result["wan_dns1"] == ""
+    assert result["ipinfo"] == "&nbsp;IP: 1.2.3.4"
+
+
+def test_live_page_parsing_stops_after_wanted_keys():
+    """The parser stops once all wanted keys have been seen."""
+
+    parser = DDWrtDataParser(keys=["wan_shortproto", "wan_status"])
+    chunks = [pair.encode() + b"}" for pair in WAN_PAGE.split("}") if pair]
+    result = dict(parser.parse(iter(chunks)))
+
+    assert result == {"wan_shortproto": "dhcp", "wan_status": "Connected"}
+    assert parser.done
+    assert parser.size < len(WAN_PAGE)
+
+
+def test_client_table_decoded_into_records():
+    """Quoted values may contain commas, every row becomes a record keyed by its MAC address."""
+
+    table = _decode_table(
+        "dhcp_leases",
+        " 'laptop, work','192.168.1.10','AA:BB:CC:00:00:01','1 day 00:00:00','10',"
+        "'*','192.168.1.11','AA:BB:CC:00:00:02','12:00:00','11'",
+        DhcpClient,
+    )
+
+    assert table == {
+        "AA:BB:CC:00:00:01": DhcpClient("laptop, work", "192.168.1.10", "AA:BB:CC:00:00:01", "1 day 00:00:00", "10"),
+        "AA:BB:CC:00:00:02": DhcpClient("*", "192.168.1.11", "AA:BB:CC:00:00:02", "12:00:00", "11"),
+    }
+
+
+def test_client_table_without_optional_column():
+    """ARP tables of older firmware have no interface column, it's set to None."""
+
+    table = _decode_table(
+        "arp_table",
+        "'phone','192.168.1.12','AA:BB:CC:00:00:03','5','tv','192.168.1.13','AA:BB:CC:00:00:04','0'",
+        ArpClient,
+    )
+
+    assert list(table.values()) == [
+        ArpClient("phone", "192.168.1.12", "AA:BB:CC:00:00:03", "5", None),
+        ArpClient("tv", "192.168.1.13", "AA:BB:CC:00:00:04", "0", None),
+    ]
+
+
+@pytest.mark.parametrize("value", ["", "'phone','192.168.1.12'"])
+def test_empty_or_invalid_client_table(value):
+    """An empty table, or one with a wrong number of values, has no clients."""
+
+    assert _decode_table("arp_table", value, ArpClient) == {}
+
+
+def test_last_lan_client_leaving_empties_tables():
+    """The client tables are emptied when the router returns them empty, instead of keeping the last clients."""
+
+    router = make_router()
+    assert router._process_lan_data(parse_page(LAN_PAGE % (LAN_CLIENT_DHCP, LAN_CLIENT_ARP)))
+    assert list(router.clients_arp) == ["AA:BB:CC:00:00:03"]
+    assert list(router.clients_dhcp) == ["AA:BB:CC:00:00:03"]
+
+    assert router._process_lan_data(parse_page(LAN_PAGE % ("", "")))
+    assert router.clients_arp == {}
+    assert router.clients_dhcp == {}
+
+
+def test_last_wireless_client_leaving_empties_table():
+    """The wireless clients of a single radio router are emptied when the table is empty."""
+
+    router = make_router()
+    assert router._process_wireless_data(parse_page(WIRELESS_PAGE % (WIRELESS_CLIENT, 10, 0, 10, 0)))
+    assert list(router.clients_wireless) == ["AA:BB:CC:00:00:03"]
+
+    assert router._process_wireless_data(parse_page(WIRELESS_PAGE % ("", 20, 0, 20, 0)))
+    assert router.clients_wireless == {}
+
+
+def test_client_tables_merged_per_mac_address():
+    """A client listed in several tables becomes one Client, its attributes come from the most specific table."""
+
+    wireless = WirelessClient("aa:bb:cc:00:00:03", "", "wlan0", "1:00:00", "72M", "72M", "HT20", "-50", "-95", "45", "1000", "AA:BB:CC:00:00:02")
+    dhcp = DhcpClient("phone", "192.168.1.12", "AA:BB:CC:00:00:03", "1 day 00:00:00", "12")
+    arp = ArpClient("phone-arp", "192.168.1.12", "AA:BB:CC:00:00:03", "5", "br0")
+    pppoe = PppoeClient("ppp0", "user", "10.0.0.2")
+
+    clients = merge_clients(
+        {wireless.mac: wireless},
+        {"10.0.0.2": pppoe},
+        {dhcp.mac: dhcp},
+        {arp.mac: arp},
+    )
+
+    assert list(clients) == ["AA:BB:CC:00:00:03", "10.0.0.2"]
+    client = clients["AA:BB:CC:00:00:03"]
+    assert client.sources == (wireless, dhcp, arp)
+    assert client.type == "wireless_clients"
+    assert client.name == "phone"
+    assert client.ip_address == "192.168.1.12"
+    assert client.get("signal") == "-50"
+    assert client.as_dict()["sources"] == ["wireless_clients", "dhcp_clients", "arp_clients"]
+    assert not hasattr(client, "__dict__")
+
+    assert clients["10.0.0.2"].mac is None
+    assert clients["10.0.0.2"].name == "user"
+
+
+def test_client_snapshot_survives_json():
+    """A client stored as JSON is restored with the same records."""
+
+    dhcp = DhcpClient("phone", "192.168.1.12", "AA:BB:CC:00:00:03", "1 day 00:00:00", "12")
+    arp = ArpClient("phone", "192.168.1.12", "AA:BB:CC:00:00:03", "5", "br0")
+    pppoe = PppoeClient("ppp0", "user", "10.0.0.2")
+
+    for client in merge_clients({"10.0.0.2": pppoe}, {dhcp.mac: dhcp}, {arp.mac: arp}).values():
+        restored = Client.from_snapshot(json.loads(json.dumps(client.as_snapshot())))
+        assert restored == client
+        assert [type(source) for source in restored.sources] == [type(source) for source in client.sources]
+
+
+def test_counter_rates():
+    """The current rate is the last delta over its interval, the peak the highest rate in the ring buffer."""
+
+    rate = CounterRate(size=3)
+
+    assert rate.add(0, 100) is None
+    assert rate.current is None and rate.increase is None
+    assert rate.add(10, 200) == 100
+    assert rate.add(20, 250) == 50
+    assert rate.current == 5
+    assert rate.average == pytest.approx(10 + 0.3 * (5 - 10))
+    assert rate.peak == 10
+    assert rate.add(30, 280) == 30
+    assert rate.increase == 180
+    assert rate.add(40, 290) == 10
+    assert rate.increase == 90
+    assert rate.peak == 5
+
+
+def test_counter_wrap():
+    """A counter that drops by more than half of its wrap has wrapped."""
+
+    rate = CounterRate(wrap=2 ** 32)
+    rate.add(0, 2 ** 32 - 100)
+
+    assert rate.add(10, 100) == 200
+    assert rate.current == 20
+
+
+@pytest.mark.parametrize("wrap", [None, 2 ** 32])
+def test_counter_reset(wrap):
+    """A counter that goes backwards without wrapping was reset, and its rates start over."""
+
+    rate = CounterRate(wrap)
+    rate.add(0, 1000)
+    rate.add(10, 2000)
+
+    assert rate.add(20, 10) is None
+    assert rate.current is None and rate.average is None and rate.increase is None
+    assert rate.add(30, 110) == 100
+
+
+def test_counter_starts_over_after_reboot():
+    """The rates start over when the boot time of the router moved, but not when it only drifted."""
+
+    boot_time = datetime(2021, 1, 1)
+    rate = CounterRate()
+    rate.add(0, 100, boot_time)
+
+    assert rate.add(10, 200, boot_time + timedelta(seconds=30)) == 100
+    assert rate.add(20, 300, boot_time + timedelta(hours=1)) is None
+    assert rate.current is None and rate.peak is None
+
+
+def test_wan_throughput_from_traffic_totals():
+    """The WAN throughput in Mbit/s is calculated from the monthly traffic totals in MiB."""
+
+    router = make_router()
+    with patch("pyddwrt.monotonic", side_effect=[0, 0, 10, 10]):
+        assert router._process_wan_data(parse_page(WAN_PAGE))
+        assert router.results["wan_throughput_in"] is None
+        assert router._process_wan_data(parse_page(WAN_PAGE.replace("{ttraff_in::1234}", "{ttraff_in::1244}")))
+
+    assert router.results["wan_throughput_in"] == 8.389
+    assert router.results["wan_throughput_in_peak"] == 8.389
+    assert router.results["wan_throughput_out"] == 0
+
+
+def test_wireless_packet_rates_and_error_ratio():
+    """The packet rates come from the packet counters, which wrap at 32 bits, with the share of errors."""
+
+    router = make_router()
+    now = 0
+    with patch("pyddwrt.monotonic", side_effect=lambda: now):
+        assert router._process_wireless_data(parse_page(WIRELESS_PAGE % ("", 1000, 10, 2 ** 32 - 500, 0)))
+        assert router.results["wl_rx_packets_per_second"] is None
+        assert router.results["wl_rx_error_ratio"] is None
+        now = 10
+        assert router._process_wireless_data(parse_page(WIRELESS_PAGE % ("", 2000, 110, 500, 0)))
+
+    assert router.results["wl_rx_packets_per_second"] == 100
+    assert router.results["wl_rx_error_ratio"] == 9.09
+    assert router.results["wl_tx_packets_per_second"] == 100
+    assert router.results["wl_tx_error_ratio"] == 0
+
+
+def make_dual_band_router():
+    """Return a router with two radios, that shows the first one and serves the page of the selected one."""
+
+    router = make_router()
+    router.results["wifi_radios"] = ["wl0", "wl1"]
+    router._wifi_display = "wl0"
+    pages = {
+        "wl0": WIRELESS_PAGE % (WIRELESS_CLIENT, 0, 0, 0, 0),
+        "wl1": (WIRELESS_PAGE % (WIRELESS_CLIENT.replace(":03", ":04"), 0, 0, 0, 0))
+        .replace("{wl_mac::AA:BB:CC:00:00:02}", "{wl_mac::AA:BB:CC:00:00:05}")
+        .replace("{wl_channel::6}", "{wl_channel::36}"),
+    }
+    router.selected = []
+
+    async def post(url, parameters):
+        router.selected.append(parameters["wifi_display"])
+
+    async def get(url, live):
+        return parse_page(pages[router._wifi_display])
+
+    router._async_post_ddwrt_data = post
+    router._async_get_ddwrt_data = get
+    return router
+
+
+def test_radios_merged_into_wireless_results(run):
+    """The wl_ results come from the first radio, the clients of all radios are tracked."""
+
+    router = make_dual_band_router()
+    router._wifi_display = "wl1"
+
+    assert run(router.async_update_wireless_data())
+
+    assert router.results["wl_channel"] == "6"
+    assert router.radios["wl1"]["wl_channel"] == "36"
+    assert set(router.clients_wireless) == {"AA:BB:CC:00:00:03", "AA:BB:CC:00:00:04"}
+    assert router.clients_wireless["AA:BB:CC:00:00:04"].ap_mac == "AA:BB:CC:00:00:05"
+
+
+def test_other_radios_are_polled_slowly(run):
+    """Between sweeps only the shown radio is fetched, and a sweep selects the shown radio again."""
+
+    router = make_dual_band_router()
+    now = 0
+    with patch("pyddwrt.monotonic", side_effect=lambda: now):
+        assert run(router.async_update_wireless_data())
+        assert router.selected == ["wl1", "wl0"]
+
+        now = 10
+        assert run(router.async_update_wireless_data())
+        assert router.selected == ["wl1", "wl0"]
+        assert set(router.clients_wireless) == {"AA:BB:CC:00:00:03", "AA:BB:CC:00:00:04"}
+
+        now = 300
+        assert run(router.async_update_wireless_data())
+        assert router.selected == ["wl1", "wl0", "wl1", "wl0"]
+
+    assert router._wifi_display == "wl0"
+
+
+FILTER_CLIENTS = (
+    {"AA:BB:CC:00:00:03": WirelessClient("AA:BB:CC:00:00:03", "", "wl0.1", "1:00:00", "72M", "72M", "HT20", "-50", "-95", "45", "1000", "AA:BB:CC:00:00:02")},
+    {
+        "AA:BB:CC:00:00:03": DhcpClient("phone", "192.168.1.12", "AA:BB:CC:00:00:03", "1 day 00:00:00", "12"),
+        "11:22:33:00:00:07": DhcpClient("guest-laptop", "192.168.2.5", "11:22:33:00:00:07", "1 day 00:00:00", "13"),
+        "44:55:66:00:00:08": DhcpClient("printer", "192.168.1.20", "44:55:66:00:00:08", "1 day 00:00:00", "14"),
+    },
+)
+
+
+@pytest.mark.parametrize(
+    "include, exclude, tracked",
+    [
+        ((), (), {"AA:BB:CC:00:00:03", "11:22:33:00:00:07", "44:55:66:00:00:08"}),
+        (("aa-bb-cc-00-00-03",), (), {"AA:BB:CC:00:00:03"}),
+        (("11:22:33",), (), {"11:22:33:00:00:07"}),
+        (("192.168.1.0/24",), (), {"AA:BB:CC:00:00:03", "44:55:66:00:00:08"}),
+        (("interface:wl0.*",), (), {"AA:BB:CC:00:00:03"}),
+        (("GUEST-*",), (), {"11:22:33:00:00:07"}),
+        ((), ("192.168.2.0/24", "printer"), {"AA:BB:CC:00:00:03"}),
+        (("192.168.1.0/24",), ("44:55:66",), {"AA:BB:CC:00:00:03"}),
+    ],
+)
+def test_client_filter(include, exclude, tracked):
+    """A client is tracked if it matches an include rule or there are none, and no exclude rule."""
+
+    clients = merge_clients(*FILTER_CLIENTS, client_filter=ClientFilter(include, exclude))
+
+    assert set(clients) == tracked
+
+
+def conntrack_page(rows):
+    """Return a connection table with rows of protocol, timeout, source, remote, service and state."""
+
+    cells = "".join(
+        "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>\n"
+        for row in rows
+    )
+    return f"<html><table><tr><th>Protocol</th></tr>\n{cells}</table></html>".encode()
+
+
+CONNTRACK_ROWS = [
+    ("TCP", "431999", "192.168.1.12", "<b>8.8.8.8</b>", "443", "ESTABLISHED"),
+    ("UDP", "30", "192.168.1.12", "8.8.4.4", "53", ""),
+    ("TCP", "120", "8.8.8.8", "192.168.1.12", "22", "ESTABLISHED"),
+    ("UDP", "30", "192.168.1.20", "8.8.4.4", "53", ""),
+    ("TCP", "10", "1.2.3.4", "5.6.7.8", "80", "TIME_WAIT"),
+    ("TCP", "10", "router", "8.8.8.8", "80", "TIME_WAIT"),
+]
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_conntrack_aggregated_per_lan_address(size):
+    """The connections are counted per LAN address, whichever side opened them, across chunks."""
+
+    page = conntrack_page(CONNTRACK_ROWS)
+    scanner = DDWrtConntrackScanner()
+    for index in range(0, len(page), size):
+        assert scanner.feed(page[index:index + size]) == ()
+
+    phone = scanner.result[int(ip_address("192.168.1.12"))]
+    assert scanner.connections == 5
+    assert set(scanner.result) == {int(ip_address("192.168.1.12")), int(ip_address("192.168.1.20"))}
+    assert phone.connections == 3
+    assert phone.protocols == {"tcp": 2, "udp": 1}
+    assert phone.top_destinations == (("8.8.8.8", 2), ("8.8.4.4", 1))
+
+
+def test_conntrack_of_given_lan():
+    """Only the addresses in the given LAN are counted when it's known."""
+
+    scanner = DDWrtConntrackScanner((int(ip_address("192.168.1.16")), int(ip_address("255.255.255.240"))))
+    scanner.feed(conntrack_page(CONNTRACK_ROWS))
+
+    assert list(scanner.result) == [int(ip_address("192.168.1.20"))]
+
+
+def command_page(script, output):
+    """Return a diagnostics page that shows the script in its form and its output in the textarea."""
+
+    return (
+        f'<html><input name="ping_ip" value="{script}">'
+        f'<textarea id="ping_output">{output}</textarea></html>'
+    ).encode()
+
+
+def test_command_script_marks_each_command():
+    """Each command is preceded by a marker, whose text in the script itself isn't a marker."""
+
+    script = _command_script(["nvram get wan_ipaddr", "uptime"])
+
+    assert script.splitlines() == [
+        'echo "@@ddwrt""-command-0@@"',
+        "nvram get wan_ipaddr",
+        'echo "@@ddwrt""-command-1@@"',
+        "uptime",
+        'echo "@@ddwrt""-command-end@@"',
+    ]
+
+
+def test_command_output_split_per_command(run):
+    """The output of each command is read between the markers, and unescaped."""
+
+    router = make_router()
+    commands = ["nvram get wan_ipaddr", "echo '<ok>'", "true"]
+    output = (
+        "@@ddwrt-command-0@@\n1.2.3.4\n"
+        "@@ddwrt-command-1@@\n&lt;ok&gt;\n"
+        "@@ddwrt-command-2@@\n"
+        "@@ddwrt-command-end@@\n"
+    )
+
+    async def post(url, parameters, body=False):
+        assert parameters["ping_ip"] == _command_script(commands)
+        return command_page(html.escape(parameters["ping_ip"]), output)
+
+    router._async_post_ddwrt_data = post
+
+    assert run(router.async_run_command(commands)) == ["1.2.3.4\n", "<ok>\n", ""]
+
+
+def test_command_output_missing(run):
+    """An output that isn't ended by the next marker is missing, and a page without markers is an error."""
+
+    router = make_router()
+    pages = [command_page("", "@@ddwrt-command-0@@\r\nup 1 day\r\n"), command_page("", "")]
+
+    async def post(url, parameters, body=False):
+        return pages.pop(0)
+
+    router._async_post_ddwrt_data = post
+
+    assert run(router.async_run_command(["uptime", "reboot"])) == [None, None]
+    with pytest.raises(DDWrt.DDWrtException):
+        run(router.async_run_command("uptime"))
+
+
+def test_traffic_graph_image(run):
+    """traffic_graph_url(True) returns the graph of this month, instead of its URL."""
+
+    image = b"<svg>traffic</svg>"
+    queries = []
+
+    async def handler(request):
+        queries.append(request.query_string)
+        return web.Response(body=image, content_type="image/svg+xml")
+
+    async def test():
+        server = RouterServer(handler)
+        await server.start()
+        router = DDWrt(None, server.host, "user", "password", "http", False)
+        try:
+            assert router.traffic_graph_url(False) == f"http://{server.host}/ttgraph.cgi?{date.today().month}-{date.today().year}"
+            assert await asyncio.get_running_loop().run_in_executor(None, router.traffic_graph_url, True) == image
+        finally:
+            await router.async_close()
+            await server.stop()
+
+        assert [path for _, path, _ in server.requests] == ["/ttgraph.cgi"]
+        assert queries == [f"{date.today().month}-{date.today().year}"]
+
+    run(test())
+
+
+def test_traffic_counters_from_nvram(run):
+    """The daily counters are read with one command, and only replaced when they have changed."""
+
+    router = make_router()
+    outputs = ["10:5 0:0 180:0 [190:5]\n", "10:5 0:0 180:0 [190:5]\n", "10:5 0:0 181:1 [191:6]\n", None]
+    commands = []
+
+    async def run_command(command):
+        commands.append(command)
+        return [outputs.pop(0)]
+
+    router.async_run_command = run_command
+
+    assert run(router.async_update_traffic_data())
+    traffic = router.traffic
+    assert traffic.month == date.today().strftime("%m-%Y")
+    assert traffic.days == ((10, 5), (0, 0), (180, 0))
+    assert (traffic.total_in, traffic.total_out) == (190, 5)
+    assert router.results["traffic"] == traffic.digest
+
+    assert run(router.async_update_traffic_data())
+    assert router.traffic is traffic
+
+    assert run(router.async_update_traffic_data())
+    assert router.traffic.days[2] == (181, 1)
+    assert router.results["traffic"] != traffic.digest
+
+    assert not run(router.async_update_traffic_data())
+    assert commands == [f"nvram get traff-{date.today().strftime('%m-%Y')}"] * 4
+
+
+def test_fingerprint_with_or_without_colons():
+    """A SHA-256 fingerprint is accepted with or without colons, in any case."""
+
+    fingerprint = "ab" * 32
+    assert parse_fingerprint(fingerprint) == fingerprint
+    assert parse_fingerprint(":".join(["AB"] * 32)) == fingerprint
+
+
+@pytest.mark.parametrize("fingerprint", ["zz", "ab" * 20, "ab" * 16, "ab" * 32 + "0"])
+def test_invalid_fingerprint_is_rejected(fingerprint):
+    """A value that isn't a SHA-256 fingerprint, like a SHA-1 or MD5 fingerprint, raises ValueError."""
+
+    with pytest.raises(ValueError):
+        parse_fingerprint(fingerprint)
+    with pytest.raises(ValueError):
+        DDWrt(None, "192.168.1.1", "user", "password", "https", False, ssl_fingerprint=fingerprint)
+
+
+def test_given_session_is_bounded_per_router(run):
+    """A session given by the caller may allow many connections, the router gets at most _POOL_SIZE at once."""
+
+    running = []
+    peak = []
+
+    async def handler(request):
+        running.append(request)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.remove(request)
+        return web.Response(text=WAN_PAGE)
+
+    async def test():
+        server = RouterServer(handler)
+        await server.start()
+        async with ClientSession() as session:
+            router = DDWrt(session, server.host, "user", "password", "http", False)
+            await asyncio.gather(*(router.async_update_wan_data() for _ in range(3 * _POOL_SIZE)))
+            await router.async_close()
+            assert not session.closed
+        await server.stop()
+
+    run(test())
+
+    assert max(peak) == _POOL_SIZE